@@ -21,8 +21,20 @@ from config.eureka_client import register_with_eureka, shutdown_eureka
 from routes.feed_route import router as feed_router
 from routes.research_route import router as research_router
 from routes.source_route import router as source_router
+from routes.timeline_route import router as timeline_router
+from routes.article_route import router as article_router
+from routes.theme_route import router as theme_router
+from routes.opml_route import router as opml_router
+from routes.profiling_route import router as profiling_router
 from config.settings import load_config
-from utils.database import create_tables, init_database, seed_database
+from utils.database import create_tables, init_canonical_urls, init_database, init_simhash_index, init_theme_summary, seed_database
+from utils.responses import ORJSONResponse
+from utils.http_cache import HTTPCacheMiddleware
+from utils.admission import AdmissionMiddleware
+from utils.deadline import DeadlineMiddleware
+from utils.metrics import MetricsMiddleware, render_metrics
+from utils.profiling import ProfilingMiddleware
+from utils.tracing import TracingMiddleware
 
 # Configurer le logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -47,9 +59,17 @@ app = FastAPI(
     title="Service Source API",
     description="API pour gérer les sources",
     version="1.0.0",
-    docs_url="/swagger"
+    docs_url="/swagger",
+    default_response_class=ORJSONResponse
 )
 
+# Budget de scrapes concurrents, file d'attente courte et 503 au-delà ; réponses récentes resservies
+# (à l'intérieur de CORS pour que les en-têtes CORS restent propres à chaque requête)
+app.add_middleware(AdmissionMiddleware)
+
+# Budget de temps de chaque requête (REQUEST_DEADLINE), consommé par les appels sortants et les étapes
+app.add_middleware(DeadlineMiddleware)
+
 # Ajouter le middleware CORS
 app.add_middleware(
     CORSMiddleware,
@@ -59,6 +79,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag, Cache-Control, réponses 304 et compression gzip/brotli
+app.add_middleware(HTTPCacheMiddleware)
+
+# Durée et taille des réponses par route (exposées sur /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Profilage à la demande (PROFILING_TOKEN) ou d'une requête sur N (PROFILING_SAMPLE_EVERY)
+app.add_middleware(ProfilingMiddleware)
+
+# Span serveur par requête, rattaché au traceparent reçu (TRACING_EXPORTER, no-op par défaut)
+app.add_middleware(TracingMiddleware)
+
     
 # Eureka lifecycle events
 @app.on_event("startup")
@@ -70,6 +102,9 @@ async def startup_event():
         if create_tables():
             #logger.info("Tables créées avec succès")
             seed_database()
+            init_canonical_urls()
+            init_theme_summary()
+            init_simhash_index()
             #await register_with_eureka()
         else:
             logger.error("Échec de la création des tables")
@@ -90,6 +125,12 @@ def health_check():
     """Endpoint de vérification de santé pour Eureka"""
     return {"status": "UP"}
 
+@app.get('/metrics', tags=['Système'], include_in_schema=False)
+def metrics_endpoint():
+    """Métriques Prometheus (étapes du pipeline, hôtes scrapés, tailles de réponse, pool BD)"""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
 @app.get("/api/service-source/info")
 def info():
     return {
@@ -102,6 +143,11 @@ def info():
 app.include_router(feed_router)
 app.include_router(research_router)
 app.include_router(source_router)
+app.include_router(timeline_router)
+app.include_router(article_router)
+app.include_router(theme_router)
+app.include_router(opml_router)
+app.include_router(profiling_router)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la normalisation des dates (utils/dates.py) sur un grand corpus
+synthétique de chaînes de dates en français, anglais et chinois, absolues et
+relatives. La répétition est celle des vraies pages : « il y a 2 heures » revient
+sans cesse, les dates ISO des attributs datetime sont presque toutes différentes.
+
+Pour chaque format : part des chaînes correctement interprétées (la date attendue
+est connue à la génération). Puis durée par chaîne sans cache, à froid (cache
+vidé) et en régime établi, taux de succès du cache, et comparaison avec
+dateutil.parser (fuzzy) s'il est installé. Le script sort en erreur si une chaîne
+est mal interprétée.
+
+Usage : python -m benchmarks.bench_dates [--size 200000] [--seed 1]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from utils import dates
+
+# Heure de référence du corpus (« maintenant » pour les dates relatives)
+NOW = datetime(2024, 5, 1, 12, 0)
+
+MOIS = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août", "septembre", "octobre", "novembre", "décembre"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+
+
+def _past(rng) -> datetime:
+    return (NOW - timedelta(minutes=rng.randrange(1, 365 * 24 * 60))).replace(second=0)
+
+
+def iso_z(rng):
+    value = _past(rng).replace(tzinfo=timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ"), dates.to_local(value)
+
+
+def iso_offset(rng):
+    value = _past(rng).replace(tzinfo=timezone(timedelta(hours=2)))
+    return value.isoformat(), dates.to_local(value)
+
+
+def rfc822(rng):
+    value = _past(rng).replace(tzinfo=timezone.utc)
+    return format_datetime(value), dates.to_local(value)
+
+
+def fr_long(rng):
+    value = _past(rng)
+    day = "1er" if value.day == 1 else str(value.day)
+    return f"{day} {MOIS[value.month - 1]} {value.year} à {value.hour}h{value.minute:02d}", value
+
+
+def fr_numeric(rng):
+    value = _past(rng).replace(hour=0, minute=0)
+    return value.strftime("%d/%m/%Y"), value
+
+
+def en_long(rng):
+    value = _past(rng)
+    hour = value.hour % 12 or 12
+    return f"{MONTHS[value.month - 1]} {value.day}, {value.year} at {hour}:{value.minute:02d} {'PM' if value.hour >= 12 else 'AM'}", value
+
+
+def en_short(rng):
+    value = _past(rng).replace(hour=0, minute=0)
+    return f"{value.day} {MONTHS[value.month - 1][:3]} {value.year}", value
+
+
+def zh_long(rng):
+    value = _past(rng)
+    return f"{value.year}年{value.month}月{value.day}日 {value.hour:02d}:{value.minute:02d}", value
+
+
+def fr_relative(rng):
+    unit, seconds, top = rng.choice([("minutes", 60, 59), ("heures", 3600, 23), ("jours", 86400, 6)])
+    n = rng.randint(1, top)
+    if n == 1:
+        text = {"minutes": "il y a une minute", "heures": "il y a une heure", "jours": "il y a un jour"}[unit]
+    else:
+        text = f"il y a {n} {unit}"
+    return text, NOW - timedelta(seconds=n * seconds)
+
+
+def bing_short(rng):
+    unit, seconds, top = rng.choice([("min", 60, 59), ("heures", 3600, 23), ("jours", 86400, 6)])
+    n = rng.randint(1, top)
+    return f"{n} {unit}", NOW - timedelta(seconds=n * seconds)
+
+
+def en_relative(rng):
+    unit, seconds, top = rng.choice([("minute", 60, 59), ("hour", 3600, 23), ("day", 86400, 6)])
+    n = rng.randint(1, top)
+    text = f"{'an' if unit == 'hour' else 'a'} {unit} ago" if n == 1 else f"{n} {unit}s ago"
+    return text, NOW - timedelta(seconds=n * seconds)
+
+
+def zh_relative(rng):
+    unit, seconds, top = rng.choice([("分钟", 60, 59), ("小时", 3600, 23), ("天", 86400, 6)])
+    n = rng.randint(1, top)
+    if unit == "小时" and rng.random() < 0.05:
+        return "半小时前", NOW - timedelta(minutes=30)
+    return f"{n}{unit}前", NOW - timedelta(seconds=n * seconds)
+
+
+def day_words(rng):
+    hour, minute = rng.randrange(24), rng.randrange(60)
+    yesterday = (NOW - timedelta(days=1)).replace(hour=hour, minute=minute)
+    return rng.choice([
+        (f"hier à {hour}h{minute:02d}", yesterday),
+        (f"昨天 {hour:02d}:{minute:02d}", yesterday),
+        ("yesterday", NOW - timedelta(days=1)),
+        (f"{hour:02d}:{minute:02d}", NOW.replace(hour=hour, minute=minute)),
+    ])
+
+
+def no_date(rng):
+    # Textes sans date contenant « hier », « today » ou « maintenant » dans un autre mot
+    return rng.choice([
+        "Thierry Breton démissionne", "fichier mis à jour", "Dirk Hierl", "hierarchy of needs",
+        "Todayscience", "maintenant disponible", "maintenance prévue",
+    ]), None
+
+
+# (format, générateur, poids dans le corpus)
+FORMATS = [
+    ("iso_z", iso_z, 25), ("iso_offset", iso_offset, 5), ("rfc822", rfc822, 10),
+    ("fr_long", fr_long, 6), ("fr_numeric", fr_numeric, 4), ("en_long", en_long, 5),
+    ("en_short", en_short, 3), ("zh_long", zh_long, 4), ("fr_relative", fr_relative, 12),
+    ("bing_short", bing_short, 8), ("en_relative", en_relative, 6), ("zh_relative", zh_relative, 8),
+    ("day_words", day_words, 4), ("no_date", no_date, 1),
+]
+
+
+def make_corpus(size: int, seed: int):
+    rng = random.Random(seed)
+    names = [name for name, _, _ in FORMATS]
+    generators = {name: generator for name, generator, _ in FORMATS}
+    weights = [weight for _, _, weight in FORMATS]
+    corpus = []
+    for name in rng.choices(names, weights, k=size):
+        text, expected = generators[name](rng)
+        corpus.append((name, text, expected))
+    return corpus
+
+
+def per_string_us(func, texts) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200000, help="nombre de chaînes du corpus")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dateutil-sample", type=int, default=20000, help="chaînes passées à dateutil (lent)")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.size, args.seed)
+    texts = [text for _, text, _ in corpus]
+    print(f"{len(corpus)} chaînes, {len(set(texts))} distinctes")
+
+    # Exactitude et durée (en régime établi) par format
+    ok, total, errors = Counter(), Counter(), defaultdict(list)
+    by_format = defaultdict(list)
+    for name, text, expected in corpus:
+        total[name] += 1
+        by_format[name].append(text)
+        if dates.parse_date(text, NOW) == expected:
+            ok[name] += 1
+        elif len(errors[name]) < 3:
+            errors[name].append((text, dates.parse_date(text, NOW), expected))
+    print(f"\n{'format':<12} {'chaînes':>8} {'distinctes':>10} {'exactes':>8} {'µs établi':>10} {'µs sans cache':>14}")
+    for name, _, _ in FORMATS:
+        group = by_format[name]
+        if not group:
+            continue
+        duration = per_string_us(lambda text: dates.parse_date(text, NOW), group)
+        uncached = per_string_us(dates._parse.__wrapped__, group)
+        print(f"{name:<12} {total[name]:>8} {len(set(group)):>10} {ok[name] / total[name]:>8.1%} {duration:>10.2f} {uncached:>14.2f}")
+    for name, samples in errors.items():
+        for text, got, expected in samples:
+            print(f"  {name}: {text!r} -> {got} (attendu {expected})")
+
+    # Durées
+    uncached = per_string_us(dates._parse.__wrapped__, texts)
+    dates.cache_clear()
+    cold = per_string_us(lambda text: dates.parse_date(text, NOW), texts)
+    info = dates.cache_info()
+    warm = per_string_us(lambda text: dates.parse_date(text, NOW), texts)
+    print(f"\nsans cache : {uncached:.2f} µs/chaîne")
+    print(f"à froid    : {cold:.2f} µs/chaîne (cache {info.hits / (info.hits + info.misses):.1%} de succès, {info.currsize}/{info.maxsize} entrées)")
+    print(f"établi     : {warm:.2f} µs/chaîne, {1e6 / warm:,.0f} chaînes/s")
+
+    try:
+        from dateutil import parser as dateutil_parser
+    except ImportError:
+        dateutil_parser = None
+    if dateutil_parser is not None:
+        sample = corpus[:args.dateutil_sample]
+
+        def parse_dateutil(text):
+            try:
+                return dateutil_parser.parse(text, fuzzy=True, default=NOW)
+            except (ValueError, OverflowError):
+                return None
+
+        correct = sum(1 for _, text, expected in sample if (lambda value: value is not None and dates.to_local(value) == expected)(parse_dateutil(text)))
+        duration = per_string_us(parse_dateutil, [text for _, text, _ in sample])
+        print(f"dateutil   : {duration:.2f} µs/chaîne, {correct / len(sample):.1%} exactes (sur {len(sample)} chaînes)")
+
+    if sum(ok.values()) != len(corpus):
+        print(f"\n{len(corpus) - sum(ok.values())} chaînes mal interprétées")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne de l'extraction sur le corpus de benchmarks/corpus :
+parse HTML, extract_articles (dont get_main_image), generate_feed_data,
+parsers Yahoo / Bing / Baidu et flux RSS de recherche (Google News, Bing, Yahoo).
+
+Pour chaque page : latence médiane et p95, débit (pages/s et Mo/s), pic
+mémoire (tracemalloc), mémoire et nombre de blocs retenus par les articles
+renvoyés, et durée de leur sérialisation JSON. Les résultats sont comparés à benchmarks/baseline.json ;
+le script sort en erreur si une page régresse au-delà du seuil.
+
+Les latences sont comparées relativement à une charge de calibration fixe (parse
+BeautifulSoup d'une page générée, indépendante du code de l'application),
+exécutée en alternance avec chaque page : une machine plus lente ou plus chargée
+ralentit les deux, et la référence reste valable d'une machine à l'autre.
+
+Avec --snapshots N, les dernières pages réelles conservées par le magasin de
+captures (SNAPSHOT_DIR) sont mesurées en plus du corpus synthétique.
+
+Usage :
+    python -m benchmarks.bench_extract [--repeat 10] [--threshold 0.25] [--snapshots 20]
+    python -m benchmarks.bench_extract --save-baseline   # après une optimisation validée
+"""
+import argparse
+import gc
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Charge de calibration : page de liens et de paragraphes, parsée par lxml comme les pages du corpus
+CALIBRATION_HTML = "<html><body>" + "".join(
+    f'<div class="item"><h2><a href="/article/{i}">Titre {i}</a></h2><p>Résumé de l\'article {i}.</p></div>'
+    for i in range(300)
+) + "</body></html>"
+
+
+def forbid_network():
+    """Garantit que le benchmark ne sort jamais sur le réseau"""
+    def connect(self, address):
+        raise RuntimeError(f"Accès réseau interdit pendant le benchmark ({address})")
+    socket.socket.connect = connect
+    socket.socket.connect_ex = connect
+
+
+def load_corpus():
+    with open(os.path.join(CORPUS_DIR, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    for entry in manifest:
+        with open(os.path.join(CORPUS_DIR, entry["file"]), encoding="utf-8") as f:
+            entry["html"] = f.read()
+    return manifest
+
+
+def load_snapshots(limit: int):
+    """Dernière capture des `limit` URLs les plus récemment téléchargées (magasin de utils/snapshots.py)"""
+    from utils import snapshots
+
+    store = snapshots.SnapshotStore()
+    if snapshots.zstandard is None or not os.path.exists(store.index_path):
+        return []
+    conn = store.connect()
+    entries = []
+    for snapshot in store.iter_snapshots(conn, latest_only=True, limit=limit):
+        content = store.read_content(snapshot["content_hash"])
+        entries.append({
+            "file": f"snapshot-{snapshot['id']}",
+            "kind": snapshot["kind"],
+            "url": snapshot["url"],
+            "html": content.decode(snapshot["encoding"] or "utf-8", "replace"),
+            "content": content,
+        })
+    conn.close()
+    return entries
+
+
+def calibrate():
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(CALIBRATION_HTML, "lxml")
+    return [(a.get("href"), a.get_text(strip=True)) for a in soup.find_all("a")]
+
+
+def make_runner(entry):
+    """Retourne une fonction exécutant le pipeline d'extraction de la page et renvoyant les articles de la réponse"""
+    from routes import feed_route
+    from sources import engine
+
+    html, url = entry["html"], entry["url"]
+    if entry["kind"] == "site":
+        def run():
+            soup = feed_route.parse_html(html)
+            articles = feed_route.extract_articles(url, soup)
+            site_info = {"title": soup.title.string if soup.title else url, "description": "", "icon_url": None}
+            return feed_route.generate_feed_data(url, site_info, articles)["articles"]
+        return run
+
+    if entry["kind"].endswith("_rss"):
+        # Flux XML : parsé depuis les octets bruts (l'encodage est déclaré dans le flux)
+        content, source = entry.get("content") or html.encode("utf-8"), entry["kind"][:-len("_rss")]
+        return lambda: engine.parse_rss(source, content, max_results=100)[1]
+
+    # Pages de résultats des moteurs : extraction déclarée par l'adaptateur (sources/)
+    return lambda: engine.parse_html(entry["kind"], html, max_results=100)
+
+
+def measure(entry, repeat: int):
+    from utils.responses import dumps
+
+    run = make_runner(entry)
+    articles = len(run())  # échauffement
+
+    # Page et calibration en alternance : toutes deux subissent la même charge de la machine
+    calibrate()
+    timings, calibration = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        calibrate()
+        calibration.append(time.perf_counter() - start)
+
+    # Pic mémoire du pipeline et mémoire retenue par les articles renvoyés
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()  # l'arbre BeautifulSoup (cycles de références) n'est plus retenu
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    # Blocs mémoire (objets) encore alloués pour les articles renvoyés
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    result = run()
+    gc.collect()
+    retained_blocks = sys.getallocatedblocks() - blocks
+
+    # Sérialisation JSON des articles, telle que faite par ORJSONResponse
+    serialize = min(timeit.repeat(lambda: dumps(result), number=1, repeat=repeat))
+
+    timings.sort()
+    return {
+        "bytes": len(entry["html"].encode("utf-8")),
+        "articles": articles,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        # Latence en unités de calibration : c'est elle qui est comparée à la référence
+        "relative": statistics.median(timings) / statistics.median(calibration),
+        "peak_kb": peak / 1024,
+        "retained_kb": retained / 1024,
+        "retained_blocks": retained_blocks,
+        "json_ms": serialize * 1000,
+    }
+
+
+def compare(results, baseline, threshold: float):
+    """Liste des régressions (latence relative ou pic mémoire) au-delà du seuil"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for key in ("relative", "peak_kb", "retained_kb"):
+            if key in reference and result[key] > reference[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {key} {result[key]:.1f} > {reference[key]:.1f} (+{result[key] / reference[key] - 1:.0%})"
+                )
+        if result["articles"] != reference["articles"]:
+            print(f"  attention : {name} extrait {result['articles']} articles (référence : {reference['articles']})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.25, help="régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--only", help="ne mesurer que les pages dont le nom contient cette chaîne")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistrer les résultats comme référence")
+    parser.add_argument("--snapshots", type=int, default=0,
+                        help="ajouter la dernière capture des N URLs les plus récentes (SNAPSHOT_DIR)")
+    args = parser.parse_args()
+
+    forbid_network()
+    corpus = load_corpus() + (load_snapshots(args.snapshots) if args.snapshots else [])
+    corpus = [entry for entry in corpus if not args.only or args.only in entry["file"]]
+
+    results = {}
+    total_seconds = 0.0
+    total_bytes = 0
+    print(f"{'page':<22}{'Ko':>8}{'articles':>10}{'médiane ms':>12}{'p95 ms':>10}{'relative':>10}{'pic Ko':>10}"
+          f"{'retenu Ko':>11}{'blocs':>8}{'json ms':>9}")
+    for entry in corpus:
+        result = measure(entry, args.repeat)
+        results[entry["file"]] = result
+        total_seconds += result["median_ms"] / 1000
+        total_bytes += result["bytes"]
+        print(
+            f"{entry['file']:<22}{result['bytes'] / 1024:>8.0f}{result['articles']:>10}"
+            f"{result['median_ms']:>12.1f}{result['p95_ms']:>10.1f}{result['relative']:>10.2f}{result['peak_kb']:>10.0f}"
+            f"{result['retained_kb']:>11.1f}{result['retained_blocks']:>8}{result['json_ms']:>9.2f}"
+        )
+    print(f"débit : {len(results) / total_seconds:.1f} pages/s, {total_bytes / total_seconds / 1e6:.2f} Mo/s")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({name: {k: round(v, 2) if isinstance(v, float) else v for k, v in result.items()}
+                       for name, result in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"référence enregistrée dans {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("pas de référence : lancer avec --save-baseline")
+        return 0
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("RÉGRESSIONS :")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"aucune régression au-delà de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
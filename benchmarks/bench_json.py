@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare l'encodage JSON des réponses de flux : JSONResponse (json de la stdlib,
+avec .isoformat() sur chaque date) contre ORJSONResponse (datetime natives).
+
+Usage : python -m benchmarks.bench_json [--repeat 20]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+
+from utils.responses import ORJSONResponse
+
+
+def make_articles(count: int):
+    now = datetime.now()
+    return [
+        {
+            "title": f"Titre de l'article numéro {i} — actualité",
+            "link": f"https://www.example.com/actualites/{i}/un-long-slug-d-article",
+            "description": f'<img src="https://cdn.example.com/img/{i}.jpg" /><br/>' + "Résumé de l'article. " * 12,
+            "pub_date": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def stdlib_payload(articles):
+    return {
+        "message": "Feed generated successfully",
+        "data": {
+            "site": {"title": "Example", "url": "https://www.example.com", "description": "", "favicon": None},
+            "articles": [
+                {
+                    "title": article["title"],
+                    "url": article["link"],
+                    "description": article["description"],
+                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None,
+                }
+                for article in articles
+            ],
+        },
+    }
+
+
+def orjson_payload(articles):
+    return {
+        "message": "Feed generated successfully",
+        "data": {
+            "site": {"title": "Example", "url": "https://www.example.com", "description": "", "favicon": None},
+            "articles": [
+                {
+                    "title": article["title"],
+                    "url": article["link"],
+                    "description": article["description"],
+                    "publication_date": article["pub_date"],
+                }
+                for article in articles
+            ],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} {'taille':>9} {'stdlib ms':>10} {'orjson ms':>10} {'gain':>6}")
+    for count in (100, 500, 2000, 10000):
+        articles = make_articles(count)
+        size = len(ORJSONResponse(orjson_payload(articles)).body)
+        stdlib = min(timeit.repeat(lambda: JSONResponse(stdlib_payload(articles)), number=1, repeat=args.repeat))
+        fast = min(timeit.repeat(lambda: ORJSONResponse(orjson_payload(articles)), number=1, repeat=args.repeat))
+        print(f"{count:>8} {size // 1024:>7}KB {stdlib * 1000:>10.2f} {fast * 1000:>10.2f} {stdlib / fast:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
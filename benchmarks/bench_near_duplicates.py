@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Mesure la distance SimHash (utils/simhash.py) entre les reprises d'une même
+dépêche par plusieurs moteurs : éditeur ajouté au titre (« - Reuters »), extrait
+plus court ou tronqué (« … »), mot retiré du titre. Et entre dépêches différentes,
+y compris sur le même sujet. Sert à choisir NEAR_DUPLICATE_MAX_DISTANCE.
+
+Affiche les distances par variante, puis pour chaque seuil la part des reprises
+reconnues et le nombre de dépêches différentes confondues. Le script sort en
+erreur si deux dépêches différentes sont confondues au seuil configuré.
+
+Usage : python -m benchmarks.bench_near_duplicates [--max-distance 7]
+"""
+import argparse
+import itertools
+import sys
+
+from utils import simhash
+
+# Même dépêche (titre, description) telle qu'une agence la diffuse
+STORIES = [
+ ("La BCE maintient ses taux directeurs inchangés ce mardi", "La Banque centrale européenne a décidé ce mardi de laisser ses taux directeurs inchangés, citant une inflation encore trop élevée dans la zone euro et une croissance fragile au deuxième trimestre."),
+ ("Incendie dans un entrepôt de Marseille : trois pompiers blessés", "Un violent incendie s'est déclaré dans la nuit de lundi à mardi dans un entrepôt du 15e arrondissement de Marseille. Trois pompiers ont été légèrement blessés lors de l'intervention, selon les marins-pompiers."),
+ ("Apple unveils new iPhone with longer battery life", "Apple on Tuesday introduced its latest iPhone lineup, promising longer battery life, a faster chip and an upgraded camera system, as the company seeks to revive slowing smartphone sales."),
+ ("Le gouvernement présente son projet de loi sur l'immigration", "Le ministre de l'Intérieur a présenté mercredi en Conseil des ministres le projet de loi sur l'immigration, qui prévoit un durcissement des conditions de régularisation et des expulsions facilitées."),
+ ("Oil prices climb after OPEC+ agrees to extend output cuts", "Oil prices rose on Monday after OPEC+ producers agreed over the weekend to extend their production cuts into next year, tightening supply as demand forecasts remain uncertain."),
+ ("Tour de France : Pogacar remporte la 15e étape et conforte son maillot jaune", "Le Slovène Tadej Pogacar a remporté dimanche la 15e étape du Tour de France au sommet du Plateau de Beille, creusant l'écart sur ses principaux rivaux au classement général."),
+ ("Séisme de magnitude 6,8 au Maroc : le bilan s'alourdit", "Le bilan du séisme de magnitude 6,8 qui a frappé vendredi soir le centre du Maroc s'est encore alourdi samedi, selon le ministère de l'Intérieur, alors que les secours poursuivent leurs recherches dans les villages de l'Atlas."),
+ ("Microsoft to cut 10,000 jobs as it braces for slowdown", "Microsoft said on Wednesday it would lay off 10,000 employees by the end of the third quarter, joining other technology companies in cutting costs as demand for software and cloud services slows."),
+ ("Grève à la SNCF : le trafic fortement perturbé jeudi", "La SNCF prévoit un trafic fortement perturbé jeudi en raison d'un mouvement de grève des contrôleurs, avec un TGV sur deux en circulation et de nombreuses suppressions de trains régionaux."),
+ ("NASA delays Artemis moon mission launch to next year", "NASA said it is delaying the next crewed Artemis mission around the Moon until next year, citing problems with the Orion capsule's heat shield and life support systems found during testing."),
+ ("Le prix du gaz va baisser de 5 % en février", "Le prix repère de vente du gaz, qui sert de référence aux fournisseurs, va baisser de 5 % en février par rapport à janvier, a annoncé la Commission de régulation de l'énergie."),
+ ("China's exports fall for a third straight month in July", "China's exports fell for a third consecutive month in July, official data showed on Tuesday, as weak global demand weighed on the world's second-largest economy and added pressure for more stimulus."),
+]
+# Dépêches différentes sur le même sujet (même marché, même course, même produit)
+SAME_SUBJECT = [
+ (("Le CAC 40 termine en hausse de 1,2 % porté par le luxe", "La Bourse de Paris a terminé en nette hausse lundi, portée par les valeurs du luxe après des résultats meilleurs que prévu."),
+  ("Le CAC 40 termine en baisse de 0,8 % plombé par les banques", "La Bourse de Paris a terminé en baisse mardi, plombée par les valeurs bancaires après la publication de chiffres d'inflation décevants.")),
+ (("Tour de France : Vingegaard remporte la 11e étape", "Le Danois Jonas Vingegaard a remporté mercredi la 11e étape du Tour de France au terme d'un sprint à deux avec Pogacar."),
+  ("Tour de France : Pogacar remporte la 15e étape et conforte son maillot jaune", "Le Slovène Tadej Pogacar a remporté dimanche la 15e étape du Tour de France au sommet du Plateau de Beille, creusant l'écart sur ses principaux rivaux au classement général.")),
+ (("Oil prices fall as OPEC+ signals output increase", "Oil prices fell on Thursday after OPEC+ signalled it could raise production from next month, easing concerns about tight supply."),
+  ("Oil prices climb after OPEC+ agrees to extend output cuts", "Oil prices rose on Monday after OPEC+ producers agreed over the weekend to extend their production cuts into next year, tightening supply as demand forecasts remain uncertain.")),
+]
+
+
+def _truncate(text: str, ratio: float, mark: str = "…") -> str:
+    words = text.split()
+    return " ".join(words[:max(3, int(len(words) * ratio))]) + mark
+
+
+def variants(title: str, description: str) -> dict:
+    """Reprises d'une dépêche telles que les renvoient les moteurs de recherche"""
+    words = title.split()
+    return {
+        "éditeur « - »": (title + " - Reuters", description),
+        "éditeur « | »": (title + " | Le Monde", description),
+        "extrait court": (title, _truncate(description, 0.5)),
+        "extrait « ... »": (title, _truncate(description, 0.6, " ...")),
+        "mot retiré": (" ".join(words[:-3] + words[-2:]), description),
+        "éditeur+extrait": (title + " - Yahoo Actualités", _truncate(description, 0.4)),
+        "titre tronqué": (_truncate(title, 0.8, "..."), description),
+    }
+
+
+def _distance(a, b) -> int:
+    return simhash.distance(simhash.article_simhash(*a), simhash.article_simhash(*b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-distance", type=int, default=simhash.NEAR_DUPLICATE_MAX_DISTANCE,
+                        help="seuil vérifié (NEAR_DUPLICATE_MAX_DISTANCE par défaut)")
+    args = parser.parse_args()
+
+    by_variant = {}
+    for story in STORIES:
+        for name, variant in variants(*story).items():
+            by_variant.setdefault(name, []).append(_distance(story, variant))
+    duplicates = [d for distances in by_variant.values() for d in distances]
+    different = [_distance(a, b) for a, b in itertools.combinations(STORIES, 2)]
+    same_subject = [_distance(a, b) for a, b in SAME_SUBJECT]
+
+    print(f"{'variante':<16} {'distances':<50}")
+    for name, distances in by_variant.items():
+        print(f"{name:<16} {' '.join(str(d) for d in sorted(distances))}")
+    print(f"\ndépêches différentes : min {min(different)}, même sujet : {sorted(same_subject)}")
+
+    print(f"\n{'seuil':>5} {'reprises':>9} {'confondues':>11} {'bandes':>7}")
+    for threshold in range(2, 17):
+        recall = sum(d <= threshold for d in duplicates) / len(duplicates)
+        confused = sum(d <= threshold for d in different + same_subject)
+        marker = " <" if threshold == args.max_distance else ""
+        print(f"{threshold:>5} {recall:>9.0%} {confused:>11} {threshold + 1:>7}{marker}")
+
+    confused = sum(d <= args.max_distance for d in different + same_subject)
+    if confused:
+        print(f"\n{confused} paires de dépêches différentes confondues au seuil {args.max_distance}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
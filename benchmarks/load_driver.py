@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge pour l'API : envoie un mélange de requêtes /feed,
+/multi-sources, /search/ et /save-feed à un débit cible (boucle ouverte) et
+affiche les percentiles de latence par endpoint.
+
+La latence est mesurée depuis l'instant d'envoi prévu et non depuis l'envoi
+effectif : une API saturée ne ralentit pas le générateur et les files
+d'attente apparaissent dans les percentiles.
+
+À lancer contre une API configurée sur le serveur de bouchons
+(python -m benchmarks.stub_web).
+
+Usage :
+    python -m benchmarks.load_driver --api http://127.0.0.1:5012 --stub http://127.0.0.1:8900
+                                     [--rps 20] [--duration 60] [--mix feed=5,multi=2,search=1,save=2]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PREFIX = "/api/service-feeds"
+SUBJECTS = ["climat", "élections", "intelligence artificielle", "football", "économie", "santé"]
+
+
+def build_request(endpoint: str, args, rng: random.Random):
+    """Retourne (méthode, URL, corps JSON) d'une requête de l'endpoint donné"""
+    subject = rng.choice(SUBJECTS)
+    if endpoint == "feed":
+        site = rng.randrange(args.sites)
+        return "GET", f"{args.api}{PREFIX}/feed", {"params": {"url": f"{args.stub}/sites/{site}/"}}
+    if endpoint == "multi":
+        return "GET", f"{args.api}{PREFIX}/multi-sources/{subject}", {"params": {"max_per_source": 5}}
+    if endpoint == "search":
+        return "GET", f"{args.api}{PREFIX}/search/", {"params": {"q": subject, "max_retries": 1}}
+    if endpoint == "save":
+        n = rng.randrange(1_000_000)
+        return "POST", f"{args.api}{PREFIX}/save-feed", {"json": {
+            "user_id": args.user_id,
+            "url": f"{args.stub}/sites/{n % args.sites}/",
+            "title": f"Flux de charge {n}",
+            "articles": [
+                {"title": f"Article {n}-{i}", "url": f"{args.stub}/sites/{n % args.sites}/{i}", "description": "charge"}
+                for i in range(args.save_articles)
+            ],
+        }}
+    raise ValueError(endpoint)
+
+
+def parse_mix(mix: str):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://127.0.0.1:5012")
+    parser.add_argument("--stub", default="http://127.0.0.1:8900")
+    parser.add_argument("--rps", type=float, default=20, help="débit cible (requêtes/s)")
+    parser.add_argument("--duration", type=float, default=60, help="durée du test (s)")
+    parser.add_argument("--mix", default="feed=5,multi=2,search=1,save=2", help="pondération des endpoints")
+    parser.add_argument("--sites", type=int, default=200, help="nombre de sites distincts servis par le bouchon")
+    parser.add_argument("--user-id", type=int, default=1, help="utilisateur existant pour /save-feed")
+    parser.add_argument("--save-articles", type=int, default=20, help="articles par requête /save-feed")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--max-in-flight", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    endpoints, cumulative = list(weights), list(weights.values())
+    rng = random.Random(args.seed)
+    local = threading.local()
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def fire(endpoint, method, url, kwargs, scheduled):
+        try:
+            status = session().request(method, url, timeout=args.timeout, **kwargs).status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies[endpoint].append(elapsed)
+            statuses[endpoint][status] += 1
+
+    total = int(args.rps * args.duration)
+    print(f"{total} requêtes à {args.rps} req/s vers {args.api} ({args.mix})")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.max_in_flight) as pool:
+        for i in range(total):
+            scheduled = start + i / args.rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            endpoint = rng.choices(endpoints, weights=cumulative)[0]
+            method, url, kwargs = build_request(endpoint, args, rng)
+            pool.submit(fire, endpoint, method, url, kwargs, scheduled)
+    wall = time.perf_counter() - start
+
+    print(f"\n{'endpoint':<10}{'n':>7}{'ok %':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}  statuts")
+    for endpoint in endpoints:
+        values = sorted(latencies[endpoint])
+        if not values:
+            continue
+        ok = sum(count for status, count in statuses[endpoint].items() if isinstance(status, int) and status < 400)
+        print(
+            f"{endpoint:<10}{len(values):>7}{ok / len(values):>8.1%}"
+            f"{percentile(values, 0.5) * 1000:>10.0f}{percentile(values, 0.9) * 1000:>10.0f}"
+            f"{percentile(values, 0.99) * 1000:>10.0f}{values[-1] * 1000:>10.0f}  {dict(statuses[endpoint])}"
+        )
+    all_values = [value for values in latencies.values() for value in values]
+    print(f"\ndébit obtenu : {len(all_values) / wall:.1f} req/s sur {wall:.0f} s, "
+          f"latence moyenne {statistics.mean(all_values) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
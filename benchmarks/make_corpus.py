@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Génère le corpus HTML de benchmarks/corpus (pages déterministes, versionnées
+avec le dépôt pour que les benchmarks tournent hors ligne).
+
+Les pages reproduisent la structure des sites rencontrés en production :
+petit blog, très grosse page d'accueil de site d'actualités, DOM
+pathologique profondément imbriqué et pages de résultats Yahoo, Bing et
+Baidu (mêmes classes CSS que celles ciblées par les scrapers). Les flux RSS
+de recherche de Google News, Bing et Yahoo reprennent la forme des flux réels
+(liens de redirection, descriptions HTML de Google News).
+
+Usage : python -m benchmarks.make_corpus
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from urllib.parse import quote
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+SEED = 20240501
+REFERENCE_DATE = datetime(2024, 5, 1, 8, 0, 0)
+
+WORDS = (
+    "gouvernement réforme économie climat énergie marché élection sport santé "
+    "recherche université technologie intelligence données sécurité transport "
+    "europe afrique culture cinéma musique budget inflation emploi entreprise "
+    "ville région agriculture océan satellite vaccin hôpital justice tribunal"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:]
+
+
+def page(title: str, body: str, head: str = "") -> str:
+    return (
+        "<!DOCTYPE html>\n<html lang=\"fr\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{escape(title)}</title>\n"
+        f"<meta name=\"description\" content=\"{escape(title)} - corpus de benchmark\">\n"
+        f"{head}</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
+
+
+def small_blog(rng: random.Random) -> str:
+    posts = []
+    for i in range(8):
+        date = REFERENCE_DATE - timedelta(days=i * 3)
+        posts.append(
+            f'<article class="post">\n'
+            f'  <h2><a href="/posts/{i}-{rng.choice(WORDS)}">{escape(sentence(rng, 6))}</a></h2>\n'
+            f'  <time class="post-date" datetime="{date.isoformat()}">{date:%d/%m/%Y}</time>\n'
+            f'  <img class="featured" src="/img/post-{i}.jpg" width="640" height="360">\n'
+            f'  <p>{escape(sentence(rng, 40))}</p>\n'
+            f'</article>'
+        )
+    body = (
+        '<header><h1>Carnet de notes</h1><nav><a href="/">Accueil</a> <a href="/about">À propos</a></nav></header>\n'
+        f'<main>\n{chr(10).join(posts)}\n</main>\n'
+        '<footer><p>© Carnet de notes</p></footer>'
+    )
+    return page("Carnet de notes", body, '<meta property="og:image" content="/img/cover.jpg">\n')
+
+
+def archive_page(rng: random.Random, number: int, pages: int, page_href) -> str:
+    # Page number (à partir de 1) d'une archive de blog paginée ; page_href(n) donne le lien
+    # de la page n. Pagination en bas de page : numéros, puis « Page suivante » (rel=next).
+    posts = []
+    for i in range(10):
+        n = (number - 1) * 10 + i
+        date = REFERENCE_DATE - timedelta(hours=n * 9)
+        posts.append(
+            f'<article class="post">\n'
+            f'  <h2><a href="/archive/posts/{n}-{rng.choice(WORDS)}">{escape(sentence(rng, 7))}</a></h2>\n'
+            f'  <time class="post-date" datetime="{date.isoformat()}">{date:%d/%m/%Y}</time>\n'
+            f'  <p>{escape(sentence(rng, 30))}</p>\n'
+            f'</article>'
+        )
+    links = [f'<a class="page-numbers" href="{escape(page_href(n))}">{n}</a>' for n in range(max(1, number - 2), min(pages, number + 2) + 1)]
+    if number > 1:
+        links.insert(0, f'<a class="prev page-numbers" href="{escape(page_href(number - 1))}">‹ Page précédente</a>')
+    head = ""
+    if number < pages:
+        links.append(f'<a class="next page-numbers" rel="next" href="{escape(page_href(number + 1))}">Page suivante ›</a>')
+        head = f'<link rel="next" href="{escape(page_href(number + 1))}">\n'
+    body = (
+        '<header><h1>Archives</h1><nav><a href="/">Accueil</a> <a href="/archive/">Archives</a></nav></header>\n'
+        f'<main>\n{chr(10).join(posts)}\n</main>\n'
+        f'<nav class="pagination">{" ".join(links)}</nav>\n'
+        '<footer><p>© Carnet de notes</p></footer>'
+    )
+    return page(f"Archives - page {number}", body, head)
+
+
+def news_homepage(rng: random.Random) -> str:
+    nav = "".join(f'<li><a href="/rubrique/{w}">{w}</a></li>' for w in WORDS)
+    sections = []
+    for s in range(24):
+        cards = []
+        for i in range(30):
+            n = s * 30 + i
+            date = REFERENCE_DATE - timedelta(minutes=n * 7)
+            small_icon = '<img src="/icons/video.svg" width="16" height="16">' if n % 3 == 0 else ""
+            cards.append(
+                f'<div class="card card--{rng.choice(("une", "breve", "analyse"))}" data-id="{n}">'
+                f'<div class="card__media">{small_icon}'
+                f'<img src="https://cdn.example-news.com/{s}/{n}.jpg" width="{rng.choice((120, 300, 640))}" height="200" loading="lazy"></div>'
+                f'<div class="card__body"><h3 class="card__title"><a href="/{WORDS[s % len(WORDS)]}/article/{n}">{escape(sentence(rng, 9))}</a></h3>'
+                f'<p class="card__desc">{escape(sentence(rng, 28))}</p>'
+                f'<span class="card__date"><time datetime="{date.isoformat()}Z">{date:%H:%M}</time></span>'
+                f'<div class="card__tags">' + "".join(f'<span class="tag">{rng.choice(WORDS)}</span>' for _ in range(4)) + '</div>'
+                f'</div></div>'
+            )
+        sections.append(
+            f'<section class="rubrique" id="r{s}"><h2>{escape(WORDS[s % len(WORDS)].title())}</h2>\n'
+            + "\n".join(cards) + "\n</section>"
+        )
+    scripts = "\n".join(
+        f'<script>window.__ads_{i} = {json.dumps([sentence(rng, 5) for _ in range(20)], ensure_ascii=False)};</script>'
+        for i in range(20)
+    )
+    body = (
+        f'<header class="masthead"><h1>Le Quotidien</h1><ul class="nav">{nav}</ul></header>\n'
+        f'<main>\n{chr(10).join(sections)}\n</main>\n{scripts}\n'
+        '<footer><ul>' + "".join(f'<li><a href="/page/{i}">Page {i}</a></li>' for i in range(200)) + '</ul></footer>'
+    )
+    return page("Le Quotidien - Actualités en continu", body, '<meta property="og:image" content="https://cdn.example-news.com/logo.png">\n')
+
+
+def nested_dom(rng: random.Random) -> str:
+    # Chaque niveau contient un titre : extract_articles parcourt tous les
+    # descendants de chaque <div>, d'où un coût quadratique en profondeur.
+    depth = 300
+    opening = "".join(
+        f'<div class="wrap-{i}"><h3><a href="/n/{i}">{escape(sentence(rng, 5))}</a></h3><p>{escape(sentence(rng, 10))}</p>'
+        for i in range(depth)
+    )
+    return page("DOM imbriqué", opening + "</div>" * depth)
+
+
+def yahoo_search(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        date = REFERENCE_DATE - timedelta(hours=i)
+        items.append(
+            f'<li><div class="StreamItem"><div class="Ov(h)">'
+            f'<h3><a href="/actualites/{i}-{rng.choice(WORDS)}.html">{escape(sentence(rng, 8))}</a></h3>'
+            f'<p>{escape(sentence(rng, 25))}</p>'
+            f'<time datetime="{date.isoformat()}Z">il y a {i} heures</time>'
+            f'</div></div></li>'
+        )
+    return page("Yahoo Actualités - Recherche", f'<ul class="results">{"".join(items)}</ul>')
+
+
+def bing_search(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        ago = f"{i + 1} heures" if i % 2 else f"{i + 1} jours"
+        items.append(
+            f'<div class="news-card newsitem">'
+            f'<a class="title" href="https://www.source-{i % 7}.example/articles/{i}">{escape(sentence(rng, 8))}</a>'
+            f'<div class="snippet">{escape(sentence(rng, 25))}</div>'
+            f'<span class="time">{ago}</span>'
+            f'</div>'
+        )
+    return page("Bing News - Recherche", f'<div id="news">{"".join(items)}</div>')
+
+
+def baidu_search(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        ago = f"{i + 1}小时前" if i % 2 else f"{i + 1}天前"
+        items.append(
+            f'<div class="result news-item">'
+            f'<h3><a href="https://www.source-{i % 5}.example.cn/news/{i}">新闻标题 {i} {escape(sentence(rng, 4))}</a></h3>'
+            f'<p>这是新闻摘要 {escape(sentence(rng, 15))}</p>'
+            f'<span class="c-color-gray2">{ago}</span>'
+            f'</div>'
+        )
+    return page("百度新闻搜索", f'<div id="content_left">{"".join(items)}</div>')
+
+
+def rss(title: str, link: str, items: list) -> str:
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>\n'
+        f"<title>{escape(title)}</title><link>{escape(link)}</link><description>{escape(title)}</description>\n"
+        + "\n".join(items) + "\n</channel></rss>\n"
+    )
+
+
+def rss_date(hours_ago: int) -> str:
+    return format_datetime((REFERENCE_DATE - timedelta(hours=hours_ago)).replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def google_rss(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        title, source = sentence(rng, 8), f"Source {i % 7}"
+        link = f"https://news.google.com/rss/articles/CBMi{rng.getrandbits(96):024x}?oc=5"
+        description = f'<a href="{link}" target="_blank">{escape(title)}</a>&nbsp;&nbsp;<font color="#6f6f6f">{source}</font>'
+        items.append(
+            f"<item><title>{escape(title)} - {source}</title><link>{escape(link)}</link>"
+            f'<guid isPermaLink="false">{i}</guid><pubDate>{rss_date(i)}</pubDate>'
+            f"<description>{escape(description)}</description>"
+            f'<source url="https://www.source-{i % 7}.example">{source}</source></item>'
+        )
+    return rss('"climat" - Google Actualités', "https://news.google.com/search?q=climat", items)
+
+
+def bing_rss(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        target = f"https://www.source-{i % 7}.example/articles/{i}?utm_source=bing"
+        link = f"https://www.bing.com/news/apiclick.aspx?ref=FexRss&aid=&tid={rng.getrandbits(64):016X}&url={quote(target, safe='')}&c={rng.getrandbits(48)}&mkt=fr-fr"
+        items.append(
+            f"<item><title>{escape(sentence(rng, 8))}</title><link>{escape(link)}</link>"
+            f"<description>{escape(sentence(rng, 25))}</description><pubDate>{rss_date(i)}</pubDate>"
+            f"<News:Source>Source {i % 7}</News:Source></item>"
+        )
+    return rss("Bing News: climat", "https://www.bing.com/news/search?q=climat", items).replace(
+        '<rss version="2.0">', '<rss version="2.0" xmlns:News="https://www.bing.com/news/search?q=climat&amp;format=rss">'
+    )
+
+
+def yahoo_rss(rng: random.Random) -> str:
+    items = []
+    for i in range(30):
+        target = f"https://fr.news.yahoo.com/{i}-{rng.choice(WORDS)}.html"
+        link = f"https://r.search.yahoo.com/_ylt={rng.getrandbits(64):x};_ylu={rng.getrandbits(64):x}/RV=2/RE=1714550400/RO=10/RU={quote(target, safe='')}/RK=2/RS={rng.getrandbits(64):x}-"
+        items.append(
+            f"<item><title>{escape(sentence(rng, 8))}</title><link>{escape(link)}</link>"
+            f"<description>{escape(sentence(rng, 25))}</description><pubDate>{rss_date(i)}</pubDate>"
+            f"<source>Source {i % 5}</source></item>"
+        )
+    return rss("Yahoo News Search Results for climat", "https://news.search.yahoo.com/search?p=climat", items)
+
+
+PAGES = [
+    # (fichier, générateur, type d'extraction, URL d'origine simulée)
+    ("small_blog.html", small_blog, "site", "https://blog.example.org/"),
+    ("news_homepage.html", news_homepage, "site", "https://www.example-news.com/"),
+    ("nested_dom.html", nested_dom, "site", "https://nested.example.com/"),
+    ("yahoo_search.html", yahoo_search, "yahoo", "https://fr.news.yahoo.com/search?p=climat"),
+    ("bing_search.html", bing_search, "bing", "https://www.bing.com/news/search?q=climat"),
+    ("baidu_search.html", baidu_search, "baidu", "https://news.baidu.com/ns?word=climat"),
+    ("google_rss.xml", google_rss, "google_rss", "https://news.google.com/rss/search?q=climat&hl=fr&gl=FR&ceid=FR:fr"),
+    ("bing_rss.xml", bing_rss, "bing_rss", "https://www.bing.com/news/search?q=climat&format=rss"),
+    ("yahoo_rss.xml", yahoo_rss, "yahoo_rss", "https://news.search.yahoo.com/rss?p=climat"),
+]
+
+
+def main():
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    manifest = []
+    for filename, generator, kind, url in PAGES:
+        rng = random.Random(f"{SEED}-{filename}")
+        with open(os.path.join(CORPUS_DIR, filename), "w", encoding="utf-8") as f:
+            f.write(generator(rng))
+        manifest.append({"file": filename, "kind": kind, "url": url})
+    with open(os.path.join(CORPUS_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    print(f"{len(manifest)} pages écrites dans {CORPUS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
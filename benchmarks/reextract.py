@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Rejoue l'extraction actuelle sur les pages conservées par le magasin de captures
+(utils/snapshots.py, SNAPSHOT_DIR) et compare le résultat à l'extraction faite au
+moment du téléchargement : articles ajoutés, supprimés, pages inchangées.
+
+Les extractions sont réparties sur un pool de processus et s'exécutent hors ligne.
+
+Usage :
+    python -m benchmarks.reextract [--latest] [--kind site] [--url lemonde] [--limit 500]
+    python -m benchmarks.reextract --workers 8 --show 20 --json diff.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.bench_extract import forbid_network
+
+
+def init_worker():
+    forbid_network()
+    # Importer le pipeline une fois par processus
+    from routes import feed_route  # noqa: F401
+
+
+def extract(snapshot, directory):
+    """Extraction actuelle d'une capture ; retourne (id, résumé (titre, lien), erreur)"""
+    from routes import feed_route
+    from sources import engine
+    from utils import snapshots
+
+    try:
+        content = snapshots.SnapshotStore(directory).read_content(snapshot["content_hash"])
+        if snapshot["kind"] == "site":
+            soup = feed_route.parse_html(content, encoding=snapshot["encoding"])
+            articles = feed_route.extract_articles(snapshot["url"], soup)
+        elif snapshot["kind"].endswith("_rss"):
+            _, articles = engine.parse_rss(snapshot["kind"][:-len("_rss")], content, snapshot["max_results"] or 10)
+        else:
+            articles = engine.parse_html(snapshot["kind"], content, snapshot["max_results"] or 10, snapshot["url"], snapshot["encoding"])
+        return snapshot["id"], snapshots.summarize(articles), None
+    except Exception as e:
+        return snapshot["id"], [], f"{type(e).__name__}: {e}"
+
+
+def diff(before, after):
+    before_set, after_set = set(before), set(after)
+    return {
+        "before": len(before),
+        "after": len(after),
+        "added": [item for item in after if item not in before_set],
+        "removed": [item for item in before if item not in after_set],
+    }
+
+
+def main():
+    from utils import snapshots
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=snapshots.SNAPSHOT_DIR, help="répertoire du magasin de captures")
+    parser.add_argument("--kind", choices=["site", "yahoo", "bing", "baidu", "google_rss", "bing_rss", "yahoo_rss"], help="n'utiliser que les captures de cet extracteur")
+    parser.add_argument("--url", help="ne garder que les URLs contenant cette chaîne")
+    parser.add_argument("--latest", action="store_true", help="seulement la capture la plus récente de chaque URL")
+    parser.add_argument("--limit", type=int, help="nombre maximal de captures")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="taille du pool de processus")
+    parser.add_argument("--show", type=int, default=10, help="nombre de pages modifiées détaillées")
+    parser.add_argument("--json", help="écrire le détail des différences dans ce fichier")
+    args = parser.parse_args()
+
+    if snapshots.zstandard is None:
+        print("zstandard n'est pas installé")
+        return 2
+    store = snapshots.SnapshotStore(args.dir)
+    if not os.path.exists(store.index_path):
+        print(f"aucune capture dans {args.dir}")
+        return 0
+    conn = store.connect()
+    selected = {
+        snapshot["id"]: snapshot
+        for snapshot in store.iter_snapshots(conn, args.kind, args.url, args.latest, args.limit)
+    }
+    conn.close()
+
+    start = time.perf_counter()
+    results = []
+    errors = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+        # Les processus relisent le contenu eux-mêmes : seules les métadonnées transitent
+        tasks = [{k: v for k, v in snapshot.items() if k != "extraction"} for snapshot in selected.values()]
+        for snapshot_id, extraction, error in pool.map(extract, tasks, [args.dir] * len(tasks), chunksize=8):
+            snapshot = selected[snapshot_id]
+            if error:
+                errors += 1
+            results.append({
+                "id": snapshot_id,
+                "url": snapshot["url"],
+                "kind": snapshot["kind"],
+                "fetched_at": snapshot["fetched_at"],
+                "error": error,
+                **diff(snapshot["extraction"], extraction),
+            })
+    elapsed = time.perf_counter() - start
+
+    changed = [r for r in results if r["added"] or r["removed"] or r["error"]]
+    before = sum(r["before"] for r in results)
+    after = sum(r["after"] for r in results)
+    print(f"{len(results)} captures ré-extraites en {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.1f} pages/s)")
+    print(f"articles : {before} -> {after} ({after - before:+d}), pages modifiées : {len(changed)}, erreurs : {errors}")
+    for result in sorted(changed, key=lambda r: len(r["added"]) + len(r["removed"]), reverse=True)[:args.show]:
+        print(f"\n{result['url']} [{result['kind']}] {result['before']} -> {result['after']}")
+        if result["error"]:
+            print(f"  erreur : {result['error']}")
+        for title, link in result["added"][:5]:
+            print(f"  + {title} ({link})")
+        for title, link in result["removed"][:5]:
+            print(f"  - {title} ({link})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(changed, f, ensure_ascii=False, indent=2)
+        print(f"\ndétail écrit dans {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
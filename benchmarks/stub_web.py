@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP local simulant le web utilisé par l'API, pour les tests de charge :
+sites d'actualités synthétiques, pages de résultats Yahoo / Bing / Baidu /
+Google News et API JSON SearxNG. Latence et erreurs sont injectables.
+
+Chemins servis :
+    /sites/{n}/              page d'accueil d'un site (un sur dix est une grosse page d'actualités)
+    /archive/page/{k}/       archive paginée numérotée (/archive/ = page 1, ARCHIVE_PAGES pages)
+    /archive-cursor/?after=  même archive, pages chaînées par un curseur opaque (suivies une à une)
+    /favicon.ico
+    /google/search?q=...     GOOGLE_NEWS_URL=http://HOST:PORT/google
+    /google/rss/search?q=... flux RSS de recherche Google News
+    /yahoo/search?p=...      YAHOO_NEWS_URL=http://HOST:PORT/yahoo
+    /yahoo/rss?p=...         YAHOO_NEWS_RSS_URL=http://HOST:PORT/yahoo/rss
+    /bing/news/search?q=...  BING_URL=http://HOST:PORT/bing (flux RSS avec &format=rss)
+    /baidu/ns?word=...       BAIDU_NEWS_URL=http://HOST:PORT/baidu
+    /searx/search?q=...      SEARXNG_INSTANCES=http://HOST:PORT/searx
+
+Usage :
+    python -m benchmarks.stub_web [--port 8900] [--latency-ms 80] [--jitter-ms 40]
+                                  [--error-rate 0.02] [--hang-rate 0.005] [--no-rss]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import make_corpus
+
+# Pages des archives paginées
+ARCHIVE_PAGES = 20
+
+FAVICON = bytes.fromhex("00000100010010100000010020006804000016000000") + b"\0" * 1128
+
+
+@lru_cache(maxsize=1024)
+def site_page(n: int) -> bytes:
+    rng = random.Random(f"site-{n}")
+    generator = make_corpus.news_homepage if n % 10 == 9 else make_corpus.small_blog
+    return generator(rng).encode("utf-8")
+
+
+def _archive_cursor(number: int) -> str:
+    return format(number * 7919, "x")
+
+
+@lru_cache(maxsize=None)
+def archive_page(number: int, cursor: bool) -> bytes:
+    if cursor:
+        href = lambda n: "/archive-cursor/" if n == 1 else f"/archive-cursor/?after={_archive_cursor(n)}"
+    else:
+        href = lambda n: "/archive/" if n == 1 else f"/archive/page/{n}/"
+    return make_corpus.archive_page(random.Random(f"archive-{number}"), number, ARCHIVE_PAGES, href).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def engine_page(engine: str) -> bytes:
+    generators = {
+        "google": make_corpus.small_blog,
+        "yahoo": make_corpus.yahoo_search,
+        "bing": make_corpus.bing_search,
+        "baidu": make_corpus.baidu_search,
+    }
+    return generators[engine](random.Random(f"engine-{engine}")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def engine_feed(engine: str) -> bytes:
+    generators = {
+        "google": make_corpus.google_rss,
+        "yahoo": make_corpus.yahoo_rss,
+        "bing": make_corpus.bing_rss,
+    }
+    return generators[engine](random.Random(f"engine-rss-{engine}")).encode("utf-8")
+
+
+def searx_results(query: str) -> bytes:
+    rng = random.Random(query)
+    return json.dumps({
+        "query": query,
+        "search_time": round(rng.uniform(0.2, 1.5), 3),
+        "results": [
+            {
+                "title": make_corpus.sentence(rng, 7),
+                "url": f"https://www.result-{i}.example/{query.replace(' ', '-')}",
+                "content": make_corpus.sentence(rng, 25),
+                "engine": rng.choice(("google", "bing", "duckduckgo")),
+            }
+            for i in range(10)
+        ],
+    }).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None  # argparse.Namespace, fixé par main()
+    stats = {"requests": 0, "errors": 0, "hangs": 0}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def inject_faults(self) -> bool:
+        """Applique latence, blocage et erreurs ; True si la réponse a déjà été envoyée"""
+        config = self.config
+        delay = max(0.0, random.gauss(config.latency_ms, config.jitter_ms)) / 1000
+        roll = random.random()
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            if roll < config.hang_rate:
+                self.stats["hangs"] += 1
+            elif roll < config.hang_rate + config.error_rate:
+                self.stats["errors"] += 1
+
+        if roll < config.hang_rate:
+            time.sleep(config.hang_seconds)
+            self.close_connection = True
+            return True
+        time.sleep(delay)
+        if roll < config.hang_rate + config.error_rate:
+            self.send_body(random.choice((500, 502, 503, 429)), b"injected error", "text/plain")
+            return True
+        return False
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+
+        if path == "/_stats":
+            self.send_body(200, json.dumps(self.stats).encode("utf-8"), "application/json")
+            return
+        if self.inject_faults():
+            return
+
+        html = "text/html; charset=utf-8"
+        parts = path.strip("/").split("/")
+        if path == "/favicon.ico":
+            self.send_body(200, FAVICON, "image/x-icon")
+        elif parts[0] == "sites" and len(parts) > 1 and parts[1].isdigit():
+            self.send_body(200, site_page(int(parts[1])), html)
+        elif path == "/archive/" or (parts[0] == "archive" and len(parts) == 3 and parts[1] == "page" and parts[2].isdigit()):
+            number = int(parts[2]) if len(parts) == 3 else 1
+            if 1 <= number <= ARCHIVE_PAGES:
+                self.send_body(200, archive_page(number, False), html)
+            else:
+                self.send_body(404, b"not found", "text/plain")
+        elif path == "/archive-cursor/":
+            after = query.get("after", [None])[0]
+            pages = {_archive_cursor(n): n for n in range(2, ARCHIVE_PAGES + 1)}
+            if after is None or after in pages:
+                self.send_body(200, archive_page(pages.get(after, 1), True), html)
+            else:
+                self.send_body(404, b"not found", "text/plain")
+        elif path in ("/google/rss/search", "/yahoo/rss") or (path == "/bing/news/search" and query.get("format") == ["rss"]):
+            if self.config.no_rss:
+                self.send_body(404, b"not found", "text/plain")
+            else:
+                self.send_body(200, engine_feed(parts[0]), "application/rss+xml; charset=utf-8")
+        elif path in ("/google/search", "/yahoo/search", "/bing/news/search", "/baidu/ns"):
+            self.send_body(200, engine_page(parts[0]), html)
+        elif path == "/searx/search":
+            self.send_body(200, searx_results(query.get("q", [""])[0]), "application/json")
+        else:
+            self.send_body(404, b"not found", "text/plain")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=80, help="latence moyenne ajoutée à chaque réponse")
+    parser.add_argument("--jitter-ms", type=float, default=40, help="écart type de la latence")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="part des réponses en erreur (5xx / 429)")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="part des requêtes qui ne répondent jamais")
+    parser.add_argument("--no-rss", action="store_true", help="pas de flux RSS de recherche (repli des scrapers sur le HTML)")
+    parser.add_argument("--hang-seconds", type=float, default=30, help="durée d'un blocage avant fermeture")
+    StubHandler.config = parser.parse_args()
+
+    server = ThreadingHTTPServer((StubHandler.config.host, StubHandler.config.port), StubHandler)
+    server.daemon_threads = True
+    base = f"http://{StubHandler.config.host}:{StubHandler.config.port}"
+    print(f"Serveur de bouchons sur {base} ; variables pour l'API :")
+    print(f"  GOOGLE_NEWS_URL={base}/google YAHOO_NEWS_URL={base}/yahoo YAHOO_NEWS_RSS_URL={base}/yahoo/rss BING_URL={base}/bing")
+    print(f"  BAIDU_NEWS_URL={base}/baidu SEARXNG_INSTANCES={base}/searx SEARXNG_MIN_DELAY=0 SEARXNG_MAX_DELAY=0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
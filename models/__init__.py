@@ -5,6 +5,9 @@ from .popular_site_to_scan_model import PopularSiteToScanEntity
 from .discovery_popular_feed_model import DiscoveryPopularFeedEntity
 from .feed_model import FeedEntity
 from .article_model import ArticleEntity
+from .theme_article_model import ThemeArticleEntity
+from .article_simhash_model import ArticleSimhashEntity
+from .article_record import ArticleRecord, SourcedArticleRecord
 
 # Export all models for easier imports
 __all__ = [
@@ -15,4 +18,8 @@ __all__ = [
     'DiscoveryPopularFeedEntity',
     'FeedEntity',
     'ArticleEntity',
+    'ThemeArticleEntity',
+    'ArticleSimhashEntity',
+    'ArticleRecord',
+    'SourcedArticleRecord',
 ]
@@ -14,6 +14,8 @@ class ArticleEntity(Base):
     __table_args__ = (
         Index('articles_feed_id_index', 'feed_id'),
         Index('articles_url_index', 'url'),
+        # Curseurs de timeline : articles d'un flux du plus récent au plus ancien
+        Index('articles_feed_id_publication_date_index', 'feed_id', 'publication_date', 'id'),
     )
 
     id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True)
@@ -23,7 +25,9 @@ class ArticleEntity(Base):
 
     # Données de l'article
     title: Mapped[str] = mapped_column(String(512))
+    # Lien canonique (utils/canonical_url.py) et lien tel que reçu
     url: Mapped[str] = mapped_column(String(1024))
+    original_url: Mapped[Optional[str]] = mapped_column(String(2048))
     description: Mapped[Optional[str]] = mapped_column(Text)
     publication_date: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
 
@@ -38,6 +42,7 @@ class ArticleEntity(Base):
             'url': self.url,
             'description': self.description,
             'publication_date': self.publication_date,
+            'original_url': self.original_url,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
         }
@@ -50,6 +55,7 @@ class ArticleBase(BaseModel):
     url: str
     description: Optional[str] = None
     publication_date: Optional[datetime] = None
+    original_url: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
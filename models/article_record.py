@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class ArticleRecord:
+    """
+    Article extrait d'une page, de l'extraction jusqu'à la réponse.
+    Sérialisé directement par orjson (dataclass native) avec les clés de l'API :
+    title, url, description, publication_date, original_url.
+    url est le lien canonique (utils/canonical_url.py), original_url le lien tel que trouvé.
+    """
+    __slots__ = ("title", "url", "description", "publication_date", "original_url")
+
+    title: str
+    url: Optional[str]
+    description: str
+    publication_date: Optional[datetime]
+    original_url: Optional[str]
+
+
+@dataclass
+class SourcedArticleRecord(ArticleRecord):
+    """Article d'un moteur d'actualités (Yahoo, Bing, Baidu), avec le nom de la source"""
+    __slots__ = ("source",)
+
+    source: str
@@ -0,0 +1,35 @@
+from sqlalchemy import Index, SmallInteger
+from sqlalchemy.dialects.mysql import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Index LSH des empreintes SimHash des articles (utils/simhash.py), maintenu à l'insertion
+# des articles : une ligne par bande de l'empreinte. La clé primaire (band, band_value,
+# article_id) regroupe les candidats d'une bande : la recherche des quasi-doublons d'un
+# article est une lecture de quelques plages, sans parcourir tous les articles.
+class ArticleSimhashEntity(Base):
+    __tablename__ = 'article_simhash_bands'
+    __table_args__ = (
+        Index('article_simhash_bands_article_id_index', 'article_id'),
+    )
+
+    # -1 (UNINDEXED_BAND) : article trop court pour une empreinte, marqué comme traité
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    # Largeur d'une bande : 64 / BANDS bits (64 avec NEAR_DUPLICATE_MAX_DISTANCE=0), stockée signée
+    band_value: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, autoincrement=False)
+    article_id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, autoincrement=False)
+
+    feed_id: Mapped[int] = mapped_column(BIGINT(20))
+    # Empreinte 64 bits complète, stockée signée (utils.simhash.to_signed)
+    simhash: Mapped[int] = mapped_column(BIGINT(20))
+
+    def to_dict(self):
+        return {
+            'band': self.band,
+            'band_value': self.band_value,
+            'article_id': self.article_id,
+            'feed_id': self.feed_id,
+            'simhash': self.simhash,
+        }
@@ -83,6 +83,7 @@ class ArticleInFeedInput(BaseModel):
     url: str
     description: Optional[str] = None
     publication_date: Optional[datetime] = None
+    original_url: Optional[str] = None
 
 
 class FeedDataAND_ARTICLE(BaseModel):
@@ -95,6 +96,10 @@ class FeedDataAND_ARTICLE(BaseModel):
     articles: List[ArticleInFeedInput] = Field(default_factory=list)
 
 
+class FeedBatchRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1)
+    stream: bool = False
+
 
 class FeedResponse(FeedBase):
     id: int
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, String, TIMESTAMP, Text
+from sqlalchemy.dialects.mysql import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+# Vue matérialisée des articles par thème, maintenue à l'insertion des articles.
+# La clé primaire (theme_id, sort_date, article_id) est l'index cluster d'InnoDB :
+# une page de thème est un simple parcours de plage, sans jointure.
+class ThemeArticleEntity(Base):
+    __tablename__ = 'theme_articles'
+    __table_args__ = (
+        Index('theme_articles_article_id_index', 'article_id'),
+        Index('theme_articles_feed_id_index', 'feed_id'),
+    )
+
+    theme_id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, autoincrement=False)
+    # Date de publication, ou date d'insertion si l'article n'en a pas
+    sort_date: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True)
+    article_id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, autoincrement=False)
+
+    feed_id: Mapped[int] = mapped_column(BIGINT(20))
+
+    # Données dénormalisées de l'article
+    title: Mapped[str] = mapped_column(String(512))
+    url: Mapped[str] = mapped_column(String(1024))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    publication_date: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+
+    def to_dict(self):
+        return {
+            'theme_id': self.theme_id,
+            'sort_date': self.sort_date,
+            'article_id': self.article_id,
+            'feed_id': self.feed_id,
+            'title': self.title,
+            'url': self.url,
+            'description': self.description,
+            'publication_date': self.publication_date,
+        }
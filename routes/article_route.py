@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from dotenv import load_dotenv
+from utils import simhash
+from utils.database import get_db
+from utils.near_duplicates import find_stored_duplicates
+from utils.responses import ORJSONResponse
+import logging
+from models.feed_model import FeedEntity
+from models.article_model import ArticleEntity
+
+router = APIRouter(
+    prefix="/api/service-feeds",
+    tags=["Articles"],
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
+)
+
+# Charger les variables d'environnement avant d'importer les autres modules
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+
+@router.get("/articles/{article_id}/duplicates")
+def get_article_duplicates(article_id: int, db: Session = Depends(get_db)):
+    """
+    Quasi-doublons enregistrés d'un article, parmi les flux du même utilisateur
+
+    La recherche passe par l'index article_simhash_bands (empreintes SimHash
+    découpées en bandes) : seuls les articles partageant une bande sont comparés.
+
+    Args:
+        article_id: Identifiant de l'article
+
+    Returns:
+        JSON: L'article et ses quasi-doublons, du plus proche au plus éloigné
+    """
+    try:
+        row = db.execute(
+            select(ArticleEntity, FeedEntity.user_id)
+            .join(FeedEntity, FeedEntity.id == ArticleEntity.feed_id)
+            .where(ArticleEntity.id == article_id)
+        ).first()
+        if row is None:
+            return ORJSONResponse(status_code=404, content={"message": "article not found", "data": {}})
+        article, user_id = row
+
+        value = simhash.article_simhash(article.title, article.description)
+        matches = [] if value is None else find_stored_duplicates(db, value, user_id=user_id, exclude_article_id=article.id)
+        distances = dict(matches)
+        duplicates = db.execute(
+            select(ArticleEntity).where(ArticleEntity.id.in_(distances))
+        ).scalars().all() if distances else []
+
+        return ORJSONResponse(
+            status_code=200,
+            content={
+                "message": "duplicates retrieved successfully",
+                "data": {
+                    "article": article.to_dict(),
+                    "duplicates": sorted(
+                        ({**duplicate.to_dict(), "distance": distances[duplicate.id]} for duplicate in duplicates),
+                        key=lambda item: (item["distance"], item["id"]),
+                    )
+                }
+            }
+        )
+
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
@@ -1,29 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from dotenv import load_dotenv
 # Importer les dépendances depuis le fichier dependencies.py
 from utils.dependencies import StandardResponse
 from utils.database import get_db
+from utils.responses import ORJSONResponse, dumps
+from utils import admission, canonical_url, dates, deadline, fingerprint, http_client, metrics, page_links, profiling, rss_reader, simhash, snapshots, tracing
+import sources as news_sources
+from sources import engine as source_engine
+from utils.batch import map_bounded
+from utils.feed_writer import OUTPUT_FORMATS, feed_response
+from utils.near_duplicates import add_articles_to_simhash_index
+from utils.theme_summary import add_articles_to_theme_summary
 import os
 import requests
 import favicon
 import datetime
+import functools
+import time
 import logging
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+from urllib.parse import quote_plus, urlparse, urljoin
 from fastapi.responses import Response
 from feedgenerator import Rss201rev2Feed
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from models.feed_model import FeedDataAND_ARTICLE, FeedEntity
+from models.feed_model import FeedDataAND_ARTICLE, FeedBatchRequest, FeedEntity
 from models.article_model import ArticleEntity
+from models.article_record import ArticleRecord
 
 router = APIRouter(
     prefix="/api/service-feeds",
     tags=["Feeds"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 # Charger les variables d'environnement avant d'importer les autres modules
@@ -33,12 +46,71 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 logger.addHandler(logging.StreamHandler())
 
+# Limites du endpoint /feeds/batch
+FEED_BATCH_MAX_URLS = int(os.getenv('FEED_BATCH_MAX_URLS', '50'))
+FEED_BATCH_CONCURRENCY = int(os.getenv('FEED_BATCH_CONCURRENCY', '8'))
+FEED_BATCH_PER_HOST = int(os.getenv('FEED_BATCH_PER_HOST', '2'))
 
-def get_site_info(url: str):
+# Nombre maximal d'éléments lus dans le flux RSS de /feed-subject (Google News)
+FEED_SUBJECT_MAX_RESULTS = int(os.getenv('FEED_SUBJECT_MAX_RESULTS', '100'))
+
+# Arrêter le téléchargement d'une page après ce nombre de conteneurs d'articles (<article>, <h1>-<h3>) ; 0 = page entière
+FEED_EARLY_STOP_CONTAINERS = int(os.getenv('FEED_EARLY_STOP_CONTAINERS', '0'))
+
+# Mode pagination de /feed (max_pages > 1) : nombre maximal de pages suivies, plafond d'articles
+# toutes pages confondues et budget de temps (secondes, borné par celui de la requête)
+FEED_CRAWL_MAX_PAGES = int(os.getenv('FEED_CRAWL_MAX_PAGES', '10'))
+FEED_CRAWL_MAX_ARTICLES = int(os.getenv('FEED_CRAWL_MAX_ARTICLES', '500'))
+FEED_CRAWL_TIME_BUDGET = float(os.getenv('FEED_CRAWL_TIME_BUDGET', '10'))
+# Pages d'un même site téléchargées simultanément en mode pagination
+FEED_CRAWL_PER_HOST = int(os.getenv('FEED_CRAWL_PER_HOST', str(FEED_BATCH_PER_HOST)))
+
+
+def _multi_source_fan_out(params: Dict[str, str]) -> int:
+    if not params.get("sources"):
+        return len(news_sources.multi_source_names())
+    return len({source.strip().lower() for source in params["sources"].split(",") if news_sources.get_adapter(source.strip().lower())})
+
+
+# Scrapes lancés en parallèle par une requête : places occupées dans le budget d'admission
+admission.register_fan_out("/api/service-feeds/feed", lambda params: FEED_CRAWL_PER_HOST if int(params.get("max_pages", 1)) > 1 else 1)
+admission.register_fan_out("/api/service-feeds/feeds/batch", lambda params: FEED_BATCH_CONCURRENCY)
+admission.register_fan_out("/api/service-feeds/multi-sources/", _multi_source_fan_out)
+
+
+def parse_html(html, parser: str = 'lxml', encoding: str = None) -> BeautifulSoup:
+    """
+    Parse le HTML (durée mesurée dans l'étape 'parse').
+    html peut être le corps brut (bytes) avec son encoding : lxml le décode alors lui-même.
+    """
+    deadline.check('parse')
+    with metrics.stage('parse'):
+        return BeautifulSoup(html, parser, from_encoding=encoding)
+
+
+def parse_response(response: requests.Response) -> BeautifulSoup:
+    """Parse une page téléchargée par http_client.get, sans la décoder en Python"""
+    return parse_html(response.content, encoding=response.encoding)
+
+
+def get_site_info(url: str, soup: BeautifulSoup = None, html: str = None, content_types=http_client.HTML_CONTENT_TYPES):
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
+        # Réutiliser la page déjà téléchargée si elle est fournie
+        if soup is None:
+            response = http_client.get(url, content_types=content_types)
+            response.raise_for_status()
+            html = response.text
+            if response.headers.get('Content-Type', '').startswith(rss_reader.FEED_CONTENT_TYPES):
+                # Flux RSS (abonnement OPML sans page HTML) : informations du canal
+                channel, _ = rss_reader.parse_feed(response.content, 1)
+                parsed = urlparse(url)
+                return {
+                    "title": channel.title or parsed.netloc,
+                    "description": channel.description,
+                    # Pas de balises <link rel="icon"> dans un flux : /favicon.ico à la racine du site
+                    "icon_url": channel.image or http_client.get_favicon_url(f"{parsed.scheme}://{parsed.netloc}/", "")
+                }
+            soup = parse_response(response)
         
         # Get site title
         title = soup.title.string if soup.title else urlparse(url).netloc
@@ -49,20 +121,16 @@ def get_site_info(url: str):
         if meta_desc:
             description = meta_desc.get("content", "")
         
-        # Get favicon
-        icon_url = None
-        try:
-            icons = favicon.get(url)
-            if icons:
-                icon_url = icons[0].url
-        except:
-            pass
+        # Get favicon (mis en cache par site)
+        icon_url = http_client.get_favicon_url(url, html)
             
         return {
             "title": title,
             "description": description,
             "icon_url": icon_url
         }
+    except deadline.DeadlineExceeded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur lors de la récupération des informations du site: {str(e)}")
 
@@ -104,7 +172,19 @@ def get_main_image(element, url: str) -> Optional[str]:
     return None
 
 def extract_articles(url: str, soup: BeautifulSoup):
+    deadline.check('extract')
+    with metrics.stage('extract'):
+        articles = _extract_articles(url, soup)
+    # Quasi-doublons (même article sous deux blocs, titre légèrement différent)
+    with metrics.stage('dedupe'):
+        articles = simhash.dedupe(articles)
+    metrics.observe_articles('site', len(articles))
+    return articles
+
+def _extract_articles(url: str, soup: BeautifulSoup):
     articles = []
+    now = datetime.now()
+    image_seconds = 0.0  # temps cumulé de get_main_image
     seen_titles = set()  # Pour suivre les titres uniques
     seen_links = set()   # Pour suivre les liens uniques
     
@@ -124,9 +204,11 @@ def extract_articles(url: str, soup: BeautifulSoup):
         link_element = title_element.find('a') or element.find('a')
         if link_element and link_element.get('href'):
             link = urljoin(url, link_element['href'])
+        # Lien canonique (sans paramètres de suivi ni fragment) : base de la déduplication
+        canonical_link = canonical_url.canonicalize(link) if link else None
             
         # Vérifier si l'article est un doublon
-        if title.lower() in seen_titles or (link and link in seen_links):
+        if title.lower() in seen_titles or (canonical_link and canonical_link in seen_links):
             continue
             
         # Chercher une description
@@ -135,48 +217,43 @@ def extract_articles(url: str, soup: BeautifulSoup):
         if desc_element:
             description = desc_element.get_text(strip=True)
             
-        # Chercher une date
-        pub_date = datetime.now()
+        # Chercher une date : attribut datetime d'un <time>, sinon texte de l'élément de date
+        # (« 12 mars 2024 », « il y a 2 heures »... voir utils/dates.py), sinon l'heure du crawl
         date_element = element.find(['time', 'span', 'div'], class_=lambda x: x and ('date' in x.lower() or 'time' in x.lower()))
-        if date_element:
-            try:
-                # Si l'élément time a un attribut datetime, l'utiliser
-                if date_element.name == 'time' and date_element.get('datetime'):
-                    pub_date = datetime.fromisoformat(date_element['datetime'].replace('Z', '+00:00'))
-            except:
-                # Si la conversion échoue, garder la date actuelle
-                pass
+        if date_element is None:
+            date_element = element.find('time')
+        elif date_element.name != 'time':
+            date_element = date_element.find('time') or date_element
+        pub_date = dates.element_date(date_element, now) or now
         
         # Chercher l'image principale
+        image_start = time.perf_counter()
         image_url = get_main_image(element, url)
+        image_seconds += time.perf_counter() - image_start
         
         if title and (link or description):
             # Ajouter aux ensembles de suivi
             seen_titles.add(title.lower())
-            if link:
-                seen_links.add(link)
+            if canonical_link:
+                seen_links.add(canonical_link)
                 
             # Ajouter l'image à la description si elle existe
             if image_url:
                 description = f'<img src="{image_url}" /><br/>{description}'
                 
-            articles.append({
-                "title": title,
-                "link": link,
-                "description": description,
-                "pub_date": pub_date
-            })
+            articles.append(ArticleRecord(title, canonical_link or canonical_url.canonicalize(url), description, pub_date, link or url))
     
+    metrics.observe_stage('main_image', image_seconds)
     return articles
 
-def generate_feed_data(url: str, site_info: Dict[str, Any], articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+def generate_feed_data(url: str, site_info: Dict[str, Any], articles: List[ArticleRecord]) -> Dict[str, Any]:
     """
     Génère une structure de données JSON à partir des informations du site et des articles.
     
     Args:
         url: URL du site source
         site_info: Dictionnaire contenant les informations du site
-        articles: Liste des articles extraits
+        articles: Liste des articles extraits (repris tels quels, sérialisés par orjson)
         
     Returns:
         Dict: Structure de données contenant les informations du flux
@@ -188,80 +265,389 @@ def generate_feed_data(url: str, site_info: Dict[str, Any], articles: List[Dict[
             "description": site_info["description"],
             "favicon": site_info["icon_url"]
         },
-        "articles": [
-            {
-                "title": article["title"],
-                "url": article["link"] or url,
-                "description": article["description"],
-                "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None
-            }
-            for article in articles
-        ]
+        "articles": articles
     }
 
-@router.get("/feed")
-async def get_feed(url: str, db: Session = Depends(get_db)):
+def build_feed(url: str):
+    """
+    Télécharge une page, en extrait les articles et construit le flux.
+    
+    Args:
+        url: URL du site source
+        
+    Returns:
+        Tuple: (code de statut HTTP, contenu de la réponse)
+    """
+    # Exécutée dans le pool de threads : à inclure dans le profil de la requête s'il y en a un
+    with profiling.track_thread():
+        return _build_feed(url)
+
+def _build_feed(url: str):
     try:
         # Vérifier l'URL
         if not url.startswith(('http://', 'https://')):
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "message": "URL invalide",
-                    "data": {}
-                }
-            )
+            return 400, {
+                "message": "URL invalide",
+                "data": {}
+            }
             
-        # Faire la requête HTTP
-        response = requests.get(url)
+        # Faire la requête HTTP (corps borné, type de contenu vérifié avant la lecture)
+        response = http_client.get(url, stop_after_containers=FEED_EARLY_STOP_CONTAINERS)
         response.raise_for_status()
         
+        # Page inchangée depuis le crawl précédent (parties volatiles ignorées) : réutiliser l'extraction
+        with metrics.stage('fingerprint'):
+            page_fingerprint = fingerprint.fingerprint(response.content)
+            page_status, feed_data = fingerprint.tracker.observe(url, page_fingerprint)
+        metrics.observe_page_change(page_status)
+        tracing.set_attributes(**{"page.status": page_status, "page.cached_extraction": feed_data is not None})
+        if feed_data is not None:
+            # La page est capturée même inchangée : l'empreinte ignore une partie des octets
+            snapshots.record('site', url, response, feed_data["articles"])
+            return 200, {
+                "message": "Feed generated successfully",
+                "data": feed_data
+            }
+        
         # Parser le HTML
-        soup = BeautifulSoup(response.text, 'lxml')
+        html = response.text
+        soup = parse_response(response)
         
-        # Obtenir les informations du site
-        site_info = get_site_info(url)
+        # Obtenir les informations du site à partir de la page déjà téléchargée
+        site_info = get_site_info(url, soup, html)
         
         # Extraire les articles
         articles = extract_articles(url, soup)
+        snapshots.record('site', url, response, articles)
         
         if not articles:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "message": "no article found",
-                    "data": {}
-                }
-            )
+            return 404, {
+                "message": "no article found",
+                "data": {}
+            }
         
         # Générer la structure de données
         feed_data = generate_feed_data(url, site_info, articles)
+        fingerprint.tracker.store(url, page_fingerprint, feed_data)
         
-        # Retourner la réponse JSON
-        return JSONResponse(
-            status_code=200,
-            content={
-                "message": "Feed generated successfully",
-                "data": feed_data
-            }
-        )
+        return 200, {
+            "message": "Feed generated successfully",
+            "data": feed_data
+        }
         
-    except requests.exceptions.RequestException as e:
-        return JSONResponse(
+    except Exception as e:
+        return feed_error(e)
+
+
+def feed_error(e: Exception):
+    """Code de statut HTTP et contenu de la réponse pour une erreur de scrape d'une page"""
+    if isinstance(e, deadline.DeadlineExceeded):
+        return 504, {
+            "message": "deadline exceeded",
+            "data": str(e)
+        }
+    if isinstance(e, http_client.UnsupportedContentType):
+        return 415, {
+            "message": "unsupported content type",
+            "data": str(e)
+        }
+    if isinstance(e, requests.exceptions.RequestException):
+        return 400, {
+            "message":"error http request",
+            "data": f"Error HTTP request: {str(e)}"
+        }
+    return 500, {
+        "message":"error internal",
+        "data": f"Error internal: {str(e)}"
+    }
+
+
+def crawl_page(url: str, stop_at: float, with_site_info: bool = False):
+    """
+    Télécharge une page d'une liste paginée (mode pagination de /feed). La page
+    entière est lue (la pagination est en bas de page) et le budget du crawl
+    (stop_at, horloge monotone) borne le téléchargement en cours.
+
+    Args:
+        url: URL de la page
+        stop_at: Fin du budget du crawl (time.monotonic())
+        with_site_info: Renvoyer aussi les informations du site (première page)
+
+    Returns:
+        Tuple: (code de statut HTTP, contenu) ; data contient site, articles et next
+        (liens vers la page suivante)
+    """
+    with profiling.track_thread(), deadline.deadline_scope(stop_at - time.monotonic()):
+        try:
+            with tracing.span('crawl.page', url=url):
+                response = http_client.get(url)
+                if response.status_code in (404, 410):
+                    return 404, {"message": "page not found", "data": {}}
+                response.raise_for_status()
+                soup = parse_response(response)
+                site_info = get_site_info(url, soup, response.text) if with_site_info else None
+                articles = extract_articles(url, soup)
+                snapshots.record('site', url, response, articles)
+                return 200, {
+                    "message": "page crawled",
+                    "data": {"site": site_info, "articles": articles, "next": page_links.next_pages(soup, url)}
+                }
+        except Exception as e:
+            return feed_error(e)
+
+
+async def crawl_feed(url: str, first_page: dict, max_pages: int, max_articles: int, stop_at: float):
+    """
+    Suit la pagination d'une liste d'articles à partir de sa première page, déjà
+    téléchargée. Une pagination numérotée (?page=N, /page/N) est téléchargée par lots
+    simultanés (FEED_CRAWL_PER_HOST pages à la fois) ; sinon les liens « page suivante »
+    sont suivis un à un. Les articles déjà vus sur une page précédente (même lien ou
+    quasi-doublon) sont écartés.
+
+    Yields:
+        Une entrée par page, dans l'ordre des pages : page, url, status_code, message et
+        articles (nouveaux uniquement) ; puis le bilan : done, pages, articles et stopped
+        (last_page, max_pages, max_articles, time_budget ou error)
+    """
+    seen_links = set()
+    near_duplicates = simhash.SimHashIndex()
+    crawled = []
+    total = 0
+
+    def take(number: int, page_url: str, status_code: int, content: dict):
+        nonlocal total
+        event = {"page": number, "url": page_url, "status_code": status_code, "message": content["message"], "articles": []}
+        if status_code != 200:
+            # Un téléchargement coupé par la fin du budget échoue en délai de lecture (400)
+            if status_code == 504 or time.monotonic() >= stop_at:
+                return event, "time_budget"
+            return event, "last_page" if status_code == 404 else "error"
+        crawled.append(page_url)
+        page_link = canonical_url.canonicalize(page_url)
+        for article in content["data"]["articles"]:
+            if total >= max_articles:
+                break
+            # Les articles sans lien portent celui de la page : seule la similarité les départage
+            if article.url != page_link:
+                if article.url in seen_links:
+                    continue
+                seen_links.add(article.url)
+            value = simhash.article_simhash(article.title, article.description)
+            if value is not None:
+                if near_duplicates.query(value):
+                    continue
+                near_duplicates.add(article.url, value)
+            event["articles"].append(article)
+            total += 1
+        if total >= max_articles:
+            return event, "max_articles"
+        # Page vide ou déjà vue (certains sites renvoient la dernière page au-delà de la fin)
+        return event, None if event["articles"] else "last_page"
+
+    event, stopped = take(1, url, 200, first_page)
+    yield event
+    number = 1
+    current_url, next_links = url, first_page["data"]["next"]
+    visited = {canonical_url.canonicalize(url)}
+    while stopped is None:
+        next_url = next((link for link in next_links if canonical_url.canonicalize(link) not in visited), None)
+        if next_url is None:
+            stopped = "last_page"
+            break
+        if number >= max_pages:
+            stopped = "max_pages"
+            break
+        if time.monotonic() >= stop_at:
+            stopped = "time_budget"
+            break
+
+        batch = page_links.page_series(current_url, next_url, max_pages - number)
+        visited.update(canonical_url.canonicalize(page_url) for page_url in batch)
+        numbers = {page_url: number + 1 + index for index, page_url in enumerate(batch)}
+        results = map_bounded(functools.partial(crawl_page, stop_at=stop_at), batch, FEED_CRAWL_PER_HOST, FEED_CRAWL_PER_HOST)
+        ready = {}
+        next_links = []
+        try:
+            async for page_url, result in results:
+                # Pages terminées dans le désordre : rendues dans l'ordre, la fin de liste coupe le lot
+                ready[numbers[page_url]] = (page_url, result)
+                while stopped is None and number + 1 in ready:
+                    number += 1
+                    current_url, (status_code, content) = ready.pop(number)
+                    event, stopped = take(number, current_url, status_code, content)
+                    next_links = content["data"]["next"] if status_code == 200 else []
+                    yield event
+                if stopped is not None:
+                    break
+        finally:
+            await results.aclose()
+
+    yield {"done": True, "pages": len(crawled), "articles": total, "stopped": stopped}
+
+
+def invalid_format_response():
+    return ORJSONResponse(
+        status_code=400,
+        content={
+            "message": f"invalid format (expected one of: {', '.join(OUTPUT_FORMATS)})",
+            "data": {}
+        }
+    )
+
+
+@router.get("/feed")
+async def get_feed(url: str, request: Request, format: str = "json", max_pages: int = 1,
+                   max_articles: Optional[int] = None, stream: bool = False, db: Session = Depends(get_db)):
+    """
+    Générer le flux d'un site à partir de sa page
+    
+    Args:
+        url: URL du site source
+        format: json, rss ou atom
+        max_pages: Pages de la liste d'articles à suivre (pagination, au plus FEED_CRAWL_MAX_PAGES)
+        max_articles: Nombre maximal d'articles en mode pagination (au plus FEED_CRAWL_MAX_ARTICLES)
+        stream: Envoyer les articles de chaque page en NDJSON dès qu'ils sont extraits
+    """
+    if format not in OUTPUT_FORMATS:
+        return invalid_format_response()
+    if max_pages > 1 or stream:
+        return await get_paginated_feed(url, request, format, max_pages, max_articles, stream)
+    
+    status_code, content = await run_in_threadpool(build_feed, url)
+    
+    # Flux RSS/Atom pour les lecteurs de flux (les erreurs restent en JSON)
+    if format != "json" and status_code == 200:
+        site = content["data"]["site"]
+        return feed_response(request, format, site["title"], url, site["description"], content["data"]["articles"])
+    
+    return ORJSONResponse(status_code=status_code, content=content)
+
+
+async def get_paginated_feed(url: str, request: Request, format: str, max_pages: int, max_articles: Optional[int], stream: bool):
+    if not 1 <= max_pages <= FEED_CRAWL_MAX_PAGES:
+        return ORJSONResponse(status_code=400, content={"message": f"invalid max_pages (expected 1 to {FEED_CRAWL_MAX_PAGES})", "data": {}})
+    if max_articles is not None and max_articles < 1:
+        return ORJSONResponse(status_code=400, content={"message": "invalid max_articles", "data": {}})
+    if stream and format != "json":
+        return ORJSONResponse(status_code=400, content={"message": "stream is only available with format=json", "data": {}})
+    if not url.startswith(('http://', 'https://')):
+        return ORJSONResponse(status_code=400, content={"message": "URL invalide", "data": {}})
+    max_articles = min(max_articles or FEED_CRAWL_MAX_ARTICLES, FEED_CRAWL_MAX_ARTICLES)
+    stop_at = time.monotonic() + min(FEED_CRAWL_TIME_BUDGET, deadline.remaining(FEED_CRAWL_TIME_BUDGET))
+    
+    # Première page : ses erreurs sont celles de /feed
+    status_code, first_page = await run_in_threadpool(crawl_page, url, stop_at, True)
+    if status_code == 200 and not first_page["data"]["articles"]:
+        status_code, first_page = 404, {"message": "no article found", "data": {}}
+    if status_code != 200:
+        return ORJSONResponse(status_code=status_code, content=first_page)
+    site_info = first_page["data"]["site"]
+    pages = crawl_feed(url, first_page, max_pages, max_articles, stop_at)
+    
+    if stream:
+        async def stream_pages():
+            async for event in pages:
+                yield dumps(event) + b"\n"
+        
+        return StreamingResponse(stream_pages(), media_type="application/x-ndjson")
+    
+    articles, crawled, stopped = [], [], None
+    async for event in pages:
+        if event.get("done"):
+            stopped = event["stopped"]
+        elif event["status_code"] == 200:
+            crawled.append(event["url"])
+            articles.extend(event["articles"])
+    
+    if format != "json":
+        return feed_response(request, format, site_info["title"], url, site_info["description"], articles)
+    
+    feed_data = generate_feed_data(url, site_info, articles)
+    feed_data["crawl"] = {"pages": crawled, "stopped": stopped}
+    return ORJSONResponse(
+        status_code=200,
+        content={
+            "message": "Feed generated successfully",
+            "data": feed_data
+        }
+    )
+
+
+@router.get("/feed-changes")
+def get_feed_changes(url: str):
+    """
+    Fréquence de changement d'une page crawlée par /feed (en mémoire, depuis le démarrage)
+
+    Args:
+        url: URL du site source, telle que passée à /feed
+
+    Returns:
+        JSON: Nombre de crawls et de changements, dates du premier crawl et du dernier
+        changement, et intervalle de rafraîchissement suggéré (refresh_interval, en secondes)
+    """
+    try:
+        stats = fingerprint.tracker.stats(url)
+        if stats is None:
+            return ORJSONResponse(status_code=404, content={"message": "page never crawled", "data": {}})
+        return ORJSONResponse(status_code=200, content={"message": "change statistics", "data": stats})
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
+
+
+@router.post("/feeds/batch")
+async def get_feeds_batch(batch: FeedBatchRequest):
+    """
+    Générer les flux de plusieurs sites en parallèle
+    
+    Les sites sont scrapés simultanément dans la limite de FEED_BATCH_CONCURRENCY
+    requêtes au total et de FEED_BATCH_PER_HOST requêtes par hôte.
+    
+    Args:
+        batch: Liste des URLs, et stream=true pour recevoir les résultats en NDJSON
+               au fur et à mesure de leur génération
+        
+    Returns:
+        JSON: Résultat de chaque URL avec son propre code de statut
+    """
+    # Dédupliquer en conservant l'ordre
+    urls = list(dict.fromkeys(batch.urls))
+    if len(urls) > FEED_BATCH_MAX_URLS:
+        return ORJSONResponse(
             status_code=400,
             content={
-                "message":"error http request",
-                "data": f"Error HTTP request: {str(e)}"
+                "message": f"too many urls (max {FEED_BATCH_MAX_URLS})",
+                "data": {}
             }
         )
-    except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "message":"error internal",
-                "data": f"Error internal: {str(e)}"
+    
+    results = map_bounded(build_feed, urls, FEED_BATCH_CONCURRENCY, FEED_BATCH_PER_HOST)
+    
+    def to_result(url, status_code, content):
+        return {"url": url, "status_code": status_code, **content}
+    
+    if batch.stream:
+        async def stream_results():
+            async for url, (status_code, content) in results:
+                yield dumps(to_result(url, status_code, content)) + b"\n"
+        
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+    
+    by_url = {}
+    async for url, (status_code, content) in results:
+        by_url[url] = to_result(url, status_code, content)
+    
+    succeeded = sum(1 for result in by_url.values() if result["status_code"] == 200)
+    return ORJSONResponse(
+        status_code=200,
+        content={
+            "message": f"{succeeded}/{len(urls)} feeds generated successfully",
+            "data": {
+                "total": len(urls),
+                "succeeded": succeeded,
+                "results": [by_url[url] for url in urls]
             }
-        )
+        }
+    )
 
 
 # save feed with articles (payload provides same shape as retrieval articles)
@@ -270,7 +656,7 @@ async def save_feed(feed_data: FeedDataAND_ARTICLE, db: Session = Depends(get_db
     try:
         # Validate URL
         if not feed_data.url.startswith(("http://", "https://")):
-            return JSONResponse(status_code=400, content={"message": "URL invalide", "data": {}})
+            return ORJSONResponse(status_code=400, content={"message": "URL invalide", "data": {}})
 
         # Create FeedEntity
         feed = FeedEntity(
@@ -287,17 +673,26 @@ async def save_feed(feed_data: FeedDataAND_ARTICLE, db: Session = Depends(get_db
         db.flush()  # obtain feed.id without full commit
 
         # Create ArticleEntity entries
+        articles = []
         for a in feed_data.articles:
             article = ArticleEntity(
                 feed_id=feed.id,
                 title=a.title,
-                url=a.url,
+                url=canonical_url.canonicalize(a.url),
+                original_url=a.original_url or a.url,
                 description=a.description,
                 publication_date=a.publication_date,
                 created_at=datetime.now(),
                 updated_at=datetime.now(),
             )
             db.add(article)
+            articles.append(article)
+        db.flush()  # obtain article ids for the theme summary
+
+        # Maintain the theme_articles summary in the same transaction
+        add_articles_to_theme_summary(db, feed, articles)
+        # ... and the near-duplicate (SimHash) index
+        add_articles_to_simhash_index(db, articles)
 
         db.commit()
 
@@ -314,25 +709,29 @@ async def save_feed(feed_data: FeedDataAND_ARTICLE, db: Session = Depends(get_db
                     "title": a.title,
                     "url": a.url,
                     "description": a.description,
-                    "publication_date": a.publication_date.isoformat() if a.publication_date else None,
+                    "publication_date": a.publication_date,
+                    "original_url": a.original_url,
                 }
                 for a in db.query(ArticleEntity).filter(ArticleEntity.feed_id == feed.id).all()
             ],
         }
 
-        return JSONResponse(status_code=200, content={"message": "Feed saved successfully", "data": response_payload})
+        return ORJSONResponse(status_code=200, content={"message": "Feed saved successfully", "data": response_payload})
 
     except Exception as e:
         db.rollback()
-        return JSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
 
 #get feed about some subjet
 @router.get("/feed-subject")
-async def get_feed_subject(subject: str, db: Session = Depends(get_db)):
+def get_feed_subject(subject: str, request: Request, format: str = "json", db: Session = Depends(get_db)):
     try:
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
         # Vérifier le sujet
         if not subject:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400, 
                 content={
                     "message": "Subject is required",
@@ -340,21 +739,37 @@ async def get_feed_subject(subject: str, db: Session = Depends(get_db)):
                 }
             )
             
-        # Faire la requête HTTP
-        response = requests.get(f"https://news.google.com/search?q={subject}&hl=fr&gl=FR&ceid=FR:fr")
-        response.raise_for_status()
+        search_url = f"{news_sources.get_adapter('google').base_url}/search?q={quote_plus(subject)}&hl=fr&gl=FR&ceid=FR:fr"
         
-        # Parser le HTML
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Obtenir les informations du site
-        site_info = get_site_info(response.url)
-        
-        # Extraire les articles
-        articles = extract_articles(response.url, soup)
+        # Flux RSS de recherche Google News, sinon page de résultats HTML
+        rss = source_engine.fetch_rss('google', subject, FEED_SUBJECT_MAX_RESULTS)
+        if rss is not None:
+            _, channel, articles = rss
+            site_url = search_url
+            site_info = {
+                "title": channel.title or "Google News",
+                "description": channel.description,
+                "icon_url": channel.image or http_client.get_favicon_url(search_url),
+            }
+        else:
+            # Faire la requête HTTP
+            response = http_client.get(search_url)
+            response.raise_for_status()
+            
+            # Parser le HTML
+            html = response.text
+            soup = parse_response(response)
+            site_url = response.url
+            
+            # Obtenir les informations du site
+            site_info = get_site_info(response.url, soup, html)
+            
+            # Extraire les articles
+            articles = extract_articles(response.url, soup)
+            snapshots.record('site', response.url, response, articles)
         
         if not articles:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={
                     "message": "no article found",
@@ -366,23 +781,18 @@ async def get_feed_subject(subject: str, db: Session = Depends(get_db)):
         feed_data = {
             "site": {
                 "title": site_info["title"],
-                "url": response.url,
+                "url": site_url,
                 "description": site_info["description"],
                 "favicon": site_info["icon_url"]
             },
-            "articles": [
-                {
-                    "title": article["title"],
-                    "url": article["link"] or response.url,
-                    "description": article["description"],
-                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None
-                }
-                for article in articles
-            ]
+            "articles": articles
         }
         
+        if format != "json":
+            return feed_response(request, format, feed_data["site"]["title"], feed_data["site"]["url"], feed_data["site"]["description"], feed_data["articles"])
+        
         # Retourner la réponse JSON
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": "feed generated successfully",
@@ -390,18 +800,23 @@ async def get_feed_subject(subject: str, db: Session = Depends(get_db)):
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except requests.exceptions.RequestException as e:
-        return JSONResponse(status_code=400, content={"message":f"Erreur lors de la requête HTTP: {str(e)}"})
+        return ORJSONResponse(status_code=400, content={"message":f"Erreur lors de la requête HTTP: {str(e)}"})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
 
 #get feed about some subjet and url 
 @router.get("/feed-subject-url")
-async def get_feed_subject_url(subject: str, url: str, db: Session = Depends(get_db)):
+def get_feed_subject_url(subject: str, url: str, request: Request, format: str = "json", db: Session = Depends(get_db)):
     try:
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
         # Vérifier l'URL
         if not url.startswith(('http://', 'https://')):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400, 
                 content={
                     "message": "URL invalide",
@@ -410,27 +825,29 @@ async def get_feed_subject_url(subject: str, url: str, db: Session = Depends(get
             )
             
         # Faire la requête HTTP
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         
         # Parser le HTML
-        soup = BeautifulSoup(response.text, 'lxml')
+        html = response.text
+        soup = parse_response(response)
         
         # Obtenir les informations du site
-        site_info = get_site_info(url)
+        site_info = get_site_info(url, soup, html)
         
         # Extraire les articles
         articles = extract_articles(url, soup)
+        snapshots.record('site', url, response, articles)
 
         # Filtrer les articles en fonction du sujet
         articles = [
             article for article in articles 
-            if subject.lower() in article["title"].lower() or 
-               subject.lower() in article["description"].lower()
+            if subject.lower() in article.title.lower() or 
+               subject.lower() in article.description.lower()
         ]
         
         if not articles:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={
                     "message": "no article found for this subject",
@@ -446,19 +863,14 @@ async def get_feed_subject_url(subject: str, url: str, db: Session = Depends(get
                 "description": site_info["description"],
                 "favicon": site_info["icon_url"]
             },
-            "articles": [
-                {
-                    "title": article["title"],
-                    "url": article["link"] or url,
-                    "description": article["description"],
-                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None
-                }
-                for article in articles
-            ]
+            "articles": articles
         }
         
+        if format != "json":
+            return feed_response(request, format, feed_data["site"]["title"], feed_data["site"]["url"], feed_data["site"]["description"], feed_data["articles"])
+        
         # Retourner la réponse JSON
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": "feed generated successfully",
@@ -466,266 +878,59 @@ async def get_feed_subject_url(subject: str, url: str, db: Session = Depends(get
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except requests.exceptions.RequestException as e:
-        return JSONResponse(status_code=400, content={"message":f"Erreur lors de la requête HTTP: {str(e)}"})
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
-
-
-# scraper yahoo news
-def scrape_yahoo_news(subject: str, max_results: int = 10):
-    """Scraper Yahoo Actualités pour un sujet donné"""
-    articles = []
-    try:
-        # URL de recherche Yahoo Actualités
-        search_url = f"https://fr.news.yahoo.com/search?p={subject.replace(' ', '+')}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(search_url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Sélecteurs spécifiques à Yahoo News
-        article_elements = soup.find_all('div', class_=['Ov(h)', 'StreamItem'])[:max_results]
-        
-        for element in article_elements:
-            try:
-                # Titre
-                title_elem = element.find('h3') or element.find('a')
-                if not title_elem:
-                    continue
-                title = title_elem.get_text(strip=True)
-                
-                # Lien
-                link_elem = element.find('a', href=True)
-                link = link_elem['href'] if link_elem else None
-                if link and not link.startswith('http'):
-                    link = f"https://fr.news.yahoo.com{link}"
-                
-                # Description
-                desc_elem = element.find('p') or element.find('div', class_='summary')
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                # Date
-                time_elem = element.find('time') or element.find('span', class_='time')
-                pub_date = datetime.now()
-                if time_elem and time_elem.get('datetime'):
-                    try:
-                        pub_date = datetime.fromisoformat(time_elem['datetime'].replace('Z', '+00:00'))
-                    except:
-                        pass
-                
-                if title and link:
-                    articles.append({
-                        "title": title,
-                        "link": link,
-                        "description": description,
-                        "pub_date": pub_date,
-                        "source": "Yahoo Actualités"
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"Erreur lors du parsing d'un article Yahoo: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Erreur lors du scraping Yahoo News: {e}")
-    
-    return articles
-
-
-def scrape_bing_news(subject: str, max_results: int = 10):
-    """Scraper Bing News pour un sujet donné"""
-    articles = []
-    try:
-        # URL de recherche Bing News
-        search_url = f"https://www.bing.com/news/search?q={subject.replace(' ', '+')}&form=HDRSC1"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(search_url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Sélecteurs spécifiques à Bing News
-        article_elements = soup.find_all('div', class_=['news-card', 'newsitem'])[:max_results]
-        
-        for element in article_elements:
-            try:
-                # Titre
-                title_elem = element.find('a', class_='title') or element.find('h2') or element.find('a')
-                if not title_elem:
-                    continue
-                title = title_elem.get_text(strip=True)
-                
-                # Lien
-                link = title_elem.get('href') if title_elem else None
-                if link and link.startswith('/'):
-                    link = f"https://www.bing.com{link}"
-                
-                # Description
-                desc_elem = element.find('div', class_='snippet') or element.find('p')
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                # Date
-                time_elem = element.find('span', class_='time') or element.find('time')
-                pub_date = datetime.now()
-                if time_elem:
-                    try:
-                        time_text = time_elem.get_text(strip=True)
-                        # Traitement basique des dates relatives (ex: "il y a 2 heures")
-                        if "heure" in time_text:
-                            hours = int(time_text.split()[0]) if time_text.split()[0].isdigit() else 1
-                            pub_date = datetime.now() - datetime.timedelta(hours=hours)
-                        elif "jour" in time_text:
-                            days = int(time_text.split()[0]) if time_text.split()[0].isdigit() else 1
-                            pub_date = datetime.now() - datetime.timedelta(days=days)
-                    except:
-                        pass
-                
-                if title and link:
-                    articles.append({
-                        "title": title,
-                        "link": link,
-                        "description": description,
-                        "pub_date": pub_date,
-                        "source": "Bing News"
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"Erreur lors du parsing d'un article Bing: {e}")
-                continue
-                
+        return ORJSONResponse(status_code=400, content={"message":f"Erreur lors de la requête HTTP: {str(e)}"})
     except Exception as e:
-        logger.error(f"Erreur lors du scraping Bing News: {e}")
-    
-    return articles
-
-
-def scrape_baidu_news(subject: str, max_results: int = 10):
-    """Scraper Baidu News pour un sujet donné"""
-    articles = []
-    try:
-        # URL de recherche Baidu News
-        search_url = f"https://news.baidu.com/ns?word={subject.replace(' ', '+')}&tn=news&from=news&cl=2&pn=0&rn={max_results}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
-        }
-        
-        response = requests.get(search_url, headers=headers)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Sélecteurs spécifiques à Baidu News
-        article_elements = soup.find_all('div', class_=['result', 'news-item'])[:max_results]
-        
-        for element in article_elements:
-            try:
-                # Titre
-                title_elem = element.find('h3') or element.find('a')
-                if not title_elem:
-                    continue
-                title = title_elem.get_text(strip=True)
-                
-                # Lien
-                link_elem = title_elem if title_elem.name == 'a' else title_elem.find('a')
-                link = link_elem.get('href') if link_elem else None
-                
-                # Description
-                desc_elem = element.find('p') or element.find('div', class_='c-abstract')
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                # Date
-                time_elem = element.find('span', class_='c-color-gray2') or element.find('time')
-                pub_date = datetime.now()
-                if time_elem:
-                    try:
-                        time_text = time_elem.get_text(strip=True)
-                        # Traitement basique des dates chinoises
-                        if "小时前" in time_text:
-                            hours = int(time_text.replace("小时前", "")) if time_text.replace("小时前", "").isdigit() else 1
-                            pub_date = datetime.now() - datetime.timedelta(hours=hours)
-                        elif "天前" in time_text:
-                            days = int(time_text.replace("天前", "")) if time_text.replace("天前", "").isdigit() else 1
-                            pub_date = datetime.now() - datetime.timedelta(days=days)
-                    except:
-                        pass
-                
-                if title and link:
-                    articles.append({
-                        "title": title,
-                        "link": link,
-                        "description": description,
-                        "pub_date": pub_date,
-                        "source": "Baidu News"
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"Erreur lors du parsing d'un article Baidu: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Erreur lors du scraping Baidu News: {e}")
-    
-    return articles
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
 
 
 def get_multi_source_articles(subject: str, sources: list = None, max_per_source: int = 5):
-    """Récupérer des articles de plusieurs sources pour un sujet donné"""
+    """Récupérer des articles de plusieurs sources (interrogées simultanément) pour un sujet donné"""
     if sources is None:
-        sources = ['yahoo', 'bing', 'baidu']
+        sources = news_sources.multi_source_names()
     
     all_articles = []
-    
-    if 'yahoo' in sources:
-        yahoo_articles = scrape_yahoo_news(subject, max_per_source)
-        all_articles.extend(yahoo_articles)
-        logger.info(f"Récupéré {len(yahoo_articles)} articles de Yahoo News")
-    
-    if 'bing' in sources:
-        bing_articles = scrape_bing_news(subject, max_per_source)
-        all_articles.extend(bing_articles)
-        logger.info(f"Récupéré {len(bing_articles)} articles de Bing News")
-    
-    if 'baidu' in sources:
-        baidu_articles = scrape_baidu_news(subject, max_per_source)
-        all_articles.extend(baidu_articles)
-        logger.info(f"Récupéré {len(baidu_articles)} articles de Baidu News")
+    for source, articles in zip(sources, source_engine.search_many(sources, subject, max_per_source)):
+        all_articles.extend(articles)
+        logger.info(f"Récupéré {len(articles)} articles de {source}")
     
     # Trier par date de publication (plus récent en premier)
-    all_articles.sort(key=lambda x: x['pub_date'], reverse=True)
+    all_articles.sort(key=lambda x: x.publication_date, reverse=True)
+    # Une même dépêche reprise par plusieurs moteurs n'est gardée qu'une fois (la plus récente)
+    all_articles = simhash.dedupe(all_articles)
     
     return all_articles
 
 # Nouveaux endpoints pour les sources multiples
 @router.get("/multi-sources/{subject}")
-async def get_multi_source_feed(subject: str, sources: str = "yahoo,bing,baidu", max_per_source: int = 5, db: Session = Depends(get_db)):
+def get_multi_source_feed(subject: str, request: Request, sources: Optional[str] = None, max_per_source: int = 5, format: str = "json", db: Session = Depends(get_db)):
     """
-    Récupérer des articles de plusieurs sources (Yahoo, Bing, Baidu) pour un sujet donné
+    Récupérer des articles de plusieurs sources (Yahoo, Bing, Baidu...) pour un sujet donné
     
     Args:
         subject: Le sujet à rechercher
-        sources: Sources séparées par des virgules (yahoo,bing,baidu)
+        sources: Sources séparées par des virgules (par défaut yahoo,bing,baidu : les moteurs du registre sources)
         max_per_source: Nombre maximum d'articles par source
+        format: json (défaut), rss ou atom
     
     Returns:
         JSON: Structure de données contenant les articles des différentes sources
     """
     try:
-        # Parser les sources
-        source_list = [s.strip().lower() for s in sources.split(',')]
-        valid_sources = ['yahoo', 'bing', 'baidu']
-        source_list = [s for s in source_list if s in valid_sources]
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
+        # Parser les sources (tout moteur enregistré dans le registre sources)
+        if sources is None:
+            source_list = news_sources.multi_source_names()
+        else:
+            source_list = [s.strip().lower() for s in sources.split(',')]
+            source_list = list(dict.fromkeys(s for s in source_list if news_sources.get_adapter(s) is not None))
         
         if not source_list:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400, 
                 content={
                     "message": "no valid source specified",
@@ -737,7 +942,7 @@ async def get_multi_source_feed(subject: str, sources: str = "yahoo,bing,baidu",
         articles = get_multi_source_articles(subject, source_list, max_per_source)
         
         if not articles:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={
                     "message": "no article found",
@@ -750,20 +955,14 @@ async def get_multi_source_feed(subject: str, sources: str = "yahoo,bing,baidu",
             "subject": subject,
             "sources": source_list,
             "total_articles": len(articles),
-            "articles": [
-                {
-                    "title": article["title"],
-                    "url": article["link"],
-                    "description": article["description"],
-                    "source": article["source"],
-                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None
-                }
-                for article in articles
-            ]
+            "articles": articles
         }
         
+        if format != "json":
+            return feed_response(request, format, f"{subject} ({', '.join(source_list)})", str(request.url), f"Articles sur '{subject}'", feed_data["articles"])
+        
         # Retourner la réponse JSON
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": f"successfully retrieved {len(articles)} articles from {len(source_list)} sources",
@@ -771,27 +970,33 @@ async def get_multi_source_feed(subject: str, sources: str = "yahoo,bing,baidu",
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur interne: {str(e)}"})
 
 
 @router.get("/yahoo-news/{subject}")
-async def get_yahoo_news_feed(subject: str, max_results: int = 10, db: Session = Depends(get_db)):
+def get_yahoo_news_feed(subject: str, request: Request, max_results: int = 10, format: str = "json", db: Session = Depends(get_db)):
     """
     Récupérer les actualités Yahoo pour un sujet donné
     
     Args:
         subject: Sujet de recherche
         max_results: Nombre maximum d'articles à retourner
+        format: json (défaut), rss ou atom
         
     Returns:
         JSON: Structure de données contenant les articles de Yahoo Actualités
     """
     try:
-        articles = scrape_yahoo_news(subject, max_results)
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
+        articles = source_engine.search('yahoo', subject, max_results)
         
         if not articles:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={
                     "message": "no article found on Yahoo News",
@@ -804,20 +1009,14 @@ async def get_yahoo_news_feed(subject: str, max_results: int = 10, db: Session =
             "source": "Yahoo News",
             "subject": subject,
             "total_articles": len(articles),
-            "articles": [
-                {
-                    "title": article["title"],
-                    "url": article["link"],
-                    "description": article["description"],
-                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None,
-                    "source": article.get("source", "Yahoo News")
-                }
-                for article in articles
-            ]
+            "articles": articles
         }
         
+        if format != "json":
+            return feed_response(request, format, f"Yahoo News: {subject}", "https://fr.news.yahoo.com", f"Articles Yahoo News sur '{subject}'", feed_data["articles"], language="fr")
+        
         # Retourner la réponse JSON
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": f"successfully retrieved {len(articles)} articles from Yahoo News",
@@ -825,27 +1024,33 @@ async def get_yahoo_news_feed(subject: str, max_results: int = 10, db: Session =
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur Yahoo News: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur Yahoo News: {str(e)}"})
 
 
 @router.get("/bing-news/{subject}")
-async def get_bing_news_feed(subject: str, max_results: int = 10, db: Session = Depends(get_db)):
+def get_bing_news_feed(subject: str, request: Request, max_results: int = 10, format: str = "json", db: Session = Depends(get_db)):
     """
     Récupérer les actualités Bing pour un sujet donné
     
     Args:
         subject: Sujet de recherche
         max_results: Nombre maximum d'articles à retourner
+        format: json (défaut), rss ou atom
         
     Returns:
         JSON: Structure de données contenant les articles de Bing News
     """
     try:
-        articles = scrape_bing_news(subject, max_results)
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
+        articles = source_engine.search('bing', subject, max_results)
         
         if not articles:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404,
                 content={
                     "message": "no article found on Bing News",
@@ -858,20 +1063,14 @@ async def get_bing_news_feed(subject: str, max_results: int = 10, db: Session =
             "source": "Bing News",
             "subject": subject,
             "total_articles": len(articles),
-            "articles": [
-                {
-                    "title": article["title"],
-                    "url": article["link"],
-                    "description": article["description"],
-                    "publication_date": article["pub_date"].isoformat() if article["pub_date"] else None,
-                    "source": article.get("source", "Bing News")
-                }
-                for article in articles
-            ]
+            "articles": articles
         }
         
+        if format != "json":
+            return feed_response(request, format, f"Bing News: {subject}", "https://www.bing.com/news", f"Articles Bing News sur '{subject}'", feed_data["articles"])
+        
         # Retourner la réponse JSON
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": f"successfully retrieved {len(articles)} articles from Bing News",
@@ -879,20 +1078,39 @@ async def get_bing_news_feed(subject: str, max_results: int = 10, db: Session =
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur Bing News: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur Bing News: {str(e)}"})
 
 
 @router.get("/baidu-news/{subject}")
-async def get_baidu_news_feed(subject: str, max_results: int = 10, db: Session = Depends(get_db)):
+def get_baidu_news_feed(subject: str, request: Request, max_results: int = 10, format: str = "json", db: Session = Depends(get_db)):
     """
     Générer un feed RSS à partir de Baidu News pour un sujet donné
+    
+    Avec format=rss ou format=atom, le flux est retourné directement en XML ;
+    sinon le document RSS est encapsulé dans la réponse JSON.
     """
     try:
-        articles = scrape_baidu_news(subject, max_results)
+        if format not in OUTPUT_FORMATS:
+            return invalid_format_response()
+        
+        articles = source_engine.search('baidu', subject, max_results)
         
         if not articles:
-            return JSONResponse(status_code=404, content={"message":"Aucun article trouvé sur Baidu News"})
+            return ORJSONResponse(status_code=404, content={"message":"Aucun article trouvé sur Baidu News"})
+        
+        if format != "json":
+            return feed_response(
+                request,
+                format,
+                f"Baidu News: {subject}",
+                "https://news.baidu.com",
+                f"Articles Baidu sur '{subject}'",
+                articles,
+                language="zh-cn"
+            )
         
         # Créer le feed RSS
         feed = Rss201rev2Feed(
@@ -904,13 +1122,13 @@ async def get_baidu_news_feed(subject: str, max_results: int = 10, db: Session =
         
         for article in articles:
             feed.add_item(
-                title=article["title"],
-                link=article["link"],
-                description=article["description"],
-                pubdate=article["pub_date"]
+                title=article.title,
+                link=article.url,
+                description=article.description,
+                pubdate=article.publication_date
             )
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message":f"Feed Baidu généré avec {len(articles)} articles",
@@ -918,5 +1136,7 @@ async def get_baidu_news_feed(subject: str, max_results: int = 10, db: Session =
             }
         )
         
+    except deadline.DeadlineExceeded as e:
+        return ORJSONResponse(status_code=504, content={"message":f"Délai dépassé: {str(e)}"})
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message":f"Erreur Baidu News: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"message":f"Erreur Baidu News: {str(e)}"})
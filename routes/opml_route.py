@@ -0,0 +1,233 @@
+from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from dotenv import load_dotenv
+from utils.database import SessionLocal, get_db
+from utils.batch import map_bounded
+from utils.responses import ORJSONResponse
+from routes.feed_route import get_site_info
+from utils import http_client, rss_reader
+import os
+import logging
+from lxml import etree
+from typing import Optional
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+from models.feed_model import FeedEntity
+
+router = APIRouter(
+    prefix="/api/service-feeds",
+    tags=["OPML"],
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
+)
+
+# Charger les variables d'environnement avant d'importer les autres modules
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# Limites de l'import OPML
+OPML_MAX_OUTLINES = int(os.getenv('OPML_MAX_OUTLINES', '1000'))
+OPML_RESOLVE_CONCURRENCY = int(os.getenv('OPML_RESOLVE_CONCURRENCY', '8'))
+OPML_RESOLVE_PER_HOST = int(os.getenv('OPML_RESOLVE_PER_HOST', '2'))
+# Nombre de flux lus par aller-retour lors de l'export
+OPML_EXPORT_BATCH_SIZE = int(os.getenv('OPML_EXPORT_BATCH_SIZE', '500'))
+
+
+def iter_opml_outlines(source):
+    """
+    Parcourt les abonnements d'un fichier OPML sans le charger entièrement :
+    chaque <outline> est libéré dès qu'il a été lu.
+
+    Yields:
+        Dict: url, html_url, title, description de chaque outline ayant un xmlUrl
+    """
+    parser = etree.iterparse(
+        source,
+        events=("end",),
+        tag="outline",
+        resolve_entities=False,
+        no_network=True,
+        load_dtd=False,
+    )
+    for _, element in parser:
+        url = (element.get("xmlUrl") or "").strip()
+        if url:
+            yield {
+                "url": url,
+                "html_url": (element.get("htmlUrl") or "").strip() or None,
+                "title": element.get("title") or element.get("text"),
+                "description": element.get("description"),
+            }
+        element.clear(keep_tail=False)
+
+
+def resolve_outline(outline: dict) -> dict:
+    """Complète un abonnement OPML avec les informations du site (titre, description, favicon)"""
+    try:
+        if outline["html_url"]:
+            site_info = get_site_info(outline["html_url"])
+        else:
+            # Abonnement sans htmlUrl : le flux lui-même (RSS/Atom) donne titre et description
+            site_info = get_site_info(outline["url"], content_types=http_client.HTML_CONTENT_TYPES + rss_reader.FEED_CONTENT_TYPES)
+        return {
+            **outline,
+            "title": outline["title"] or site_info["title"],
+            "description": outline["description"] or site_info["description"],
+            "favicon": site_info["icon_url"],
+            "resolved": True,
+        }
+    except Exception as e:
+        logger.warning(f"Impossible de résoudre {outline['url']}: {getattr(e, 'detail', e)}")
+        return {**outline, "favicon": None, "resolved": False}
+
+
+@router.post("/users/{user_id}/opml")
+async def import_opml(
+    user_id: int,
+    file: UploadFile = File(...),
+    theme_id: Optional[int] = Form(None),
+    resolve: bool = Form(True),
+    db: Session = Depends(get_db),
+):
+    """
+    Importer les abonnements d'un fichier OPML
+
+    Le fichier est lu en streaming, les URLs sont dédupliquées (y compris avec
+    les flux déjà enregistrés de l'utilisateur), les sites sont résolus en
+    parallèle puis tous les flux sont insérés en une seule transaction.
+
+    Args:
+        user_id: Identifiant de l'utilisateur
+        file: Fichier OPML
+        theme_id: Thème à associer aux flux importés
+        resolve: Récupérer titre, description et favicon de chaque site
+    """
+    try:
+        outlines = {}
+        total = 0
+        try:
+            for outline in iter_opml_outlines(file.file):
+                total += 1
+                outlines.setdefault(outline["url"], outline)
+                if len(outlines) > OPML_MAX_OUTLINES:
+                    return ORJSONResponse(
+                        status_code=400,
+                        content={"message": f"too many subscriptions (max {OPML_MAX_OUTLINES})", "data": {}}
+                    )
+        except etree.XMLSyntaxError as e:
+            return ORJSONResponse(status_code=400, content={"message": f"invalid OPML file: {str(e)}", "data": {}})
+
+        if not outlines:
+            return ORJSONResponse(status_code=400, content={"message": "no subscription found in OPML file", "data": {}})
+
+        # Ignorer les flux déjà enregistrés pour cet utilisateur
+        existing = set(db.execute(
+            select(FeedEntity.url).where(FeedEntity.user_id == user_id, FeedEntity.url.in_(list(outlines)))
+        ).scalars())
+        new_outlines = [outline for url, outline in outlines.items() if url not in existing]
+
+        if resolve:
+            resolved = {}
+            by_url = {outline["url"]: outline for outline in new_outlines}
+            async for url, result in map_bounded(
+                lambda url: resolve_outline(by_url[url]), list(by_url), OPML_RESOLVE_CONCURRENCY, OPML_RESOLVE_PER_HOST
+            ):
+                resolved[url] = result
+            new_outlines = [resolved[outline["url"]] for outline in new_outlines]
+        else:
+            new_outlines = [{**outline, "favicon": None, "resolved": False} for outline in new_outlines]
+
+        now = datetime.now()
+        rows = [
+            {
+                "user_id": user_id,
+                "theme_id": theme_id,
+                "title": (outline["title"] or "")[:255] or None,
+                "url": outline["url"],
+                "description": outline["description"],
+                "favicon": outline["favicon"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for outline in new_outlines
+        ]
+        if rows:
+            db.execute(insert(FeedEntity), rows)
+        db.commit()
+
+        return ORJSONResponse(
+            status_code=200,
+            content={
+                "message": f"{len(rows)} feeds imported successfully",
+                "data": {
+                    "total_outlines": total,
+                    "imported": len(rows),
+                    "duplicates": total - len(outlines),
+                    "already_subscribed": len(existing),
+                    "unresolved": sum(1 for outline in new_outlines if resolve and not outline["resolved"]),
+                    "feeds": [
+                        {"title": row["title"], "url": row["url"], "favicon": row["favicon"]}
+                        for row in rows
+                    ]
+                }
+            }
+        )
+
+    except Exception as e:
+        db.rollback()
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
+
+
+def iter_opml_export(user_id: int):
+    """Écrit l'OPML des flux d'un utilisateur au fil de la lecture en base"""
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<opml version="2.0">\n'
+        f'<head><title>{escape(f"Kairos feeds of user {user_id}")}</title>'
+        f'<dateCreated>{datetime.now().strftime("%a, %d %b %Y %H:%M:%S")}</dateCreated></head>\n'
+        '<body>\n'
+    ).encode("utf-8")
+
+    # Session propre au générateur : elle doit vivre jusqu'à la fin du streaming
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(FeedEntity.title, FeedEntity.url, FeedEntity.description)
+            .where(FeedEntity.user_id == user_id)
+            .order_by(FeedEntity.id)
+            .execution_options(yield_per=OPML_EXPORT_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            chunk = []
+            for row in rows:
+                title = row.title or row.url
+                attributes = f'type="rss" text={quoteattr(title)} title={quoteattr(title)} xmlUrl={quoteattr(row.url)}'
+                if row.description:
+                    attributes += f" description={quoteattr(row.description)}"
+                chunk.append(f"<outline {attributes}/>\n")
+            yield "".join(chunk).encode("utf-8")
+    finally:
+        db.close()
+
+    yield b"</body>\n</opml>\n"
+
+
+@router.get("/users/{user_id}/opml")
+def export_opml(user_id: int):
+    """
+    Exporter les flux d'un utilisateur au format OPML (streaming)
+
+    Args:
+        user_id: Identifiant de l'utilisateur
+    """
+    return StreamingResponse(
+        iter_opml_export(user_id),
+        media_type="text/x-opml",
+        headers={"Content-Disposition": f'attachment; filename="kairos-feeds-{user_id}.opml"'},
+    )
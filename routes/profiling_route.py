@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from dotenv import load_dotenv
+from utils.responses import ORJSONResponse
+from utils import profiling
+import logging
+from typing import Optional
+
+router = APIRouter(
+    prefix="/api/service-feeds",
+    tags=["Profiling"],
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
+)
+
+# Charger les variables d'environnement avant d'importer les autres modules
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+
+def forbidden_response():
+    return ORJSONResponse(status_code=403, content={"message": "profiling token required", "data": {}})
+
+
+@router.get("/profiles")
+def get_profiles(x_profile_token: Optional[str] = Header(None)):
+    """
+    Lister les profils enregistrés (requêtes profilées à la demande ou échantillonnées)
+
+    Args:
+        x_profile_token: Jeton de profilage (PROFILING_TOKEN)
+    """
+    if not profiling.is_authorized(x_profile_token):
+        return forbidden_response()
+    try:
+        profiles = profiling.list_profiles()
+        return ORJSONResponse(
+            status_code=200,
+            content={"message": f"{len(profiles)} profiles found", "data": profiles}
+        )
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """
+    Récupérer un profil au format « collapsed » (flamegraph.pl, speedscope)
+
+    Args:
+        profile_id: Identifiant renvoyé dans l'en-tête X-Profile-Id
+        x_profile_token: Jeton de profilage (PROFILING_TOKEN)
+    """
+    if not profiling.is_authorized(x_profile_token):
+        return forbidden_response()
+    try:
+        profile = profiling.read_profile(profile_id)
+        if profile is None:
+            return ORJSONResponse(status_code=404, content={"message": "profile not found", "data": {}})
+        return PlainTextResponse(profile)
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
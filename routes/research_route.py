@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from dotenv import load_dotenv
 # Importer les dépendances depuis le fichier dependencies.py
 from utils.dependencies import StandardResponse
 from utils.database import get_db
+from utils.responses import ORJSONResponse
+from utils import deadline, tracing
 import os
 import requests
 import favicon
@@ -26,6 +27,7 @@ router = APIRouter(
     prefix="/api/service-feeds",
     tags=["Search"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 # Charger les variables d'environnement avant d'importer les autres modules
@@ -36,13 +38,22 @@ logger.setLevel(logging.INFO)
 logger.addHandler(logging.StreamHandler())
 
 
-# List of public SearxNG instances
-SEARXNG_INSTANCES = [
+# List of public SearxNG instances (SEARXNG_INSTANCES: comma-separated override)
+DEFAULT_SEARXNG_INSTANCES = [
     "https://searx.be",
     "https://search.unlocked.link",
     "https://searx.tiekoetter.com",
     "https://searx.thegpm.org"
 ]
+SEARXNG_INSTANCES = [
+    instance.strip().rstrip("/")
+    for instance in os.getenv('SEARXNG_INSTANCES', ",".join(DEFAULT_SEARXNG_INSTANCES)).split(",")
+    if instance.strip()
+]
+
+# Random delay before each SearxNG request, in seconds
+SEARXNG_MIN_DELAY = float(os.getenv('SEARXNG_MIN_DELAY', '1'))
+SEARXNG_MAX_DELAY = float(os.getenv('SEARXNG_MAX_DELAY', '2'))
 
 # List of common user agents
 USER_AGENTS = [
@@ -58,7 +69,7 @@ def get_random_user_agent():
     return random.choice(USER_AGENTS)
 
 @router.get("/search/")
-async def search(q: str, max_retries: int = 3):
+def search(q: str, max_retries: int = 3):
     """
     Search using SearxNG with instance rotation and retries.
     """
@@ -67,6 +78,8 @@ async def search(q: str, max_retries: int = 3):
 
     while retries < max_retries:
         try:
+            deadline.check("searxng")
+
             # Get random instance and user agent
             instance = get_random_instance()
             headers = {
@@ -75,26 +88,28 @@ async def search(q: str, max_retries: int = 3):
             }
 
             # Add random delay
-            time.sleep(random.uniform(1, 2))
+            deadline.sleep(random.uniform(SEARXNG_MIN_DELAY, SEARXNG_MAX_DELAY))
             
             # Make request
-            response = requests.get(
-                f"{instance}/search",
-                params={
-                    "q": q,
-                    "format": "json",
-                    "pageno": 1,
-                    "language": "en",
-                    "time_range": None,
-                    "category_general": 1
-                },
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
+            with tracing.span("searxng.search", kind=tracing.SpanKind.CLIENT, **{"searxng.instance": instance, "searxng.attempt": retries + 1}):
+                response = requests.get(
+                    f"{instance}/search",
+                    params={
+                        "q": q,
+                        "format": "json",
+                        "pageno": 1,
+                        "language": "en",
+                        "time_range": None,
+                        "category_general": 1
+                    },
+                    headers=headers,
+                    timeout=deadline.timeout(10)
+                )
+                tracing.set_attributes(**{"http.status_code": response.status_code})
+                response.raise_for_status()
             
-            # Parse results
-            data = response.json()
+                # Parse results
+                data = response.json()
             results = []
             
             for result in data.get("results", []):
@@ -113,12 +128,15 @@ async def search(q: str, max_retries: int = 3):
                 }
             
             retries += 1
-            time.sleep(2 ** retries)  # Exponential backoff
+            deadline.sleep(2 ** retries)  # Exponential backoff
             
+        except deadline.DeadlineExceeded as e:
+            last_error = str(e)
+            break
         except Exception as e:
             last_error = str(e)
             retries += 1
-            time.sleep(2 ** retries)
+            deadline.sleep(2 ** retries)
             continue
 
     raise HTTPException(
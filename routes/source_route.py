@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -7,6 +6,7 @@ from dotenv import load_dotenv
 # Importer les dépendances depuis le fichier dependencies.py
 from utils.dependencies import StandardResponse
 from utils.database import get_db
+from utils.responses import ORJSONResponse
 import os
 import requests
 import favicon
@@ -23,6 +23,7 @@ router = APIRouter(
     prefix="/api/service-sources",
     tags=["Sources"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 # Charger les variables d'environnement avant d'importer les autres modules
@@ -80,7 +81,7 @@ def get_discovery_popular_feed(db: Session = Depends(get_db)):
         popular_sites_to_scan = [dict(row._mapping) for row in popular_sites_result.fetchall()]
         
         # Retourner la liste des flux populaires et sites à scanner
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "message": "success",
@@ -91,7 +92,7 @@ def get_discovery_popular_feed(db: Session = Depends(get_db)):
             }
         )
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "message": f"Error getting discovery popular feed: {str(e)}"
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from dotenv import load_dotenv
+from utils.database import get_db
+from utils.pagination import decode_cursor, encode_cursor
+from utils.responses import ORJSONResponse
+import os
+import logging
+from typing import Optional
+from models.axe_model import AxeEntity
+from models.theme_model import ThemeEntity
+from models.theme_article_model import ThemeArticleEntity
+
+router = APIRouter(
+    prefix="/api/service-feeds",
+    tags=["Themes"],
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
+)
+
+# Charger les variables d'environnement avant d'importer les autres modules
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# Taille maximale d'une page d'articles par thème
+THEME_FEED_MAX_PAGE_SIZE = int(os.getenv('THEME_FEED_MAX_PAGE_SIZE', '100'))
+
+
+def theme_feed_response(db: Session, theme: ThemeEntity, cursor: Optional[str], limit: int, extra: dict = None):
+    """Page d'articles d'un thème, lue en un seul parcours de la clé primaire de theme_articles"""
+    try:
+        before = decode_cursor(cursor)
+    except ValueError:
+        return ORJSONResponse(status_code=400, content={"message": "invalid cursor", "data": {}})
+
+    query = select(ThemeArticleEntity).where(ThemeArticleEntity.theme_id == theme.id)
+    if before is not None:
+        before_date, before_id = before
+        query = query.where(or_(
+            ThemeArticleEntity.sort_date < before_date,
+            and_(ThemeArticleEntity.sort_date == before_date, ThemeArticleEntity.article_id < before_id),
+        ))
+    rows = db.execute(
+        query.order_by(ThemeArticleEntity.sort_date.desc(), ThemeArticleEntity.article_id.desc()).limit(limit + 1)
+    ).scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sort_date, rows[-1].article_id)
+
+    return ORJSONResponse(
+        status_code=200,
+        content={
+            "message": "theme feed retrieved successfully",
+            "data": {
+                "theme": {"id": theme.id, "name": theme.name},
+                **(extra or {}),
+                "articles": [
+                    {
+                        "id": row.article_id,
+                        "feed_id": row.feed_id,
+                        "title": row.title,
+                        "url": row.url,
+                        "description": row.description,
+                        "publication_date": row.publication_date
+                    }
+                    for row in rows
+                ],
+                "next_cursor": next_cursor
+            }
+        }
+    )
+
+
+@router.get("/themes/{theme_id}/feed")
+def get_theme_feed(
+    theme_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=THEME_FEED_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """
+    Articles de tous les flux d'un thème, du plus récent au plus ancien
+
+    Args:
+        theme_id: Identifiant du thème
+        cursor: Curseur renvoyé par la page précédente (next_cursor)
+        limit: Nombre d'articles par page
+    """
+    try:
+        theme = db.get(ThemeEntity, theme_id)
+        if theme is None:
+            return ORJSONResponse(status_code=404, content={"message": "theme not found", "data": {}})
+
+        return theme_feed_response(db, theme, cursor, limit)
+
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
+
+
+@router.get("/axes/{axe_id}/feed")
+def get_axe_feed(
+    axe_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=THEME_FEED_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """
+    Articles d'un axe, c'est-à-dire des flux du thème auquel l'axe est rattaché
+
+    Args:
+        axe_id: Identifiant de l'axe
+        cursor: Curseur renvoyé par la page précédente (next_cursor)
+        limit: Nombre d'articles par page
+    """
+    try:
+        axe = db.get(AxeEntity, axe_id)
+        if axe is None:
+            return ORJSONResponse(status_code=404, content={"message": "axe not found", "data": {}})
+
+        theme = db.get(ThemeEntity, axe.theme_id)
+        if theme is None:
+            return ORJSONResponse(status_code=404, content={"message": "theme not found", "data": {}})
+
+        return theme_feed_response(db, theme, cursor, limit, extra={"axe": {"id": axe.id, "name": axe.name}})
+
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
@@ -0,0 +1,152 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from dotenv import load_dotenv
+from utils.database import get_db
+from utils.pagination import decode_cursor, encode_cursor
+from utils.responses import ORJSONResponse
+import os
+import heapq
+import logging
+from itertools import islice
+from typing import Optional
+from models.feed_model import FeedEntity
+from models.article_model import ArticleEntity
+
+router = APIRouter(
+    prefix="/api/service-feeds",
+    tags=["Timeline"],
+    responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
+)
+
+# Charger les variables d'environnement avant d'importer les autres modules
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# Taille maximale d'une page de timeline
+TIMELINE_MAX_PAGE_SIZE = int(os.getenv('TIMELINE_MAX_PAGE_SIZE', '100'))
+# Nombre d'articles lus par requête sur le curseur de chaque flux
+TIMELINE_CHUNK_SIZE = int(os.getenv('TIMELINE_CHUNK_SIZE', '25'))
+
+
+def iter_feed_articles(db: Session, feed_id: int, before, chunk_size: int):
+    """
+    Curseur sur les articles d'un flux, du plus récent au plus ancien.
+
+    Chaque lot est une lecture de l'index (feed_id, publication_date, id) qui
+    reprend après le dernier article lu ; le lot suivant n'est demandé que si
+    la fusion en a besoin.
+
+    Args:
+        db: Session de base de données
+        feed_id: Identifiant du flux
+        before: Position (publication_date, id) exclue, ou None pour commencer au début
+        chunk_size: Nombre d'articles par lot
+    """
+    while True:
+        query = select(
+            ArticleEntity.id,
+            ArticleEntity.feed_id,
+            ArticleEntity.title,
+            ArticleEntity.url,
+            ArticleEntity.description,
+            ArticleEntity.publication_date,
+        ).where(
+            ArticleEntity.feed_id == feed_id,
+            ArticleEntity.publication_date.isnot(None),
+        )
+        if before is not None:
+            before_date, before_id = before
+            query = query.where(or_(
+                ArticleEntity.publication_date < before_date,
+                and_(ArticleEntity.publication_date == before_date, ArticleEntity.id < before_id),
+            ))
+        rows = db.execute(
+            query.order_by(ArticleEntity.publication_date.desc(), ArticleEntity.id.desc()).limit(chunk_size)
+        ).all()
+
+        yield from rows
+
+        if len(rows) < chunk_size:
+            return
+        before = (rows[-1].publication_date, rows[-1].id)
+
+
+@router.get("/users/{user_id}/timeline")
+def get_user_timeline(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=TIMELINE_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """
+    Timeline chronologique de tous les flux d'un utilisateur
+
+    Les articles de chaque flux sont lus par un curseur indexé puis fusionnés
+    par un tas (k-way merge) : seuls les articles nécessaires à la page sont lus.
+    Les articles sans date de publication ne figurent pas dans la timeline.
+
+    Args:
+        user_id: Identifiant de l'utilisateur
+        cursor: Curseur renvoyé par la page précédente (next_cursor)
+        limit: Nombre d'articles par page
+
+    Returns:
+        JSON: Articles de la page et curseur de la page suivante
+    """
+    try:
+        try:
+            before = decode_cursor(cursor)
+        except ValueError:
+            return ORJSONResponse(status_code=400, content={"message": "invalid cursor", "data": {}})
+
+        feed_ids = db.execute(select(FeedEntity.id).where(FeedEntity.user_id == user_id)).scalars().all()
+        if not feed_ids:
+            return ORJSONResponse(
+                status_code=404,
+                content={
+                    "message": "no feed found for this user",
+                    "data": {}
+                }
+            )
+
+        # Un flux ne peut pas fournir plus de limit + 1 articles à une page
+        chunk_size = min(limit + 1, TIMELINE_CHUNK_SIZE)
+        streams = [iter_feed_articles(db, feed_id, before, chunk_size) for feed_id in feed_ids]
+        merged = heapq.merge(*streams, key=lambda row: (row.publication_date, row.id), reverse=True)
+        rows = list(islice(merged, limit + 1))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].publication_date, rows[-1].id)
+
+        return ORJSONResponse(
+            status_code=200,
+            content={
+                "message": "timeline retrieved successfully",
+                "data": {
+                    "user_id": user_id,
+                    "articles": [
+                        {
+                            "id": row.id,
+                            "feed_id": row.feed_id,
+                            "title": row.title,
+                            "url": row.url,
+                            "description": row.description,
+                            "publication_date": row.publication_date
+                        }
+                        for row in rows
+                    ],
+                    "next_cursor": next_cursor
+                }
+            }
+        )
+
+    except Exception as e:
+        return ORJSONResponse(status_code=500, content={"message": "error internal", "data": f"Error internal: {str(e)}"})
@@ -0,0 +1,13 @@
+from .base import SourceAdapter, adapters, get_adapter, multi_source_names, register
+# Enregistrement des moteurs (l'ordre d'import est l'ordre par défaut de /multi-sources)
+from . import google, yahoo, bing, baidu  # noqa: F401
+from . import engine
+
+__all__ = [
+    'SourceAdapter',
+    'adapters',
+    'engine',
+    'get_adapter',
+    'multi_source_names',
+    'register',
+]
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+import os
+
+from dotenv import load_dotenv
+
+from .base import DEFAULT_HEADERS, SourceAdapter, register
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# URL de base de Baidu News
+BAIDU_NEWS_URL = os.getenv('BAIDU_NEWS_URL', 'https://news.baidu.com').rstrip('/')
+
+
+@register
+class BaiduNews(SourceAdapter):
+    name = "baidu"
+    label = "Baidu News"
+    base_url = BAIDU_NEWS_URL
+    search_url = "{base}/ns?word={query}&tn=news&from=news&cl=2&pn=0&rn={max_results}"
+    headers = {**DEFAULT_HEADERS, 'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'}
+
+    container_classes = ("result", "news-item")
+    title = [("h3", None), ("a", None)]
+    description = [("p", None), ("div", "c-abstract")]
+    date = [("span", "c-color-gray2"), ("time", None)]
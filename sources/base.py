@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus
+
+# Sélecteur d'élément : (balise, classe CSS ou None) ; dans une liste, le premier qui trouve un élément l'emporte
+Selector = Tuple[str, Optional[str]]
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class SourceAdapter:
+    """
+    Moteur d'actualités interrogé par sujet. Un adaptateur ne fait que déclarer ses
+    URLs et ses sélecteurs : téléchargement, parsing, dates (utils.dates), cache,
+    exécution concurrente et métriques sont assurés par sources.engine.
+
+    Les gabarits d'URL reçoivent {base} (base_url), {query} (sujet encodé) et
+    {max_results}.
+    """
+    # Identifiant du moteur (paramètre sources de /multi-sources, métriques, captures)
+    name: str = ""
+    # Source des articles (SourcedArticleRecord.source) ; None : articles sans source
+    label: Optional[str] = None
+    base_url: str = ""
+    # Page de résultats HTML ; None : moteur interrogé uniquement par son flux RSS
+    search_url: Optional[str] = None
+    # Flux RSS de recherche, essayé avant la page HTML ; None : pas de flux
+    rss_url: Optional[str] = None
+    headers: Dict[str, str] = DEFAULT_HEADERS
+    # Interrogé par défaut par /multi-sources
+    multi_source: bool = True
+
+    # Sélecteurs de la page de résultats : un conteneur par article
+    html_parser: str = "lxml"
+    container_tag: str = "div"
+    container_classes: Sequence[str] = ()
+    title: List[Selector] = [("h3", None), ("a", None)]
+    description: List[Selector] = [("p", None)]
+    date: List[Selector] = [("time", None)]
+    # Le lien est celui du titre (ou du premier <a> qu'il contient, sinon du conteneur)
+
+    # Date : attribut de l'élément de date (None : aucun), sinon son texte (formats de utils.dates)
+    date_attribute: Optional[str] = "datetime"
+
+    def format_url(self, template: str, subject: str, max_results: int) -> str:
+        return template.format(base=self.base_url, query=quote_plus(subject), max_results=max_results)
+
+
+_ADAPTERS: Dict[str, SourceAdapter] = {}
+
+
+def register(cls):
+    """Décorateur de classe : enregistre (une instance de) l'adaptateur sous son nom"""
+    adapter = cls()
+    if not adapter.name:
+        raise ValueError(f"{cls.__name__}: name is required")
+    _ADAPTERS[adapter.name] = adapter
+    return cls
+
+
+def get_adapter(name: str) -> Optional[SourceAdapter]:
+    return _ADAPTERS.get(name)
+
+
+def adapters() -> List[SourceAdapter]:
+    """Adaptateurs enregistrés, dans l'ordre d'enregistrement"""
+    return list(_ADAPTERS.values())
+
+
+def multi_source_names() -> List[str]:
+    """Moteurs interrogés par défaut par /multi-sources"""
+    return [adapter.name for adapter in _ADAPTERS.values() if adapter.multi_source]
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+import os
+
+from dotenv import load_dotenv
+
+from .base import SourceAdapter, register
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# URL de base de Bing
+BING_URL = os.getenv('BING_URL', 'https://www.bing.com').rstrip('/')
+
+
+@register
+class BingNews(SourceAdapter):
+    name = "bing"
+    label = "Bing News"
+    base_url = BING_URL
+    search_url = "{base}/news/search?q={query}&form=HDRSC1"
+    rss_url = "{base}/news/search?q={query}&format=rss"
+
+    container_classes = ("news-card", "newsitem")
+    title = [("a", "title"), ("h2", None), ("a", None)]
+    description = [("div", "snippet"), ("p", None)]
+    date = [("span", "time"), ("time", None)]
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+from dotenv import load_dotenv
+
+from models.article_record import ArticleRecord, SourcedArticleRecord
+from utils import canonical_url, dates, deadline, http_client, metrics, profiling, rss_reader, snapshots, tracing
+from utils.cache import MISSING, TTLCache
+
+from .base import SourceAdapter, get_adapter
+
+# Charger les variables d'environnement
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# Moteurs interrogés d'abord par leur flux RSS de recherche, la page HTML servant de repli
+SEARCH_RSS_ENGINES = {engine.strip() for engine in os.getenv('SEARCH_RSS_ENGINES', 'google,bing,yahoo').split(',') if engine.strip()}
+# Durée de conservation (secondes) des articles d'un moteur pour un sujet, partagés par tous les endpoints ; 0 = pas de cache
+SOURCE_CACHE_TTL = float(os.getenv('SOURCE_CACHE_TTL', '120'))
+SOURCE_CACHE_MAX_ENTRIES = int(os.getenv('SOURCE_CACHE_MAX_ENTRIES', '1024'))
+# Moteurs interrogés simultanément (toutes requêtes confondues)
+SOURCE_CONCURRENCY = int(os.getenv('SOURCE_CONCURRENCY', '8'))
+
+_results = TTLCache(SOURCE_CACHE_MAX_ENTRIES, SOURCE_CACHE_TTL)
+_executor = ThreadPoolExecutor(max_workers=SOURCE_CONCURRENCY, thread_name_prefix="source")
+
+
+def _adapter(source) -> SourceAdapter:
+    if isinstance(source, SourceAdapter):
+        return source
+    adapter = get_adapter(source)
+    if adapter is None:
+        raise KeyError(f"unknown source: {source}")
+    return adapter
+
+
+def _record(adapter: SourceAdapter, title: str, link: str, description: str, pub_date: datetime):
+    canonical = canonical_url.canonicalize(link)
+    if adapter.label is None:
+        return ArticleRecord(title, canonical, description, pub_date, link)
+    return SourcedArticleRecord(title, canonical, description, pub_date, link, adapter.label)
+
+
+def _first(element, selectors):
+    for tag, css_class in selectors:
+        found = element.find(tag, class_=css_class) if css_class else element.find(tag)
+        if found is not None:
+            return found
+    return None
+
+
+def _link(title_elem, container) -> Optional[str]:
+    if title_elem.name == 'a' and title_elem.get('href'):
+        return title_elem['href']
+    link_elem = title_elem.find('a', href=True) or container.find('a', href=True)
+    return link_elem['href'] if link_elem else None
+
+
+def _has_container_class(adapter: SourceAdapter):
+    wanted = frozenset(adapter.container_classes)
+
+    def match(value) -> bool:
+        # Pendant le parsing (SoupStrainer), l'attribut class n'est pas encore découpé
+        if not value:
+            return False
+        return not wanted.isdisjoint(value.split() if isinstance(value, str) else value)
+    return match
+
+
+def parse_html(source, content, max_results: int = 10, page_url: str = None, encoding: str = None) -> list:
+    """
+    Extrait les articles d'une page de résultats (sans accès réseau). Seuls les
+    conteneurs d'articles sont construits en arbre (SoupStrainer) ; les liens
+    relatifs sont résolus par rapport à page_url (base_url par défaut) et un même
+    lien n'est gardé qu'une fois (conteneurs imbriqués).
+
+    Args:
+        source: Adaptateur ou nom du moteur
+        content: Page (bytes avec encoding, ou texte)
+        max_results: Nombre maximal d'articles
+        page_url: URL de la page de résultats
+        encoding: Encodage des octets de content
+    """
+    adapter = _adapter(source)
+    classes = _has_container_class(adapter) if adapter.container_classes else None
+    deadline.check('parse')
+    with metrics.stage('parse'):
+        soup = BeautifulSoup(
+            content, adapter.html_parser,
+            parse_only=SoupStrainer(adapter.container_tag, class_=classes),
+            from_encoding=encoding if isinstance(content, bytes) else None,
+        )
+
+    base = page_url or f"{adapter.base_url}/"
+    now = datetime.now()
+    articles = []
+    seen = set()
+    for element in soup.find_all(adapter.container_tag, class_=classes):
+        if len(articles) >= max_results:
+            break
+        title_elem = _first(element, adapter.title)
+        if title_elem is None:
+            continue
+        title = title_elem.get_text(strip=True)
+        link = _link(title_elem, element)
+        if not title or not link:
+            continue
+        link = urljoin(base, link)
+        if link in seen:
+            continue
+        seen.add(link)
+        desc_elem = _first(element, adapter.description)
+        description = desc_elem.get_text(strip=True) if desc_elem is not None else ""
+        pub_date = dates.element_date(_first(element, adapter.date), now, adapter.date_attribute) or now
+        articles.append(_record(adapter, title, link, description, pub_date))
+    return articles
+
+
+def parse_rss(source, content: bytes, max_results: int = 10) -> Tuple[rss_reader.FeedChannel, list]:
+    """Extrait le canal et les articles d'un flux RSS de recherche (sans accès réseau)"""
+    adapter = _adapter(source)
+    channel, items = rss_reader.parse_feed(content, max_results)
+    now = datetime.now()
+    articles = [
+        _record(adapter, item.title, item.link, item.description, item.publication_date or now)
+        for item in items if item.title and item.link
+    ]
+    return channel, articles
+
+
+def fetch_rss(source, subject: str, max_results: int):
+    """
+    Recherche par le flux RSS du moteur : plus léger que la page HTML et sans
+    sélecteurs CSS fragiles.
+
+    Returns:
+        Tuple: (réponse, canal, articles), ou None si le moteur n'a pas de flux, n'est
+        pas dans SEARCH_RSS_ENGINES ou si le flux est indisponible, invalide ou vide :
+        l'appelant se replie alors sur la page HTML
+    """
+    adapter = _adapter(source)
+    if adapter.rss_url is None or adapter.name not in SEARCH_RSS_ENGINES:
+        metrics.observe_search_mode(adapter.name, 'html')
+        return None
+    rss_url = adapter.format_url(adapter.rss_url, subject, max_results)
+    try:
+        response = http_client.get(rss_url, headers=adapter.headers, content_types=rss_reader.FEED_CONTENT_TYPES)
+        response.raise_for_status()
+        deadline.check('parse')
+        with metrics.stage('parse_rss'):
+            channel, articles = parse_rss(adapter, response.content, max_results)
+        if not articles:
+            raise ValueError("aucun article dans le flux")
+    except deadline.DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.warning(f"Flux RSS {adapter.name} indisponible, repli sur la page HTML : {e}")
+        metrics.observe_search_mode(adapter.name, 'html_fallback')
+        return None
+    metrics.observe_search_mode(adapter.name, 'rss')
+    snapshots.record(f'{adapter.name}_rss', rss_url, response, articles, max_results)
+    return response, channel, articles
+
+
+def fetch_html(source, subject: str, max_results: int) -> list:
+    """Recherche par la page de résultats HTML du moteur"""
+    adapter = _adapter(source)
+    if adapter.search_url is None:
+        return []
+    search_url = adapter.format_url(adapter.search_url, subject, max_results)
+    response = http_client.get(search_url, headers=adapter.headers)
+    response.raise_for_status()
+    articles = parse_html(adapter, response.content, max_results, response.url, response.encoding)
+    snapshots.record(adapter.name, search_url, response, articles, max_results)
+    return articles
+
+
+def search(source, subject: str, max_results: int = 10) -> list:
+    """
+    Articles d'un moteur pour un sujet : résultat en cache (SOURCE_CACHE_TTL), sinon
+    flux RSS, sinon page HTML. Les erreurs du moteur sont journalisées et donnent une
+    liste vide, pour ne pas faire échouer les recherches multi-sources ; seul le
+    dépassement du budget de la requête (deadline.DeadlineExceeded) est propagé.
+    """
+    adapter = _adapter(source)
+    key = (adapter.name, subject, max_results)
+    cached = _results.get(key) if SOURCE_CACHE_TTL > 0 else MISSING
+    if cached is not MISSING:
+        metrics.observe_search_mode(adapter.name, 'cache')
+        return list(cached)
+
+    articles = []
+    with tracing.span(f'scrape.{adapter.name}', subject=subject):
+        try:
+            rss = fetch_rss(adapter, subject, max_results)
+            articles = rss[2] if rss is not None else fetch_html(adapter, subject, max_results)
+        except deadline.DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Erreur lors du scraping {adapter.label or adapter.name}: {e}")
+    metrics.observe_articles(adapter.name, len(articles))
+    if articles and SOURCE_CACHE_TTL > 0:
+        _results.set(key, articles)
+    return list(articles)
+
+
+def _search_in_thread(source, subject: str, max_results: int) -> list:
+    with profiling.track_thread():
+        return search(source, subject, max_results)
+
+
+def search_many(sources: Sequence, subject: str, max_results: int = 10) -> List[list]:
+    """
+    Interroge plusieurs moteurs simultanément (pool de SOURCE_CONCURRENCY threads).
+    Chaque recherche s'exécute dans une copie du contexte de l'appelant : budget de
+    la requête, span de trace et profil y restent attachés.
+
+    Returns:
+        List: Articles de chaque moteur, dans l'ordre de sources
+    """
+    if len(sources) <= 1:
+        return [search(source, subject, max_results) for source in sources]
+    futures = [
+        _executor.submit(contextvars.copy_context().run, _search_in_thread, source, subject, max_results)
+        for source in sources
+    ]
+    return [future.result() for future in futures]
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+import os
+
+from dotenv import load_dotenv
+
+from .base import SourceAdapter, register
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# URL de base de Google News (surchargeable, par ex. vers le serveur de bouchons des tests de charge)
+GOOGLE_NEWS_URL = os.getenv('GOOGLE_NEWS_URL', 'https://news.google.com').rstrip('/')
+
+
+@register
+class GoogleNews(SourceAdapter):
+    """Google News (/feed-subject) : flux RSS de recherche ; la page HTML passe par l'extraction générique des sites"""
+    name = "google"
+    label = None
+    base_url = GOOGLE_NEWS_URL
+    search_url = None
+    rss_url = "{base}/rss/search?q={query}&hl=fr&gl=FR&ceid=FR:fr"
+    multi_source = False
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import os
+
+from dotenv import load_dotenv
+
+from .base import SourceAdapter, register
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# URL de base de Yahoo Actualités
+YAHOO_NEWS_URL = os.getenv('YAHOO_NEWS_URL', 'https://fr.news.yahoo.com').rstrip('/')
+# Recherche RSS de Yahoo (hôte différent du site d'actualités)
+YAHOO_NEWS_RSS_URL = os.getenv('YAHOO_NEWS_RSS_URL', 'https://news.search.yahoo.com/rss').rstrip('/')
+
+
+@register
+class YahooNews(SourceAdapter):
+    name = "yahoo"
+    label = "Yahoo Actualités"
+    base_url = YAHOO_NEWS_URL
+    search_url = "{base}/search?p={query}"
+    rss_url = YAHOO_NEWS_RSS_URL + "?p={query}"
+
+    container_classes = ("Ov(h)", "StreamItem")
+    title = [("h3", None), ("a", None)]
+    description = [("p", None), ("div", "summary")]
+    date = [("time", None), ("span", "time")]
+    date_attribute = "datetime"
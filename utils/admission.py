@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+from collections import deque
+from typing import Callable, Dict
+from urllib.parse import parse_qsl
+
+from dotenv import load_dotenv
+
+from utils import metrics
+from utils.cache import TTLCache, MISSING
+from utils.responses import dumps
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Nombre de scrapes traités en parallèle, taille et durée maximale de la file d'attente
+SCRAPE_MAX_CONCURRENT = int(os.getenv('SCRAPE_MAX_CONCURRENT', '16'))
+SCRAPE_MAX_QUEUE = int(os.getenv('SCRAPE_MAX_QUEUE', '32'))
+SCRAPE_QUEUE_TIMEOUT = float(os.getenv('SCRAPE_QUEUE_TIMEOUT', '2'))
+# Valeur de Retry-After (secondes) des réponses 503
+SCRAPE_RETRY_AFTER = int(os.getenv('SCRAPE_RETRY_AFTER', '5'))
+# Cache des réponses de scrape récentes : servies sans consommer le budget
+SCRAPE_CACHE_TTL = float(os.getenv('SCRAPE_CACHE_TTL', '60'))
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv('SCRAPE_CACHE_MAX_ENTRIES', '512'))
+SCRAPE_CACHE_MAX_BYTES = int(os.getenv('SCRAPE_CACHE_MAX_BYTES', str(1024 * 1024)))
+
+# Routes soumises au budget de scrape (chemins exacts et préfixes)
+SCRAPE_PATHS = (
+    "/api/service-feeds/feed",
+    "/api/service-feeds/feed-subject",
+    "/api/service-feeds/feed-subject-url",
+    "/api/service-feeds/feeds/batch",
+)
+SCRAPE_PREFIXES = (
+    "/api/service-feeds/multi-sources/",
+    "/api/service-feeds/yahoo-news/",
+    "/api/service-feeds/bing-news/",
+    "/api/service-feeds/baidu-news/",
+    "/api/service-feeds/search/",
+)
+
+# Scrapes simultanés lancés par une requête, par route (voir register_fan_out) ; 1 par défaut
+_FAN_OUT: Dict[str, Callable[[Dict[str, str]], int]] = {}
+
+
+def register_fan_out(route: str, fan_out: Callable[[Dict[str, str]], int]):
+    """
+    Déclare le nombre de scrapes qu'une requête de la route peut lancer en parallèle
+    (lots, moteurs interrogés simultanément, pages d'une liste paginée) : la requête
+    occupe autant de places du budget.
+
+    Args:
+        route: Chemin exact, ou préfixe s'il se termine par « / »
+        fan_out: Calcule ce nombre à partir des paramètres de la requête (query string)
+    """
+    _FAN_OUT[route] = fan_out
+
+
+def fan_out(scope) -> int:
+    path = scope["path"]
+    for route, weight in _FAN_OUT.items():
+        if path == route or (route.endswith("/") and path.startswith(route)):
+            params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            try:
+                return max(1, int(weight(params)))
+            except (TypeError, ValueError):
+                # Paramètres invalides : la route répond 400 sans scraper
+                return 1
+    return 1
+
+
+class AdmissionController:
+    """
+    Budget de scrapes concurrents avec une courte file d'attente FIFO. Une requête
+    occupe autant de places que de scrapes qu'elle lance en parallèle (weight).
+    Utilisé uniquement depuis la boucle d'événements (pas de verrou).
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiters = deque()
+
+    def weight(self, weight: int) -> int:
+        # Une requête plus large que le budget entier passe seule
+        return min(max(weight, 1), self.max_concurrent)
+
+    async def acquire(self, weight: int = 1) -> bool:
+        """True si la requête peut être traitée, False si elle doit être rejetée"""
+        weight = self.weight(weight)
+        # Pas de dépassement de la file : une requête légère ne double pas une lourde en attente
+        if not self.waiters and self.active + weight <= self.max_concurrent:
+            self.active += weight
+            return True
+        if len(self.waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, weight)
+        self.waiters.append(entry)
+        try:
+            # release() attribue directement les places libérées aux premiers en attente
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            # Places attribuées à l'instant même de l'expiration : les rendre
+            if waiter.done() and not waiter.cancelled():
+                self.release(weight)
+            return False
+        except asyncio.CancelledError:
+            # Client parti alors que les places venaient de lui être attribuées : les rendre
+            if waiter.done() and not waiter.cancelled():
+                self.release(weight)
+            raise
+        finally:
+            if entry in self.waiters:
+                self.waiters.remove(entry)
+                # La tête de file qui abandonne peut débloquer les suivantes
+                self._wake()
+
+    def release(self, weight: int = 1):
+        self.active -= self.weight(weight)
+        self._wake()
+
+    def _wake(self):
+        while self.waiters:
+            waiter, weight = self.waiters[0]
+            if waiter.done():
+                self.waiters.popleft()
+                continue
+            if self.active + weight > self.max_concurrent:
+                return
+            self.waiters.popleft()
+            self.active += weight
+            waiter.set_result(True)
+
+
+def _is_scrape_path(path: str) -> bool:
+    return path in SCRAPE_PATHS or path.startswith(SCRAPE_PREFIXES)
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI de délestage des routes de scrape :
+    - une réponse GET 200 récente (SCRAPE_CACHE_TTL) est resservie sans consommer le budget ;
+    - chaque requête compte pour les scrapes qu'elle lance en parallèle (register_fan_out) ;
+    - au-delà de SCRAPE_MAX_CONCURRENT scrapes en cours, la requête attend au plus
+      SCRAPE_QUEUE_TIMEOUT secondes dans une file de SCRAPE_MAX_QUEUE places ;
+    - sinon elle est rejetée immédiatement en 503 avec Retry-After.
+
+    Les réponses streamées (RSS/Atom, NDJSON) ne sont pas mises en cache.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.controller = AdmissionController(SCRAPE_MAX_CONCURRENT, SCRAPE_MAX_QUEUE, SCRAPE_QUEUE_TIMEOUT)
+        self.cache = TTLCache(maxsize=SCRAPE_CACHE_MAX_ENTRIES, ttl=SCRAPE_CACHE_TTL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_scrape_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        cache_key = None
+        if scope["method"] == "GET" and SCRAPE_CACHE_TTL > 0:
+            cache_key = (scope["path"], scope.get("query_string", b""))
+            cached = self.cache.get(cache_key)
+            if cached is not MISSING:
+                metrics.observe_admission("cached")
+                cached_headers, body = cached
+                await send({"type": "http.response.start", "status": 200, "headers": list(cached_headers)})
+                await send({"type": "http.response.body", "body": body})
+                return
+
+        weight = fan_out(scope)
+        if not await self.controller.acquire(weight):
+            metrics.observe_admission("rejected")
+            await self.reject(send)
+            return
+
+        metrics.observe_admission("admitted")
+        metrics.set_admission_state(self.controller.active, len(self.controller.waiters))
+        headers = None
+        chunks = []
+        cacheable = cache_key is not None
+
+        async def send_wrapper(message):
+            nonlocal headers, cacheable
+            if cacheable:
+                if message["type"] == "http.response.start":
+                    # Copie : les middlewares extérieurs (CORS, compression) modifient la liste sur place
+                    headers = list(message.get("headers", []))
+                    cacheable = message["status"] == 200
+                elif message["type"] == "http.response.body":
+                    chunks.append(message.get("body", b""))
+                    if message.get("more_body", False) or sum(map(len, chunks)) > SCRAPE_CACHE_MAX_BYTES:
+                        cacheable = False
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.controller.release(weight)
+            metrics.set_admission_state(self.controller.active, len(self.controller.waiters))
+
+        if cacheable and headers is not None:
+            self.cache.set(cache_key, (headers, b"".join(chunks)))
+
+    async def reject(self, send):
+        body = dumps({"message": "service overloaded, retry later", "data": {}})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(SCRAPE_RETRY_AFTER).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
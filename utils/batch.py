@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import asyncio
+from collections import defaultdict
+from typing import Callable, Iterable
+from urllib.parse import urlparse
+
+from starlette.concurrency import run_in_threadpool
+
+
+async def map_bounded(func: Callable, urls: Iterable[str], concurrency: int, per_host: int):
+    """
+    Exécute func(url) dans le threadpool pour chaque URL, avec une limite globale
+    et une limite par hôte, et produit les résultats au fur et à mesure.
+
+    Args:
+        func: Fonction bloquante appelée avec l'URL
+        urls: URLs à traiter
+        concurrency: Nombre maximum d'appels simultanés
+        per_host: Nombre maximum d'appels simultanés vers un même hôte
+
+    Yields:
+        Tuple (url, résultat) dans l'ordre de complétion
+    """
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+    async def run(url: str):
+        # Prendre d'abord le jeton de l'hôte pour ne pas bloquer un slot global en attente
+        async with host_limits[urlparse(url).netloc]:
+            async with global_limit:
+                return url, await run_in_threadpool(func, url)
+
+    tasks = [asyncio.ensure_future(run(url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+import threading
+import time
+from collections import OrderedDict
+
+# Sentinelle pour distinguer une valeur absente d'une valeur None mise en cache
+MISSING = object()
+
+
+class TTLCache:
+    """Cache mémoire thread-safe, borné en taille (LRU) et avec expiration."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            item = self._data.get(key, MISSING)
+            if item is MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+import base64
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Pattern
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from models.article_model import ArticleEntity
+from models.theme_article_model import ThemeArticleEntity
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Nombre d'URLs canonisées gardées en cache (les mêmes liens reviennent à chaque crawl)
+CANONICAL_URL_CACHE_SIZE = int(os.getenv('CANONICAL_URL_CACHE_SIZE', '65536'))
+
+# Paramètres de suivi retirés de toutes les URLs
+_TRACKING_PARAMS = re.compile(
+    r"(?:utm_\w+|fbclid|gclid|gclsrc|dclid|msclkid|yclid|igshid|mc_cid|mc_eid|_ga|_gl|_hsenc|_hsmi"
+    r"|mkt_tok|ocid|xtor|at_medium|at_campaign|at_creation|ns_source|ns_mchannel|ns_campaign|cmpid|ref_src|spm)",
+    re.IGNORECASE,
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Enveloppes imbriquées déroulées au plus
+MAX_UNWRAP = 3
+# Articles lus par lot lors de la canonisation des liens déjà enregistrés
+BACKFILL_BATCH_SIZE = 1000
+
+
+class _EngineRule(NamedTuple):
+    """Règle d'un moteur : paramètres propres à retirer et enveloppe de redirection à dérouler"""
+    engine: str
+    params: frozenset
+    path: Optional[Pattern]
+    unwrap: Optional[Callable]
+
+
+def _query_value(query: str, name: str) -> Optional[str]:
+    for piece in query.split("&"):
+        key, _, value = piece.partition("=")
+        if key == name and value:
+            return unquote(value)
+    return None
+
+
+def _unwrap_bing_apiclick(parts, match) -> Optional[str]:
+    # /news/apiclick.aspx?ref=FexRss&aid=&tid=...&url=https%3a%2f%2f...
+    return _query_value(parts.query, "url")
+
+
+def _unwrap_bing_ck(parts, match) -> Optional[str]:
+    # /ck/a?!&&p=...&u=a1aHR0cHM6Ly9... : destination en base64 préfixée par « a1 »
+    value = _query_value(parts.query, "u")
+    if not value or not value.startswith("a1"):
+        return None
+    try:
+        return base64.urlsafe_b64decode(value[2:] + "=" * (-len(value[2:]) % 4)).decode("utf-8")
+    except ValueError:
+        return None
+
+
+def _unwrap_yahoo(parts, match) -> Optional[str]:
+    # r.search.yahoo.com/_ylt=...;_ylu=.../RV=2/RE=.../RO=10/RU=https%3a%2f%2f.../RK=2/RS=...
+    return unquote(match.group(1))
+
+
+_GOOGLE_EMBEDDED_URL = re.compile(rb"https?://[\x21-\x7e]+")
+
+
+def _unwrap_google_news(parts, match) -> Optional[str]:
+    """
+    ./articles/<id> et /rss/articles/<id> : les anciens identifiants (CBMi...) sont un
+    protobuf en base64 qui contient l'URL de l'article ; sinon l'identifiant seul, sans
+    les paramètres de langue, est la forme canonique.
+    """
+    article_id = match.group(1)
+    try:
+        decoded = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+        embedded = _GOOGLE_EMBEDDED_URL.search(decoded)
+        if embedded:
+            return embedded.group(0).decode("ascii")
+    except ValueError:
+        pass
+    return urlunsplit((parts.scheme, parts.netloc, f"/articles/{article_id}", "", ""))
+
+
+def _engine_hosts(env_name: str, default: str, *hosts: str) -> List[str]:
+    configured = urlsplit(os.getenv(env_name, default)).hostname
+    return [*hosts, configured] if configured else list(hosts)
+
+
+# Règles par moteur : hôtes (et sous-domaines) concernés, y compris l'hôte configuré
+# (BING_URL, YAHOO_NEWS_URL...), chemins de redirection (expressions précompilées)
+_ENGINE_RULES = [
+    (_engine_hosts('BING_URL', 'https://www.bing.com', 'bing.com'), [
+        _EngineRule("bing", frozenset({"form", "cvid", "ei", "qs", "sk", "sc", "sp"}),
+                    re.compile(r"^/news/apiclick\.aspx$", re.IGNORECASE), _unwrap_bing_apiclick),
+        _EngineRule("bing", frozenset(), re.compile(r"^/ck/a$"), _unwrap_bing_ck),
+    ]),
+    (_engine_hosts('YAHOO_NEWS_URL', 'https://fr.news.yahoo.com', 'yahoo.com'), [
+        _EngineRule("yahoo", frozenset({".tsrc", "soc_src", "soc_trk", "guccounter", "guce_referrer", "guce_referrer_sig"}),
+                    re.compile(r"/RU=([^/]+)/"), _unwrap_yahoo),
+    ]),
+    (_engine_hosts('GOOGLE_NEWS_URL', 'https://news.google.com', 'news.google.com'), [
+        _EngineRule("google", frozenset({"hl", "gl", "ceid", "oc"}),
+                    re.compile(r"^(?:/rss)?/articles/([A-Za-z0-9_-]+)"), _unwrap_google_news),
+    ]),
+    (_engine_hosts('BAIDU_NEWS_URL', 'https://news.baidu.com', 'baidu.com'), [
+        # baidu.com/link?url=... est chiffré : seuls les paramètres de suivi sont retirés
+        _EngineRule("baidu", frozenset({"wfr", "for", "rsv_pq", "rsv_t", "rqlang", "rsv_dl"}), None, None),
+    ]),
+]
+
+_RULES_BY_HOST: Dict[str, List[_EngineRule]] = {}
+for _hosts, _rules in _ENGINE_RULES:
+    for _host in _hosts:
+        _RULES_BY_HOST.setdefault(_host.lower(), []).extend(_rules)
+
+
+def _rules_for(host: str) -> List[_EngineRule]:
+    """Règles de l'hôte ou de son domaine parent le plus proche (www.bing.com -> bing.com)"""
+    while True:
+        rules = _RULES_BY_HOST.get(host)
+        if rules is not None:
+            return rules
+        dot = host.find(".")
+        if dot < 0:
+            return []
+        host = host[dot + 1:]
+
+
+def _clean_query(query: str, engine_params) -> str:
+    """Paramètres de suivi retirés, les autres triés par nom (encodage d'origine conservé)"""
+    kept = []
+    for piece in query.split("&"):
+        if not piece:
+            continue
+        name = unquote(piece.partition("=")[0])
+        if _TRACKING_PARAMS.fullmatch(name) or name.lower() in engine_params:
+            continue
+        kept.append((name, piece))
+    kept.sort(key=lambda item: item[0])
+    return "&".join(piece for _, piece in kept)
+
+
+@lru_cache(maxsize=CANONICAL_URL_CACHE_SIZE)
+def canonicalize(url: str) -> str:
+    """
+    Forme canonique d'un lien d'article : enveloppes de redirection des moteurs
+    déroulées, paramètres de suivi et fragment retirés, hôte en minuscules sans port
+    par défaut, paramètres triés. Les URLs non HTTP(S) ou invalides sont rendues telles quelles.
+    """
+    for _ in range(MAX_UNWRAP + 1):
+        try:
+            parts = urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS or not parts.hostname:
+            return url
+        host = parts.hostname.rstrip(".")
+        if ":" in host:
+            host = f"[{host}]"
+        rules = _rules_for(host)
+
+        target = None
+        for rule in rules:
+            if rule.path is None:
+                continue
+            match = rule.path.search(parts.path)
+            if match:
+                target = rule.unwrap(parts, match)
+                break
+        if target and target != url:
+            url = target
+            continue
+
+        netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+        if parts.username or parts.password:
+            netloc = f"{parts.netloc.rpartition('@')[0]}@{netloc}"
+        engine_params = frozenset().union(*(rule.params for rule in rules)) if rules else frozenset()
+        query = _clean_query(parts.query, engine_params) if parts.query else ""
+        # Les fragments « #! » désignent une page (applications monopages), les autres non
+        fragment = parts.fragment if parts.fragment.startswith("!") else ""
+        return urlunsplit((scheme, netloc, parts.path or "/", query, fragment))
+    return url
+
+
+def backfill_canonical_urls(db: Session) -> int:
+    """
+    Canonise les liens des articles enregistrés sans original_url (avant l'existence
+    de la colonne) : le lien reçu passe dans original_url, url devient le lien
+    canonique, y compris dans la table theme_articles.
+
+    Returns:
+        int: Nombre d'articles traités
+    """
+    count = 0
+    while True:
+        batch = db.execute(
+            select(ArticleEntity.id, ArticleEntity.url)
+            .where(ArticleEntity.original_url.is_(None))
+            .order_by(ArticleEntity.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            return count
+        db.execute(update(ArticleEntity), [
+            {"id": article_id, "url": canonicalize(url), "original_url": url} for article_id, url in batch
+        ])
+        changed = [
+            {"b_article_id": article_id, "b_url": canonicalize(url)}
+            for article_id, url in batch if canonicalize(url) != url
+        ]
+        if changed:
+            db.execute(
+                update(ThemeArticleEntity.__table__)
+                .where(ThemeArticleEntity.__table__.c.article_id == bindparam("b_article_id"))
+                .values(url=bindparam("b_url")),
+                changed,
+            )
+        db.commit()
+        count += len(batch)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import codecs
+import os
+import re
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from charset_normalizer import from_bytes
+
+from utils.cache import TTLCache, MISSING
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Octets examinés pour trouver <meta charset> ou la déclaration XML
+CHARSET_META_BYTES = int(os.getenv('CHARSET_META_BYTES', '4096'))
+# Octets soumis au détecteur statistique quand la page ne déclare rien
+CHARSET_DETECT_BYTES = int(os.getenv('CHARSET_DETECT_BYTES', '32768'))
+# Durée de vie (secondes) de l'encodage détecté mémorisé par domaine
+CHARSET_CACHE_TTL = int(os.getenv('CHARSET_CACHE_TTL', '86400'))
+
+DEFAULT_ENCODING = 'utf-8'
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+?charset\s*=\s*["']?([\w.:-]+)|<\?xml[^>]+?encoding\s*=\s*["']([\w.:-]+)""",
+    re.IGNORECASE,
+)
+# Étiquettes remplacées par leur sur-ensemble, comme le font les navigateurs
+_SUPERSETS = {
+    'latin-1': 'cp1252',
+    'iso8859-1': 'cp1252',
+    'ascii': 'cp1252',
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+}
+
+# Encodage détecté par domaine, pour ne lancer le détecteur qu'une fois par site
+_domain_cache = TTLCache(maxsize=4096, ttl=CHARSET_CACHE_TTL)
+
+
+def _normalize(label) -> Optional[str]:
+    """Nom Python canonique d'une étiquette d'encodage, None si elle est inconnue"""
+    if isinstance(label, bytes):
+        label = label.decode('ascii', 'ignore')
+    try:
+        name = codecs.lookup(label.strip()).name
+    except (LookupError, ValueError):
+        return None
+    return _SUPERSETS.get(name, name)
+
+
+def _detect(content: bytes) -> Optional[str]:
+    prefix = content[:CHARSET_DETECT_BYTES]
+    if len(content) > CHARSET_DETECT_BYTES:
+        # Couper après une balise pour ne pas tronquer un caractère multi-octets
+        end = prefix.rfind(b">")
+        if end > 0:
+            prefix = prefix[:end + 1]
+    try:
+        # Cas le plus courant, et vérification bien plus rapide que le détecteur
+        prefix.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    best = from_bytes(prefix).best()
+    return _normalize(best.encoding) if best is not None else None
+
+
+def sniff(content: bytes, content_type: str = None, host: str = None) -> Tuple[str, str]:
+    """
+    Détermine l'encodage d'une page sans analyser tout le corps :
+    BOM, puis charset de l'en-tête Content-Type, puis <meta charset> (ou déclaration XML)
+    dans les CHARSET_META_BYTES premiers octets, puis encodage déjà détecté pour le domaine,
+    et enfin détecteur statistique sur les CHARSET_DETECT_BYTES premiers octets.
+
+    Returns:
+        Tuple: (encodage, source : bom, header, meta, domain, detected ou default)
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding, 'bom'
+
+    if content_type:
+        match = _HEADER_CHARSET.search(content_type)
+        encoding = _normalize(match.group(1)) if match else None
+        if encoding:
+            return encoding, 'header'
+
+    match = _META_CHARSET.search(content, 0, CHARSET_META_BYTES)
+    encoding = _normalize(match.group(1) or match.group(2)) if match else None
+    if encoding:
+        return encoding, 'meta'
+
+    if host:
+        encoding = _domain_cache.get(host)
+        if encoding is not MISSING:
+            return encoding, 'domain'
+
+    encoding = _detect(content)
+    if encoding is None:
+        return DEFAULT_ENCODING, 'default'
+    if host:
+        _domain_cache.set(host, encoding)
+    return encoding, 'detected'
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import zlib
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip reste disponible
+    brotli = None
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    """Retourne les encodages acceptés (q > 0) d'un en-tête Accept-Encoding"""
+    encodings = set()
+    for part in (accept_encoding or "").split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                pass
+        if quality > 0:
+            encodings.add(name)
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Choisit le meilleur encodage supporté par le client (br, puis gzip)"""
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compresse un corps complet"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str):
+    """Compresse un flux de morceaux au fur et à mesure"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import logging
 import pymysql
 
+from utils.tracing import instrument_engine
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -24,6 +26,8 @@ DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYS
 
 # Créer le moteur SQLAlchemy
 engine = create_engine(DATABASE_URL)
+# Un span par requête SQL si les traces sont activées (TRACING_EXPORTER)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
@@ -37,6 +41,8 @@ def create_tables():
         from models.discovery_popular_feed_model import DiscoveryPopularFeedEntity
         from models.feed_model import FeedEntity
         from models.article_model import ArticleEntity
+        from models.theme_article_model import ThemeArticleEntity
+        from models.article_simhash_model import ArticleSimhashEntity
         from models.base import Base
         
         # Créer toutes les tables définies dans les modèles
@@ -47,8 +53,24 @@ def create_tables():
             PopularSiteToScanEntity.__table__,
             DiscoveryPopularFeedEntity.__table__,
             FeedEntity.__table__,
-            ArticleEntity.__table__
+            ArticleEntity.__table__,
+            ThemeArticleEntity.__table__,
+            ArticleSimhashEntity.__table__
         ])
+        
+        # create_all ne modifie pas les tables existantes : ajouter les colonnes (nullables) et les index manquants
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    with engine.begin() as conn:
+                        conn.execute(text(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                        ))
+                    logger.info(f"Colonne {table.name}.{column.name} ajoutée")
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("Tables créées avec succès")
         return True
     except Exception as e:
@@ -146,3 +168,76 @@ def seed_database():
         import traceback
         logger.error(traceback.format_exc())
         return False
+
+
+# Fonction pour remplir la table theme_articles à partir des articles existants
+def init_theme_summary():
+    try:
+        from models.theme_article_model import ThemeArticleEntity
+        from utils.theme_summary import backfill_theme_summary
+
+        db = SessionLocal()
+        try:
+            # La table est ensuite maintenue à l'insertion des articles
+            if db.query(ThemeArticleEntity.article_id).first() is None:
+                count = backfill_theme_summary(db)
+                logger.info(f"Table theme_articles initialisée avec {count} articles")
+        finally:
+            db.close()
+        return True
+    except Exception as e:
+        logger.error(f"Erreur lors de l'initialisation de theme_articles: {e}")
+        return False
+
+
+# Fonction pour indexer les empreintes SimHash des articles existants
+def init_simhash_index():
+    try:
+        from sqlalchemy import BigInteger, delete
+        from models.article_simhash_model import ArticleSimhashEntity
+        from utils import simhash
+        from utils.near_duplicates import backfill_simhash_index, simhash_index_is_stale
+
+        # Index dérivé des articles : une table créée avec band_value en INT (trop étroit
+        # pour les bandes de 32 et 64 bits) est recréée plutôt que migrée
+        table = ArticleSimhashEntity.__table__
+        columns = {column['name']: column['type'] for column in inspect(engine).get_columns(table.name)}
+        if 'band_value' in columns and not isinstance(columns['band_value'], BigInteger):
+            table.drop(bind=engine)
+            table.create(bind=engine)
+            logger.info("Table article_simhash_bands recréée (band_value en BIGINT)")
+
+        db = SessionLocal()
+        try:
+            if simhash_index_is_stale(db):
+                db.execute(delete(ArticleSimhashEntity))
+                db.commit()
+                logger.info(f"Découpage ou calcul SimHash modifié ({simhash.BANDS} bandes) : article_simhash_bands reconstruite")
+            # L'index est ensuite maintenu à l'insertion des articles
+            if db.query(ArticleSimhashEntity.article_id).first() is None:
+                count = backfill_simhash_index(db)
+                logger.info(f"Table article_simhash_bands initialisée avec {count} articles")
+        finally:
+            db.close()
+        return True
+    except Exception as e:
+        logger.error(f"Erreur lors de l'initialisation de article_simhash_bands: {e}")
+        return False
+
+
+# Fonction pour canoniser les liens des articles enregistrés avant la colonne original_url
+def init_canonical_urls():
+    try:
+        from utils.canonical_url import backfill_canonical_urls
+
+        db = SessionLocal()
+        try:
+            count = backfill_canonical_urls(db)
+            if count:
+                logger.info(f"Liens canonisés pour {count} articles")
+        finally:
+            db.close()
+        return True
+    except Exception as e:
+        logger.error(f"Erreur lors de la canonisation des liens des articles: {e}")
+        return False
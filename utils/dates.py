@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Nombre de chaînes de date analysées gardées en cache (« il y a 2 heures », « 1天前 »... reviennent sur chaque page)
+DATE_CACHE_SIZE = int(os.getenv('DATE_CACHE_SIZE', '8192'))
+# Au-delà de cette longueur, le texte n'est pas une date (conteneur entier) : ni analysé ni mis en cache
+MAX_DATE_TEXT = 80
+
+# Résultat d'analyse mis en cache, indépendant de l'heure courante :
+#   (_KIND_ABSOLUTE, datetime)                      date complète, en heure locale sans fuseau
+#   (_KIND_AGO, secondes)                           « il y a 2 heures », « 2 hours ago », « 2小时前 »
+#   (_KIND_DAY, jours en arrière, heure, minute)    « hier à 14h05 », « 今天 08:30 », « 08:30 »
+#   (_KIND_MONTH_DAY, mois, jour, heure, minute)    « 1er mai », « May 1 », « 5月1日 » (année courante)
+_KIND_ABSOLUTE, _KIND_AGO, _KIND_DAY, _KIND_MONTH_DAY = range(4)
+
+_SECONDS = {
+    "seconds": 1, "minutes": 60, "hours": 3600, "days": 86400,
+    "weeks": 7 * 86400, "months": 30 * 86400, "years": 365 * 86400,
+}
+_LATIN_UNITS = {
+    "seconde": "seconds", "second": "seconds", "sec": "seconds", "s": "seconds",
+    "minute": "minutes", "min": "minutes", "mn": "minutes",
+    "heure": "hours", "hour": "hours", "hr": "hours", "h": "hours",
+    "jour": "days", "day": "days", "j": "days", "d": "days",
+    "semaine": "weeks", "sem": "weeks", "week": "weeks", "wk": "weeks", "w": "weeks",
+    "mois": "months", "month": "months", "mo": "months",
+    "année": "years", "annee": "years", "an": "years", "year": "years", "yr": "years", "y": "years",
+}
+_ZH_UNITS = {
+    "秒": "seconds", "秒钟": "seconds", "分": "minutes", "分钟": "minutes",
+    "小时": "hours", "个小时": "hours", "钟头": "hours", "个钟头": "hours",
+    "天": "days", "日": "days", "周": "weeks", "星期": "weeks", "个星期": "weeks",
+    "个月": "months", "月": "months", "年": "years",
+}
+_NUMBER_WORDS = {
+    "un": 1, "une": 1, "a": 1, "an": 1, "one": 1, "quelques": 3, "few": 3, "a few": 3,
+}
+_ZH_DIGITS = {"零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_MONTHS = {
+    "janvier": 1, "janv": 1, "février": 2, "fevrier": 2, "févr": 2, "fevr": 2, "fév": 2, "mars": 3,
+    "avril": 4, "avr": 4, "mai": 5, "juin": 6, "juillet": 7, "juil": 7, "août": 8, "aout": 8,
+    "septembre": 9, "octobre": 10, "novembre": 11, "décembre": 12, "decembre": 12, "déc": 12,
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8, "september": 9,
+    "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+_DAYS_BACK = {
+    "aujourd'hui": 0, "today": 0, "今天": 0, "今日": 0,
+    "hier": 1, "yesterday": 1, "昨天": 1, "昨日": 1,
+    "avant-hier": 2, "前天": 2,
+}
+
+
+def _alternation(words) -> str:
+    # Les plus longs d'abord : « minute » avant « min », « avant-hier » avant « hier »
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def _whole_words(words) -> str:
+    # Mots latins entiers (« hier » mais pas « Thierry »), termes chinois sans limite de
+    # mot : le chinois ne sépare pas les mots par des espaces
+    cjk = [word for word in words if re.search(r"[\u3040-\u9fff]", word)]
+    latin = [word for word in words if word not in cjk]
+    return rf"(?<!\w)(?:{_alternation(latin)})(?!\w)|{_alternation(cjk)}"
+
+
+_NUMBER = r"(\d+|a few|quelques|une|un|an|a|one|few)"
+_LATIN_UNIT = rf"({_alternation(_LATIN_UNITS)})s?\.?"
+# Heure facultative après une date : « à 14h05 », « at 8:30 pm », « , 08:30 », « 14時05分 »
+_TIME = r"(?:\s*(?:à|a|at|,|-|·)?\s*(\d{1,2})\s*(?:[:h：点時时]\s*(\d{2})?)\s*(?:分)?\s*(am|pm)?)?"
+
+# « maintenant » et « right now » sont aussi des mots courants d'un titre : seuls, ils sont le texte entier
+_JUST_NOW = re.compile(_whole_words(["à l'instant", "a l'instant", "just now", "刚刚", "刚才"]) + r"|^(?:maintenant|right now)$")
+_FR_AGO = re.compile(rf"il y a\s+{_NUMBER}\s*{_LATIN_UNIT}(?!\w)")
+_EN_AGO = re.compile(rf"{_NUMBER}\s*{_LATIN_UNIT}\s+ago\b")
+_BARE = re.compile(rf"{_NUMBER}\s*{_LATIN_UNIT}")
+_ZH_AGO = re.compile(rf"(\d+|[零一二两三四五六七八九十半]+)\s*({_alternation(_ZH_UNITS)})(半)?\s*(?:前|以前|之前)")
+_DAY_WORD = re.compile(rf"({_whole_words(_DAYS_BACK)}){_TIME}")
+_TIME_ONLY = re.compile(r"(\d{1,2})[:h](\d{2})")
+_ISO = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})(?:[t ](\d{2}):(\d{2})(?::(\d{2})(?:[.,]\d+)?)?)?\s*(z|[+-]\d{2}(?::?\d{2})?)?",
+    re.IGNORECASE,
+)
+_RFC822 = re.compile(r"(?:[a-z]{3},\s*)?\d{1,2}\s+[a-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}")
+_ZH_DATE = re.compile(r"(?:(\d{4})\s*年\s*)?(\d{1,2})\s*月\s*(\d{1,2})\s*[日号]" + _TIME)
+_NUMERIC = re.compile(r"(\d{1,4})[/.-](\d{1,2})[/.-](\d{1,4})" + _TIME)
+_DAY_MONTH_DATE = re.compile(rf"(\d{{1,2}})(?:er|st|nd|rd|th)?\s+({_alternation(_MONTHS)})\.?(?:,?\s+(\d{{4}}))?(?!\w){_TIME}")
+_MONTH_DAY_DATE = re.compile(rf"(?<!\w)({_alternation(_MONTHS)})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(\d{{4}}))?(?!\w){_TIME}")
+
+
+def to_local(value: datetime) -> datetime:
+    """Date en heure locale sans fuseau (convention des articles de l'application)"""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def _number(token: str) -> float:
+    if token.isdigit():
+        return int(token)
+    return _NUMBER_WORDS[token]
+
+
+def _zh_number(token: str) -> float:
+    """Nombre en chiffres arabes ou en caractères chinois jusqu'à 99 (« 两 », « 十五 », « 二十 », « 半 »)"""
+    if token.isdigit():
+        return int(token)
+    if token == "半":
+        return 0.5
+    if "十" in token:
+        tens, _, units = token.partition("十")
+        return _ZH_DIGITS.get(tens, 1) * 10 + _ZH_DIGITS.get(units, 0)
+    return _ZH_DIGITS.get(token, 1)
+
+
+def _hour_minute(hour: Optional[str], minute: Optional[str], meridiem: Optional[str]) -> Tuple[int, int]:
+    if hour is None:
+        return 0, 0
+    h = int(hour)
+    if meridiem == "pm" and h < 12:
+        h += 12
+    elif meridiem == "am" and h == 12:
+        h = 0
+    return h, int(minute or 0)
+
+
+def _offset(value: str) -> timezone:
+    """Fuseau d'une date ISO 8601 : « z », « +02:00 », « +0200 », « -05 »"""
+    if value in ("z", "Z"):
+        return timezone.utc
+    digits = value[1:].replace(":", "")
+    delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:] or 0))
+    return timezone(-delta if value[0] == "-" else delta)
+
+
+def _absolute(year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0):
+    if year < 100:
+        year += 2000
+    try:
+        return _KIND_ABSOLUTE, datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
+
+
+def _month_day(month: int, day: int, year: Optional[str], hour: int, minute: int):
+    if year:
+        return _absolute(int(year), month, day, hour, minute)
+    if not 1 <= month <= 12 or not 1 <= day <= 31:
+        return None
+    return _KIND_MONTH_DAY, month, day, hour, minute
+
+
+def _iso(match):
+    year, month, day, hour, minute, second, offset = match.groups()
+    parsed = _absolute(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0))
+    if parsed is None or not offset:
+        return parsed
+    return _KIND_ABSOLUTE, to_local(parsed[1].replace(tzinfo=_offset(offset)))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse(text: str):
+    """Analyse mise en cache (voir les formes de résultat ci-dessus), ou None"""
+    text = " ".join(text.replace("\xa0", " ").lower().split())
+    if not text:
+        return None
+
+    # Dates relatives (chaque expression n'est essayée que si son mot-clé est présent)
+    match = "前" in text and _ZH_AGO.search(text)
+    if match:
+        amount = _zh_number(match.group(1)) + (0.5 if match.group(3) else 0)
+        return _KIND_AGO, amount * _SECONDS[_ZH_UNITS[match.group(2)]]
+    match = ("il y a" in text and _FR_AGO.search(text)) or ("ago" in text and _EN_AGO.search(text)) or _BARE.fullmatch(text)
+    if match:
+        return _KIND_AGO, _number(match.group(1)) * _SECONDS[_LATIN_UNITS[match.group(2)]]
+    if _JUST_NOW.search(text):
+        return _KIND_AGO, 0
+    match = _DAY_WORD.search(text)
+    if match:
+        if match.group(2) is None:
+            return _KIND_DAY, _DAYS_BACK[match.group(1)], None, None
+        return (_KIND_DAY, _DAYS_BACK[match.group(1)], *_hour_minute(*match.group(2, 3, 4)))
+
+    # Dates absolues
+    match = _ISO.search(text)
+    if match:
+        return _iso(match)
+    if _RFC822.match(text):
+        try:
+            return _KIND_ABSOLUTE, to_local(parsedate_to_datetime(text))
+        except (TypeError, ValueError, IndexError):
+            pass
+    match = _ZH_DATE.search(text)
+    if match:
+        year, month, day, hour, minute, meridiem = match.groups()
+        return _month_day(int(month), int(day), year, *_hour_minute(hour, minute, meridiem))
+    match = _NUMERIC.search(text)
+    if match:
+        first, second, third = (int(value) for value in match.group(1, 2, 3))
+        hour, minute = _hour_minute(*match.group(4, 5, 6))
+        if len(match.group(1)) == 4:
+            return _absolute(first, second, third, hour, minute)  # 2024/05/01
+        if second > 12 >= first:
+            return _absolute(third, first, second, hour, minute)  # 05/31/2024 (anglais)
+        return _absolute(third, second, first, hour, minute)  # 31/05/2024
+    match = _DAY_MONTH_DATE.search(text)
+    if match:
+        day, month, year, hour, minute, meridiem = match.groups()
+        return _month_day(_MONTHS[month], int(day), year, *_hour_minute(hour, minute, meridiem))
+    match = _MONTH_DAY_DATE.search(text)
+    if match:
+        month, day, year, hour, minute, meridiem = match.groups()
+        return _month_day(_MONTHS[month], int(day), year, *_hour_minute(hour, minute, meridiem))
+    match = _TIME_ONLY.fullmatch(text)
+    if match:
+        return _KIND_DAY, 0, int(match.group(1)), int(match.group(2))
+    return None
+
+
+def parse_date(text: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Date de publication d'un texte en français, anglais ou chinois : ISO 8601, RFC 822,
+    « 1er mai 2024 à 8h30 », « May 1, 2024 », « 2024年5月1日 », « 01/05/2024 », « il y a
+    2 heures », « 3 days ago », « 2小时前 », « hier à 14h05 », « 昨天 08:30 »...
+    L'analyse d'une chaîne est mise en cache (DATE_CACHE_SIZE) ; seul le calcul relatif
+    à now est refait. Les dates ISO 8601 sont analysées sans passer par le cache.
+
+    Returns:
+        datetime: En heure locale sans fuseau, ou None si le texte n'est pas reconnu
+    """
+    if not text or len(text) > MAX_DATE_TEXT:
+        return None
+    match = _ISO.match(text) if text[:4].isdigit() and text[4:5] == "-" else None
+    # Les dates ISO 8601 (attributs datetime, flux) sont presque toutes différentes : analysées
+    # directement, elles n'évincent pas du cache les chaînes qui reviennent
+    parsed = _iso(match) if match else _parse(text)
+    if parsed is None:
+        return None
+    kind = parsed[0]
+    if kind == _KIND_ABSOLUTE:
+        return parsed[1]
+    now = now or datetime.now()
+    if kind == _KIND_AGO:
+        return now - timedelta(seconds=parsed[1])
+    if kind == _KIND_DAY:
+        _, days_back, hour, minute = parsed
+        if hour is None:
+            return now - timedelta(days=days_back)
+        try:
+            return (now - timedelta(days=days_back)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except ValueError:
+            return None
+    _, month, day, hour, minute = parsed
+    try:
+        value = datetime(now.year, month, day, hour, minute)
+    except ValueError:
+        return None
+    # Sans année : la date la plus récente (« 28 décembre » lu en janvier est de l'année précédente)
+    if value - now > timedelta(days=1):
+        try:
+            value = value.replace(year=now.year - 1)
+        except ValueError:
+            return None
+    return value
+
+
+def element_date(element, now: Optional[datetime] = None, attribute: Optional[str] = "datetime") -> Optional[datetime]:
+    """Date d'un élément HTML : attribut (datetime par défaut), sinon son texte"""
+    if element is None:
+        return None
+    value = element.get(attribute) if attribute else None
+    return (value and parse_date(value, now)) or parse_date(element.get_text(" ", strip=True), now)
+
+
+def cache_info():
+    return _parse.cache_info()
+
+
+def cache_clear():
+    _parse.cache_clear()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import requests
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# Budget total (secondes) d'une requête API ; un appelant peut le réduire avec l'en-tête X-Request-Timeout
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '20'))
+BATCH_REQUEST_DEADLINE = float(os.getenv('BATCH_REQUEST_DEADLINE', '60'))
+# Plafond du temps d'établissement d'une connexion (DNS + TCP + TLS)
+CONNECT_TIMEOUT = float(os.getenv('CONNECT_TIMEOUT', '5'))
+# Délai appliqué aux appels hors requête API (pas de budget en cours)
+DEFAULT_HTTP_TIMEOUT = float(os.getenv('DEFAULT_HTTP_TIMEOUT', '15'))
+# Budget restant minimal pour lancer la recherche (facultative) du favicon
+FAVICON_MIN_BUDGET = float(os.getenv('FAVICON_MIN_BUDGET', '3'))
+
+# Budgets par route : (méthode ou None pour toutes, chemin complet en expression régulière, budget) ;
+# la première règle qui correspond s'applique
+DEADLINE_RULES = [
+    (None, re.compile(r"/api/service-feeds/feeds/batch"), BATCH_REQUEST_DEADLINE),
+    ("POST", re.compile(r"/api/service-feeds/users/[^/]+/opml"), BATCH_REQUEST_DEADLINE),  # import OPML (pas l'export)
+]
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Budget de la requête épuisé avant ou pendant une étape"""
+
+    def __init__(self, stage: str, deadline: "Deadline"):
+        super().__init__(f"deadline of {deadline.budget:g}s exceeded during {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """Budget de temps d'une requête, consommé par les étapes successives (partagé entre threads)"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.start = time.monotonic()
+        self.expires_at = self.start + budget
+        self.exceeded_stage = None
+        self.skipped = []
+        self._stages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def check(self, stage: str):
+        """Lève DeadlineExceeded si le budget est épuisé avant de commencer l'étape"""
+        if self.remaining() <= 0:
+            raise self.exceeded(stage)
+
+    def exceeded(self, stage: str) -> DeadlineExceeded:
+        with self._lock:
+            if self.exceeded_stage is None:
+                self.exceeded_stage = stage
+        return DeadlineExceeded(stage, self)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def skip(self, stage: str):
+        with self._lock:
+            self.skipped.append(stage)
+
+    def breakdown(self) -> str:
+        with self._lock:
+            stages = " ".join(f"{stage}={seconds:.2f}s" for stage, seconds in self._stages.items())
+            skipped = f" skipped={','.join(self.skipped)}" if self.skipped else ""
+        return f"{stages or 'no stage'}{skipped}"
+
+
+@contextmanager
+def deadline_scope(budget: float):
+    """Ouvre un budget pour le code exécuté dans le bloc (et les threads qui en héritent le contexte)"""
+    deadline = Deadline(budget)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check(stage: str):
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def record(stage: str, seconds: float):
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.record(stage, seconds)
+
+
+def remaining(default: float = None) -> Optional[float]:
+    deadline = _current.get()
+    return deadline.remaining() if deadline is not None else default
+
+
+def expired(stage: str) -> Optional[DeadlineExceeded]:
+    """DeadlineExceeded à lever si le budget de la requête en cours est épuisé, sinon None"""
+    deadline = _current.get()
+    if deadline is None or deadline.remaining() > 0:
+        return None
+    return deadline.exceeded(stage)
+
+
+def sleep(seconds: float):
+    """time.sleep borné par le budget restant (attentes de courtoisie, backoff)"""
+    deadline = _current.get()
+    if deadline is not None:
+        seconds = min(seconds, max(deadline.remaining(), 0))
+    time.sleep(seconds)
+
+
+def timeout(cap: float = DEFAULT_HTTP_TIMEOUT):
+    """
+    Délai (connect, read) à passer à requests : le budget restant, plafonné par cap,
+    et au plus CONNECT_TIMEOUT pour l'établissement de la connexion.
+    """
+    deadline = _current.get()
+    read = cap if deadline is None else min(cap, deadline.remaining())
+    if read <= 0:
+        raise deadline.exceeded("connect")
+    return min(CONNECT_TIMEOUT, read), read
+
+
+def allow_optional(stage: str, min_budget: float) -> bool:
+    """Indique si une étape facultative peut être lancée ; sinon la note comme sautée"""
+    deadline = _current.get()
+    if deadline is None or deadline.remaining() >= min_budget:
+        return True
+    deadline.skip(stage)
+    return False
+
+
+class DeadlineMiddleware:
+    """
+    Middleware ASGI : ouvre le budget de chaque requête (REQUEST_DEADLINE, ou la valeur
+    plus courte demandée par l'appelant dans X-Request-Timeout) et journalise la
+    répartition du temps par étape des requêtes qui l'ont dépassé.
+    """
+
+    def __init__(self, app, rules=None):
+        self.app = app
+        self.rules = DEADLINE_RULES if rules is None else rules
+
+    def budget_for(self, scope) -> float:
+        budget = REQUEST_DEADLINE
+        for method, path, rule_budget in self.rules:
+            if (method is None or scope["method"] == method) and path.fullmatch(scope["path"]):
+                budget = rule_budget
+                break
+        for key, value in scope["headers"]:
+            if key == b"x-request-timeout":
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    budget = min(budget, requested)
+                break
+        return budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline_scope(self.budget_for(scope)) as deadline:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if deadline.exceeded_stage is not None:
+                    logger.warning(
+                        f"Délai de {deadline.budget:g}s dépassé ({deadline.exceeded_stage}) pour "
+                        f"{scope['method']} {scope['path']} : {deadline.breakdown()}"
+                    )
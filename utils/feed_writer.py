@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+from io import StringIO
+from typing import List, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from feedgenerator import Atom1Feed, Rss201rev2Feed, RssFeed
+from feedgenerator.django.utils.xmlutils import SimplerXMLGenerator
+
+from models.article_record import ArticleRecord
+from utils.compression import choose_encoding, compress_stream
+
+# Formats de sortie XML supportés par les routes de flux
+FEED_FORMATS = {
+    'rss': Rss201rev2Feed,
+    'atom': Atom1Feed,
+}
+
+# Valeurs acceptées pour le paramètre `format` des routes de flux
+OUTPUT_FORMATS = ('json', *FEED_FORMATS)
+
+
+def iter_feed_xml(feed, encoding: str = 'utf-8'):
+    """
+    Sérialise un flux feedgenerator élément par élément au lieu de
+    construire tout le document en une seule chaîne.
+
+    Yields:
+        bytes: En-tête du document, puis un morceau par article, puis la fin du document
+    """
+    buffer = StringIO()
+    handler = SimplerXMLGenerator(buffer, encoding)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode(encoding)
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    handler.startDocument()
+    if isinstance(feed, RssFeed):
+        handler.startElement("rss", feed.rss_attributes())
+        handler.startElement("channel", feed.root_attributes())
+        item_tag = "item"
+    else:
+        handler.startElement("feed", feed.root_attributes())
+        item_tag = "entry"
+    feed.add_root_elements(handler)
+    yield drain()
+
+    for item in feed.items:
+        handler.startElement(item_tag, feed.item_attributes(item))
+        feed.add_item_elements(handler, item)
+        handler.endElement(item_tag)
+        yield drain()
+
+    if isinstance(feed, RssFeed):
+        feed.endChannelElement(handler)
+        handler.endElement("rss")
+    else:
+        handler.endElement("feed")
+    yield drain()
+
+
+def create_syndication_feed(format: str, title: str, link: str, description: str,
+                            articles: List[ArticleRecord], language: Optional[str] = None):
+    """
+    Construit un flux RSS ou Atom à partir des articles au format de l'API.
+
+    Args:
+        format: 'rss' ou 'atom'
+        title: Titre du flux
+        link: URL du site ou de la recherche
+        description: Description du flux
+        articles: Articles (ArticleRecord)
+        language: Langue du flux
+
+    Returns:
+        SyndicationFeed: Flux prêt à être sérialisé
+    """
+    feed = FEED_FORMATS[format](
+        title=title or link,
+        link=link,
+        description=description or "",
+        language=language,
+    )
+    for article in articles:
+        pub_date = article.publication_date
+        if pub_date is not None and pub_date.tzinfo is None:
+            # Les dates naïves sont en heure locale ; on les rend comparables aux dates avec fuseau
+            pub_date = pub_date.astimezone()
+        feed.add_item(
+            title=article.title,
+            link=article.url or link,
+            description=article.description or "",
+            pubdate=pub_date,
+            unique_id=article.url or None,
+        )
+    return feed
+
+
+def feed_response(request: Request, format: str, title: str, link: str, description: str,
+                  articles: List[ArticleRecord], language: Optional[str] = None) -> StreamingResponse:
+    """
+    Retourne le flux en application/rss+xml ou application/atom+xml, écrit
+    progressivement dans la réponse et compressé (br/gzip) si le client l'accepte.
+    """
+    feed = create_syndication_feed(format, title, link, description, articles, language)
+    body = iter_feed_xml(feed)
+    headers = {"Vary": "Accept-Encoding"}
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        body = compress_stream(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return StreamingResponse(body, media_type=feed.mime_type, headers=headers)
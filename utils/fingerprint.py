@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Nombre de pages suivies (empreinte, extraction et fréquence de changement) ; les plus anciennes sont oubliées
+FINGERPRINT_MAX_PAGES = int(os.getenv('FINGERPRINT_MAX_PAGES', '2048'))
+# Durée maximale de réutilisation d'une extraction pour une page inchangée
+FINGERPRINT_RESULT_TTL = float(os.getenv('FINGERPRINT_RESULT_TTL', '21600'))
+# Bornes de l'intervalle de rafraîchissement suggéré (secondes)
+REFRESH_MIN_INTERVAL = float(os.getenv('REFRESH_MIN_INTERVAL', '300'))
+REFRESH_MAX_INTERVAL = float(os.getenv('REFRESH_MAX_INTERVAL', '86400'))
+
+# Parties volatiles retirées avant le calcul de l'empreinte
+_VOLATILE = [
+    # Scripts, styles, iframes et emplacements publicitaires (jetons, horodatages, identifiants de session)
+    re.compile(rb"<(script|style|noscript|iframe|ins|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL),
+    re.compile(rb"<!--.*?-->", re.DOTALL),
+    # Champs cachés (jetons CSRF) et balises meta de jetons
+    re.compile(rb"<input\b[^>]*type\s*=\s*[\"']?hidden[^>]*>", re.IGNORECASE),
+    re.compile(rb"<meta\b[^>]*(?:csrf|token|nonce)[^>]*>", re.IGNORECASE),
+    # Attributs propres à chaque réponse
+    re.compile(rb"\s(?:nonce|data-[\w-]*(?:token|csrf|timestamp|time|ts)|csrf[\w-]*)\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s>]+)", re.IGNORECASE),
+    # Dates et heures affichées (« il y a 5 min », 12:34:56, 2024-05-01T10:00:00Z)
+    re.compile(rb"<time\b[^>]*>.*?</time\s*>", re.IGNORECASE | re.DOTALL),
+    re.compile(rb"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"),
+    re.compile(rb"\b\d{1,2}:\d{2}(?::\d{2})?\b"),
+]
+_WHITESPACE = re.compile(rb"\s+")
+
+
+def normalize(content: bytes) -> bytes:
+    """Contenu de la page sans ses parties volatiles, espaces compactés"""
+    for pattern in _VOLATILE:
+        content = pattern.sub(b" ", content)
+    return _WHITESPACE.sub(b" ", content).strip()
+
+
+def fingerprint(content: bytes) -> str:
+    return hashlib.blake2b(normalize(content), digest_size=16).hexdigest()
+
+
+class _PageState:
+    __slots__ = ("fingerprint", "checks", "changes", "first_seen", "last_checked", "last_changed",
+                 "mean_change_interval", "result", "result_at")
+
+    def __init__(self, now: float):
+        self.fingerprint = None
+        self.checks = 0
+        self.changes = 0
+        self.first_seen = now
+        self.last_checked = now
+        self.last_changed = now
+        self.mean_change_interval = None  # moyenne mobile exponentielle
+        self.result = None
+        self.result_at = 0.0
+
+
+class ChangeTracker:
+    """
+    Empreinte du dernier contenu de chaque page, extraction associée et fréquence
+    de changement. Borné à FINGERPRINT_MAX_PAGES pages (LRU), partagé entre threads.
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, max_pages: int = FINGERPRINT_MAX_PAGES, result_ttl: float = FINGERPRINT_RESULT_TTL):
+        self.max_pages = max_pages
+        self.result_ttl = result_ttl
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, url: str, page_fingerprint: str) -> Tuple[str, Optional[object]]:
+        """
+        Enregistre un crawl de la page et met à jour sa fréquence de changement.
+
+        Returns:
+            Tuple: (new, changed ou unchanged ; extraction du crawl précédent si la page
+            n'a pas changé et qu'elle n'a pas expiré, sinon None : l'appelant extrait
+            puis appelle store())
+        """
+        now = time.time()
+        with self._lock:
+            state = self._pages.get(url)
+            if state is None:
+                state = self._pages[url] = _PageState(now)
+                while len(self._pages) > self.max_pages:
+                    self._pages.popitem(last=False)
+            self._pages.move_to_end(url)
+            state.checks += 1
+            state.last_checked = now
+
+            if state.fingerprint == page_fingerprint:
+                if state.result is not None and now - state.result_at <= self.result_ttl:
+                    return "unchanged", state.result
+                return "unchanged", None
+
+            status = "new" if state.fingerprint is None else "changed"
+            if state.fingerprint is not None:
+                interval = now - state.last_changed
+                state.changes += 1
+                state.mean_change_interval = interval if state.mean_change_interval is None else (
+                    self.SMOOTHING * interval + (1 - self.SMOOTHING) * state.mean_change_interval
+                )
+            state.fingerprint = page_fingerprint
+            state.last_changed = now
+            state.result = None
+            return status, None
+
+    def store(self, url: str, page_fingerprint: str, result):
+        """Associe l'extraction à l'empreinte, si la page n'a pas changé entre-temps"""
+        with self._lock:
+            state = self._pages.get(url)
+            if state is not None and state.fingerprint == page_fingerprint:
+                state.result = result
+                state.result_at = time.time()
+
+    def stats(self, url: str) -> Optional[dict]:
+        with self._lock:
+            state = self._pages.get(url)
+            if state is None:
+                return None
+            return {
+                "url": url,
+                "checks": state.checks,
+                "changes": state.changes,
+                "change_rate": round(state.changes / max(state.checks - 1, 1), 3),
+                "first_seen": state.first_seen,
+                "last_checked": state.last_checked,
+                "last_changed": state.last_changed,
+                "mean_change_interval": state.mean_change_interval,
+                "refresh_interval": self._refresh_interval(state),
+            }
+
+    def _refresh_interval(self, state: _PageState) -> float:
+        """
+        Intervalle de rafraîchissement suggéré : la moitié de l'intervalle moyen entre
+        deux changements ; sans changement observé, le temps écoulé depuis le premier crawl.
+        """
+        if state.mean_change_interval is not None:
+            interval = state.mean_change_interval / 2
+        else:
+            interval = state.last_checked - state.first_seen
+        return min(max(interval, REFRESH_MIN_INTERVAL), REFRESH_MAX_INTERVAL)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+
+tracker = ChangeTracker()
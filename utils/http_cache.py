@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+import os
+import hashlib
+from typing import Optional
+
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+
+from utils.compression import choose_encoding, compress
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Taille minimale (octets) à partir de laquelle une réponse est compressée
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+# Durées de cache (secondes) par route : un chemin terminé par « / » est un préfixe, sinon la
+# correspondance est exacte (/feed ne couvre pas /feed-changes) ; la première règle qui correspond s'applique
+CACHE_RULES = [
+    ("/api/service-sources/discovery-popular", int(os.getenv('DISCOVERY_CACHE_MAX_AGE', '3600'))),
+    ("/api/service-feeds/feed", int(os.getenv('FEED_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/feed-subject", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/feed-subject-url", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/multi-sources/", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/yahoo-news/", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/bing-news/", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+    ("/api/service-feeds/baidu-news/", int(os.getenv('SEARCH_CACHE_MAX_AGE', '300'))),
+]
+
+COMPRESSIBLE_TYPES = ("application/json", "application/rss+xml", "application/atom+xml",
+                      "application/xml", "application/x-ndjson", "text/")
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible (RFC 9110) entre If-None-Match et l'ETag courant"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class HTTPCacheMiddleware:
+    """
+    Middleware ASGI qui, pour les réponses complètes (non streamées) :
+    - ajoute un ETag fort et Cache-Control aux routes de flux et de découverte,
+      et répond 304 si If-None-Match correspond ;
+    - compresse en brotli/gzip au-delà de COMPRESSION_MIN_SIZE si le client l'accepte.
+
+    Les réponses streamées (RSS/Atom, NDJSON) passent sans modification.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, rules=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.rules = CACHE_RULES if rules is None else rules
+
+    def max_age_for(self, path: str) -> Optional[int]:
+        for route, max_age in self.rules:
+            if path == route or (route.endswith("/") and path.startswith(route)):
+                return max_age
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        max_age = self.max_age_for(scope["path"]) if scope["method"] == "GET" else None
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        if max_age is None and encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = request_headers.get("if-none-match")
+        start_message = None
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, streaming
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if streaming:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                # Réponse streamée : on ne peut ni la hacher ni la compresser d'un bloc
+                streaming = True
+                await send(start_message)
+                await send(message)
+                return
+
+            await self.send_complete(start_message, message.get("body", b""), max_age,
+                                     encoding, if_none_match, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def send_complete(self, start_message, body: bytes, max_age: Optional[int],
+                            encoding: Optional[str], if_none_match: Optional[str], send):
+        headers = MutableHeaders(raw=start_message["headers"])
+        content_type = headers.get("content-type", "")
+        already_encoded = "content-encoding" in headers
+        compressible = _is_compressible(content_type) and not already_encoded
+
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        compress_body = compressible and encoding is not None and len(body) >= self.minimum_size
+
+        if max_age is not None and start_message["status"] == 200:
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            # ETag propre à chaque représentation encodée
+            etag = f'"{digest}-{encoding}"' if compress_body else f'"{digest}"'
+            headers["Cache-Control"] = f"public, max-age={max_age}"
+
+            if _etag_matches(if_none_match, etag) or _etag_matches(if_none_match, f'"{digest}"'):
+                not_modified = {key: headers[key] for key in ("cache-control", "vary") if key in headers}
+                not_modified["etag"] = etag
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": MutableHeaders(not_modified).raw,
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            headers["ETag"] = etag
+
+        if compress_body:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
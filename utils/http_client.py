@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+import os
+import re
+import socket
+import threading
+import time
+import logging
+from urllib.parse import urljoin, urlparse
+
+import favicon
+from favicon.favicon import HEADERS as FAVICON_HEADERS, Icon, tags as favicon_tags
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from dotenv import load_dotenv
+
+from utils import charset, deadline, metrics, tracing
+from utils.cache import TTLCache, MISSING
+
+# Charger les variables d'environnement
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Taille des pools de connexions HTTP partagés par tous les scrapers
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '50'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+
+# Taille des blocs lus entre deux vérifications du budget de la requête
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('DOWNLOAD_CHUNK_SIZE', '65536'))
+# Taille maximale (octets) d'une page téléchargée ; au-delà le corps est tronqué
+HTTP_MAX_BYTES = int(os.getenv('HTTP_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Types de contenu acceptés pour les pages à scraper
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+# Signatures de fichiers binaires servis sans Content-Type
+BINARY_SIGNATURES = (b"%PDF", b"PK\x03\x04", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"\x1f\x8b")
+
+# Durée de vie (secondes) des favicons mis en cache par site
+FAVICON_CACHE_TTL = int(os.getenv('FAVICON_CACHE_TTL', '86400'))
+
+
+# Connexions instrumentées : durée de l'établissement (résolution DNS + connexion TCP)
+# des nouvelles connexions ; les connexions keep-alive réutilisées ne sont pas comptées
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        with metrics.stage('connect'):
+            return super()._new_conn()
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        with metrics.stage('connect'):
+            return super()._new_conn()
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = _TimedHTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Session unique : les connexions keep-alive sont réutilisées entre les requêtes
+session = _create_session()
+
+_favicon_cache = TTLCache(maxsize=4096, ttl=FAVICON_CACHE_TTL)
+
+
+def _abort_download(response: requests.Response):
+    """Coupe la socket d'un téléchargement dont le budget est épuisé (débloque la lecture en cours)"""
+    sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class UnsupportedContentType(requests.exceptions.RequestException):
+    """Réponse d'un type que l'appelant ne sait pas traiter (PDF, image, binaire...)"""
+
+
+def _check_content_type(response: requests.Response, content_types):
+    """Vérifie le type annoncé avant de lire le corps"""
+    if not content_types:
+        return
+    content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if content_type and not content_type.startswith(content_types):
+        raise UnsupportedContentType(f"unsupported content type: {content_type}", response=response)
+
+
+def _check_binary(response: requests.Response, first_chunk: bytes, content_types):
+    """Sans Content-Type annoncé, refuse un corps qui ressemble à un fichier binaire"""
+    if content_types and 'Content-Type' not in response.headers and (
+        first_chunk.startswith(BINARY_SIGNATURES) or b"\x00" in first_chunk[:1024]
+    ):
+        raise UnsupportedContentType("binary content without content type", response=response)
+
+
+class _ContainerCounter:
+    """Compte au fil du flux les balises ouvrantes de conteneurs d'articles (<article>, <h1>-<h3>)"""
+
+    PATTERN = re.compile(rb"<(?:article|h[1-3])[\s>]", re.IGNORECASE)
+    OVERLAP = 9  # longueur maximale d'une balise coupée entre deux blocs
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.count = 0
+        self.tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Ajoute un bloc ; True si assez de conteneurs ont été vus"""
+        data = self.tail + chunk
+        self.count += sum(1 for match in self.PATTERN.finditer(data) if match.end() > len(self.tail))
+        self.tail = data[-self.OVERLAP:]
+        return self.count >= self.limit
+
+
+def _read_body(response: requests.Response, max_bytes: int, content_types, stop_after_containers: int):
+    """
+    Lit le corps par blocs, sans dépasser max_bytes en mémoire, en vérifiant le budget.
+    La lecture s'arrête (corps tronqué, response.truncated renseigné) à max_bytes ou,
+    si stop_after_containers > 0, dès que ce nombre de conteneurs d'articles a été vu (au bloc près).
+
+    Le délai de lecture de requests s'applique à chaque recv : un site qui distille
+    ses octets n'est arrêté que par le chien de garde, qui coupe la connexion à l'échéance.
+    """
+    remaining = deadline.remaining()
+    watchdog = None
+    if remaining is not None:
+        watchdog = threading.Timer(max(remaining, 0), _abort_download, (response,))
+        watchdog.daemon = True
+        watchdog.start()
+    counter = _ContainerCounter(stop_after_containers) if stop_after_containers > 0 else None
+    response.truncated = None
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if not chunks:
+                _check_binary(response, chunk, content_types)
+            if max_bytes and size + len(chunk) > max_bytes:
+                chunks.append(chunk[:max_bytes - size])
+                response.truncated = 'max_bytes'
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if counter is not None and counter.feed(chunk):
+                response.truncated = 'enough_containers'
+                break
+            deadline.check('download')
+    except requests.exceptions.RequestException:
+        # Connexion coupée par le chien de garde : signaler le dépassement de budget
+        deadline.check('download')
+        raise
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        # Une connexion lue partiellement est fermée plutôt que rendue au pool
+        response.close()
+    response._content = b"".join(chunks)
+    if response.truncated:
+        logger.info(f"Téléchargement de {response.url} arrêté ({response.truncated}) après {len(response._content)} octets")
+
+
+def get(url: str, max_bytes: int = None, content_types=HTML_CONTENT_TYPES, stop_after_containers: int = 0,
+        **kwargs) -> requests.Response:
+    """
+    Requête GET via le pool de connexions partagé (durée et erreurs mesurées par hôte).
+    Sans timeout explicite, le délai est tiré du budget de la requête API en cours.
+    response.encoding est renseigné par charset.sniff (voir utils/charset.py).
+
+    Args:
+        url: URL à télécharger
+        max_bytes: Taille maximale du corps conservé (HTTP_MAX_BYTES par défaut, 0 = illimité)
+        content_types: Préfixes de Content-Type acceptés (None = tous) ; vérifiés avant la lecture du corps
+        stop_after_containers: Arrêter la lecture après ce nombre de conteneurs d'articles (0 = jamais)
+
+    Raises:
+        UnsupportedContentType: Type de contenu refusé, avant toute lecture du corps
+    """
+    host = urlparse(url).netloc
+    start = time.perf_counter()
+    try:
+        with metrics.stage('download'):
+            tracing.set_attributes(**{"http.method": "GET", "http.url": url, "net.peer.name": host})
+            deadline.check('download')
+            kwargs.setdefault('timeout', deadline.timeout())
+            response = session.get(url, stream=True, **kwargs)
+            tracing.set_attributes(**{"http.status_code": response.status_code})
+            try:
+                _check_content_type(response, content_types if response.ok else None)
+            except UnsupportedContentType:
+                response.close()
+                raise
+            _read_body(response, HTTP_MAX_BYTES if max_bytes is None else max_bytes, content_types, stop_after_containers)
+            # Encodage déterminé sur les premiers octets : response.text n'analyse pas tout le corps
+            response.encoding, charset_source = charset.sniff(response.content, response.headers.get('Content-Type'), host)
+            tracing.set_attributes(**{
+                "http.response_content_length": len(response.content),
+                "http.truncated": response.truncated,
+                "http.charset": response.encoding,
+                "http.charset_source": charset_source,
+            })
+    except requests.exceptions.RequestException as e:
+        metrics.observe_upstream(host, time.perf_counter() - start, type(e).__name__)
+        # Délai tiré du budget de la requête : s'il a expiré parce que le budget est épuisé,
+        # c'est un dépassement de budget (504) et non une erreur du site (requests signale
+        # une lecture du corps trop lente par une ConnectionError)
+        if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)) and not isinstance(e, deadline.DeadlineExceeded):
+            exceeded = deadline.expired('download')
+            if exceeded is not None:
+                raise exceeded from e
+        raise
+    error = f"http_{response.status_code}" if response.status_code >= 400 else None
+    metrics.observe_upstream(host, time.perf_counter() - start, error)
+    return response
+
+
+def _find_icons(url: str, html: str = None):
+    if html is None:
+        return favicon.get(url, timeout=deadline.timeout())
+    # Icônes déclarées dans la page déjà téléchargée, plus /favicon.ico s'il existe
+    icons = list(favicon_tags(url, html))
+    response = session.head(urljoin(url, 'favicon.ico'), headers=FAVICON_HEADERS, allow_redirects=True, timeout=deadline.timeout())
+    if response.status_code == 200:
+        icons.append(Icon(response.url, 0, 0, 'ico'))
+    return sorted(icons, key=lambda i: i.width + i.height, reverse=True)
+
+
+def get_favicon_url(url: str, html: str = None):
+    """
+    Retourne l'URL du favicon d'un site, mise en cache par origine.
+
+    Args:
+        url: URL de la page
+        html: HTML de la page s'il a déjà été téléchargé (évite un second GET)
+
+    Returns:
+        str: URL du favicon, ou None si aucun n'a été trouvé
+    """
+    parsed = urlparse(url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+
+    with tracing.span('favicon.cache_lookup', origin=origin) as lookup:
+        icon_url = _favicon_cache.get(origin)
+        lookup.set_attribute('cache.hit', icon_url is not MISSING)
+    if icon_url is not MISSING:
+        return icon_url
+
+    # Étape facultative : sautée (sans mise en cache) si le budget restant est trop faible
+    if not deadline.allow_optional('favicon', deadline.FAVICON_MIN_BUDGET):
+        return None
+
+    icon_url = None
+    try:
+        with metrics.stage('favicon'):
+            icons = _find_icons(url, html)
+        if icons:
+            icon_url = icons[0].url
+    except deadline.DeadlineExceeded:
+        # Budget épuisé pendant la recherche : ne pas mettre l'absence de favicon en cache
+        return None
+    except Exception as e:
+        logger.debug(f"Favicon introuvable pour {origin}: {e}")
+
+    _favicon_cache.set(origin, icon_url)
+    return icon_url
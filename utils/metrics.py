@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from utils import deadline, tracing
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Nombre maximum d'hôtes distincts en label ; les suivants sont regroupés sous "other"
+METRICS_MAX_HOSTS = int(os.getenv('METRICS_MAX_HOSTS', '200'))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+STAGE_SECONDS = Histogram(
+    'kairos_pipeline_stage_seconds',
+    "Durée des étapes du pipeline de scraping (connect, download, parse, extract, main_image, favicon, serialize...)",
+    ['stage'],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_SECONDS = Histogram(
+    'kairos_upstream_request_seconds',
+    "Durée des requêtes HTTP vers les sites scrapés, par hôte",
+    ['host'],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    'kairos_upstream_errors_total',
+    "Erreurs des requêtes HTTP vers les sites scrapés, par hôte et type",
+    ['host', 'error'],
+)
+REQUEST_SECONDS = Histogram(
+    'kairos_http_request_seconds',
+    "Durée des requêtes traitées par l'API",
+    ['route', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'kairos_http_response_size_bytes',
+    "Taille des réponses de l'API",
+    ['route'],
+    buckets=SIZE_BUCKETS,
+)
+ARTICLES_EXTRACTED = Histogram(
+    'kairos_articles_extracted',
+    "Nombre d'articles par extraction",
+    ['extractor'],
+    buckets=COUNT_BUCKETS,
+)
+ADMISSION_REQUESTS = Counter(
+    'kairos_admission_requests_total',
+    "Requêtes de scrape par décision d'admission (admitted, cached, rejected)",
+    ['outcome'],
+)
+PAGE_CHANGES = Counter(
+    'kairos_page_changes_total',
+    "Crawls de pages par résultat de la comparaison d'empreinte (new, changed, unchanged)",
+    ['status'],
+)
+SEARCH_MODES = Counter(
+    'kairos_search_mode_total',
+    "Recherches par moteur et mode utilisé (rss, html, html_fallback)",
+    ['engine', 'mode'],
+)
+ADMISSION_STATE = Gauge(
+    'kairos_admission_scrapes',
+    "Scrapes en cours et en file d'attente",
+    ['state'],
+)
+
+_known_hosts = set()
+_hosts_lock = threading.Lock()
+
+
+def host_label(host: str) -> str:
+    """Borne la cardinalité du label host (les URLs scrapées sont fournies par les clients)"""
+    if host in _known_hosts:
+        return host
+    with _hosts_lock:
+        if len(_known_hosts) < METRICS_MAX_HOSTS:
+            _known_hosts.add(host)
+            return host
+    return "other"
+
+
+@contextmanager
+def stage(name: str):
+    """Mesure la durée d'une étape du pipeline (et l'enregistre comme span de la trace courante)"""
+    start = time.perf_counter()
+    try:
+        with tracing.span(name):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(name).observe(elapsed)
+        # Répartition par étape, journalisée si la requête dépasse son budget
+        deadline.record(name, elapsed)
+
+
+def observe_stage(name: str, seconds: float):
+    STAGE_SECONDS.labels(name).observe(seconds)
+
+
+def observe_upstream(host: str, seconds: float, error: str = None):
+    label = host_label(host)
+    UPSTREAM_SECONDS.labels(label).observe(seconds)
+    if error:
+        UPSTREAM_ERRORS.labels(label, error).inc()
+
+
+def observe_articles(extractor: str, count: int):
+    ARTICLES_EXTRACTED.labels(extractor).observe(count)
+
+
+def observe_page_change(status: str):
+    PAGE_CHANGES.labels(status).inc()
+
+
+def observe_search_mode(engine: str, mode: str):
+    SEARCH_MODES.labels(engine, mode).inc()
+
+
+def observe_admission(outcome: str):
+    ADMISSION_REQUESTS.labels(outcome).inc()
+
+
+def set_admission_state(active: int, queued: int):
+    ADMISSION_STATE.labels('active').set(active)
+    ADMISSION_STATE.labels('queued').set(queued)
+
+
+class DatabasePoolCollector:
+    """Expose l'état du pool de connexions SQLAlchemy au moment de la collecte"""
+
+    def collect(self):
+        from utils.database import engine
+
+        pool = engine.pool
+        gauge = GaugeMetricFamily('kairos_db_pool_connections', "Connexions du pool de base de données", labels=['state'])
+        for state in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, state, None)
+            if method is not None:
+                gauge.add_metric([state], method())
+        yield gauge
+
+
+REGISTRY.register(DatabasePoolCollector())
+
+
+def render_metrics():
+    """Retourne (contenu, type MIME) pour le endpoint /metrics"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : durée et taille des réponses par route (gabarit de chemin, pas l'URL brute)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.labels(route_path, scope["method"], str(status)).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(route_path).observe(size)
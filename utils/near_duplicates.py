@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models.article_model import ArticleEntity
+from models.article_simhash_model import ArticleSimhashEntity
+from models.feed_model import FeedEntity
+from utils import simhash
+
+logger = logging.getLogger(__name__)
+
+# Articles lus par lot lors du remplissage initial de l'index
+BACKFILL_BATCH_SIZE = 1000
+# Bande fictive des articles trop courts pour une empreinte : une ligne les marque comme traités
+# (le remplissage ne les relit pas) sans jamais être candidate d'une recherche
+UNINDEXED_BAND = -1
+
+
+def _band_rows(article_id: int, feed_id: int, value: Optional[int]) -> List[dict]:
+    if value is None:
+        return [{"band": UNINDEXED_BAND, "band_value": 0, "article_id": article_id, "feed_id": feed_id, "simhash": 0}]
+    signed = simhash.to_signed(value)
+    return [
+        {"band": band, "band_value": simhash.to_signed(band_value), "article_id": article_id, "feed_id": feed_id, "simhash": signed}
+        for band, band_value in simhash.bands(value)
+    ]
+
+
+def add_articles_to_simhash_index(db: Session, articles: Iterable[ArticleEntity]):
+    """
+    Ajoute des articles fraîchement insérés à l'index article_simhash_bands, dans la
+    même transaction que l'insertion des articles (ils doivent avoir un id).
+    Les articles trop courts pour une empreinte fiable sont seulement marqués (UNINDEXED_BAND).
+    """
+    rows = []
+    for article in articles:
+        value = simhash.article_simhash(article.title, article.description)
+        rows.extend(_band_rows(article.id, article.feed_id, value))
+    if rows:
+        db.execute(insert(ArticleSimhashEntity), rows)
+
+
+def backfill_simhash_index(db: Session) -> int:
+    """
+    Indexe les articles existants absents de article_simhash_bands (articles
+    enregistrés avant l'existence de la table). L'empreinte est calculée en Python :
+    les articles sont lus et insérés par lots. Les articles trop courts sont marqués
+    (UNINDEXED_BAND) : une nouvelle exécution ne les relit pas.
+
+    Returns:
+        int: Nombre d'articles indexés
+    """
+    count = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(ArticleEntity.id, ArticleEntity.feed_id, ArticleEntity.title, ArticleEntity.description)
+            .where(ArticleEntity.id > last_id)
+            .where(~exists().where(ArticleSimhashEntity.article_id == ArticleEntity.id))
+            .order_by(ArticleEntity.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        before = count
+        rows = []
+        for article in batch:
+            value = simhash.article_simhash(article.title, article.description)
+            rows.extend(_band_rows(article.id, article.feed_id, value))
+            if value is not None:
+                count += 1
+        db.execute(insert(ArticleSimhashEntity), rows)
+        db.commit()
+        logger.debug(f"Index SimHash : {count - before} articles indexés jusqu'à l'id {last_id}")
+    return count
+
+
+def simhash_index_is_stale(db: Session) -> bool:
+    """
+    Indique si l'index a été construit avec un autre découpage en bandes
+    (NEAR_DUPLICATE_MAX_DISTANCE modifié depuis) ou un autre calcul d'empreinte
+    (utils/simhash.features modifié) : ses lignes ne correspondent plus aux
+    bandes recherchées et il doit être reconstruit. Le calcul est vérifié sur le
+    dernier article indexé.
+    """
+    last_band = db.execute(select(func.max(ArticleSimhashEntity.band)).where(ArticleSimhashEntity.band != UNINDEXED_BAND)).scalar()
+    if last_band is None:
+        return False
+    if last_band != simhash.BANDS - 1:
+        return True
+    last = db.execute(
+        select(ArticleSimhashEntity.simhash, ArticleEntity.title, ArticleEntity.description)
+        .join(ArticleEntity, ArticleEntity.id == ArticleSimhashEntity.article_id)
+        .where(ArticleSimhashEntity.band == 0)
+        .order_by(ArticleSimhashEntity.article_id.desc())
+        .limit(1)
+    ).first()
+    return last is not None and simhash.from_signed(last.simhash) != simhash.article_simhash(last.title, last.description)
+
+
+def find_stored_duplicates(db: Session, value: int, user_id: Optional[int] = None,
+                           exclude_article_id: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Articles enregistrés proches d'une empreinte : seuls les candidats partageant
+    une bande sont lus (recherche par la clé primaire), puis filtrés sur la distance.
+
+    Args:
+        db: Session de base de données
+        value: Empreinte SimHash (non signée)
+        user_id: Restreindre aux flux de cet utilisateur
+        exclude_article_id: Article à ne pas inclure (l'article recherché lui-même)
+
+    Returns:
+        List: (article_id, distance) triés par distance croissante
+    """
+    query = select(ArticleSimhashEntity.article_id, ArticleSimhashEntity.simhash).where(or_(*[
+        and_(ArticleSimhashEntity.band == band, ArticleSimhashEntity.band_value == simhash.to_signed(band_value))
+        for band, band_value in simhash.bands(value)
+    ]))
+    if user_id is not None:
+        query = query.join(FeedEntity, FeedEntity.id == ArticleSimhashEntity.feed_id).where(FeedEntity.user_id == user_id)
+    if exclude_article_id is not None:
+        query = query.where(ArticleSimhashEntity.article_id != exclude_article_id)
+
+    matches = {}
+    for article_id, stored in db.execute(query.distinct()):
+        d = simhash.distance(value, simhash.from_signed(stored))
+        if d <= simhash.NEAR_DUPLICATE_MAX_DISTANCE:
+            matches[article_id] = d
+    return sorted(matches.items(), key=lambda item: (item[1], item[0]))
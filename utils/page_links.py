@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import re
+from typing import List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+# Détection de la page suivante d'une liste d'articles paginée (archives, catégories, blogs)
+
+# Textes d'un lien « page suivante », en minuscules, flèches et espaces retirés
+NEXT_TEXTS = frozenset({
+    "suivant", "suivante", "suivants", "page suivante", "articles suivants", "plus d'articles",
+    "articles plus anciens", "plus anciens", "billets plus anciens",
+    "next", "next page", "more articles", "older", "older posts", "older entries", "older articles",
+    "下一页", "下页", "后页",
+})
+# Classes (ou id) des blocs de pagination, où un lien réduit à une flèche désigne la page suivante
+PAGINATION_CLASSES = ("pagination", "pager", "page-numbers", "nav-links", "paginate", "navigation")
+# Flèches d'un lien « suivant » sans texte ; « » » seul est aussi l'« aller à la dernière page » de certains sites
+ARROWS = "›»→>"
+_ARROW_ONLY = re.compile(rf"[{ARROWS}]")
+_STRIP_ARROWS = re.compile(rf"[\s{ARROWS}]+")
+
+# Numéro de page dans l'URL : paramètre (?page=2, &paged=2, ?p=2) ou chemin (/page/2, /page-2, /seite/2)
+_PAGE_NUMBER = [
+    re.compile(r"([?&](?:page|paged|pg|p|pn|pagina)=)(\d{1,4})(?=&|$)", re.IGNORECASE),
+    re.compile(r"(/(?:page|pages|seite|pagina)[/-]?)(\d{1,4})(?=[/?]|$)", re.IGNORECASE),
+]
+
+
+def _text(element) -> str:
+    return _STRIP_ARROWS.sub(" ", element.get_text(" ", strip=True)).strip().lower()
+
+
+def _has_next_marker(value) -> bool:
+    # Attribut class (liste) ou aria-label / title (chaîne) contenant « next » ou « suivant »
+    if not value:
+        return False
+    text = " ".join(value) if isinstance(value, list) else value
+    text = text.lower()
+    return "next" in text or "suivant" in text
+
+
+def _in_pagination(element) -> bool:
+    for parent in element.parents:
+        if parent.name in ("body", "html", "[document]"):
+            return False
+        marker = " ".join(parent.get("class") or ()) + " " + (parent.get("id") or "")
+        marker = marker.lower()
+        if any(name in marker for name in PAGINATION_CLASSES):
+            return True
+    return False
+
+
+def _page_url(url: str, href: Optional[str]) -> Optional[str]:
+    # Lien absolu sans fragment, sur le même site, différent de la page courante
+    if not href or href.startswith(("#", "javascript:", "mailto:")):
+        return None
+    target = urldefrag(urljoin(url, href.strip()))[0]
+    parsed = urlparse(target)
+    if parsed.scheme not in ("http", "https") or parsed.netloc != urlparse(url).netloc:
+        return None
+    if target == urldefrag(url)[0]:
+        return None
+    return target
+
+
+def next_pages(soup: BeautifulSoup, url: str) -> List[str]:
+    """
+    Liens vers la page suivante d'une liste paginée, du plus sûr au moins sûr :
+    <link rel="next"> ou <a rel="next">, lien dont la classe, aria-label ou title
+    annonce la suite, lien dont le texte est « page suivante » (NEXT_TEXTS), puis lien
+    réduit à une flèche dans un bloc de pagination.
+
+    Args:
+        soup: Page déjà parsée (entière : la pagination est souvent en bas de page)
+        url: URL de la page, pour résoudre les liens relatifs
+
+    Returns:
+        List: URLs absolues distinctes, sur le même hôte que url
+    """
+    ranked = ([], [], [], [])
+    for element in soup.find_all(["link", "a"], href=True):
+        rel = element.get("rel") or ()
+        if "next" in rel:
+            rank = 0
+        elif element.name != "a":
+            continue
+        elif any(_has_next_marker(element.get(attribute)) for attribute in ("class", "aria-label", "title")):
+            rank = 1
+        else:
+            text = _text(element)
+            if text in NEXT_TEXTS:
+                rank = 2
+            elif not text and _ARROW_ONLY.search(element.get_text()) and _in_pagination(element):
+                rank = 3
+            else:
+                continue
+        target = _page_url(url, element["href"])
+        if target is not None:
+            ranked[rank].append(target)
+    return list(dict.fromkeys(target for group in ranked for target in group))
+
+
+def page_series(url: str, next_url: str, count: int) -> List[str]:
+    """
+    URLs des count pages à partir de next_url quand la pagination est numérotée
+    (next_url porte le numéro de la page courante + 1) : elles peuvent alors être
+    téléchargées simultanément au lieu de suivre les liens de page en page.
+
+    Returns:
+        List: [next_url, page suivante, ...], ou [next_url] si la numérotation n'est pas reconnue
+    """
+    for pattern in _PAGE_NUMBER:
+        match = pattern.search(next_url)
+        if not match:
+            continue
+        number = int(match.group(2))
+        current = pattern.search(url)
+        # Page courante sans numéro : c'est la page 1, la suivante doit être la 2
+        expected = int(current.group(2)) + 1 if current else 2
+        if number != expected:
+            break
+        start, end = match.span(2)
+        return [f"{next_url[:start]}{number + offset}{next_url[end:]}" for offset in range(count)]
+    return [next_url]
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+# Curseur de pagination : position (date de publication, id) du dernier article renvoyé
+
+
+def encode_cursor(publication_date: datetime, article_id: int) -> str:
+    raw = f"{publication_date.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        publication_date, article_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(publication_date), int(article_id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
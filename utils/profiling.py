@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+import glob
+import hmac
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Jeton autorisant le profilage d'une requête (en-tête X-Profile-Token ou paramètre ?profile=) ; vide = désactivé
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+# Profiler une requête sur N en tâche de fond (0 = désactivé)
+PROFILING_SAMPLE_EVERY = int(os.getenv('PROFILING_SAMPLE_EVERY', '0'))
+# Intervalle d'échantillonnage des piles d'appels
+PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '5'))
+# Répertoire des profils et nombre de profils conservés (les plus anciens sont supprimés)
+PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+PROFILING_MAX_PROFILES = int(os.getenv('PROFILING_MAX_PROFILES', '200'))
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{12}$")
+
+_current: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    """Piles d'appels échantillonnées sur les threads qui traitent une requête"""
+
+    def __init__(self, route: str, query: str, reason: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.route = route
+        self.query = query
+        self.reason = reason
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.stacks = Counter()
+        self.samples = 0
+        self.threads = {}  # thread id -> nombre d'entrées imbriquées
+        self.lock = threading.Lock()
+
+    def add_thread(self, thread_id: int):
+        with self.lock:
+            self.threads[thread_id] = self.threads.get(thread_id, 0) + 1
+
+    def remove_thread(self, thread_id: int):
+        with self.lock:
+            depth = self.threads.get(thread_id, 0) - 1
+            if depth > 0:
+                self.threads[thread_id] = depth
+            else:
+                self.threads.pop(thread_id, None)
+
+    def sample(self, frames):
+        with self.lock:
+            thread_ids = list(self.threads)
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        """Format « collapsed » (une pile par ligne), lisible par flamegraph.pl et speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _collapse(frame) -> str:
+    # Boucle d'événements en attente d'E/S ou du pool de threads : une seule entrée
+    if frame.f_code.co_name == "select" and os.path.basename(frame.f_code.co_filename) == "selectors.py":
+        return "[event loop idle]"
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _Sampler:
+    """Thread d'échantillonnage unique, actif uniquement tant qu'une session est ouverte"""
+
+    def __init__(self):
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def register(self, session: ProfileSession):
+        with self.lock:
+            self.sessions.add(session)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="profiling-sampler", daemon=True)
+                self.thread.start()
+            self.wakeup.set()
+
+    def unregister(self, session: ProfileSession):
+        with self.lock:
+            self.sessions.discard(session)
+
+    def run(self):
+        interval = PROFILING_INTERVAL_MS / 1000
+        while True:
+            with self.lock:
+                sessions = list(self.sessions)
+                if not sessions:
+                    self.wakeup.clear()
+            if not sessions:
+                self.wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            for session in sessions:
+                session.sample(frames)
+            del frames
+            time.sleep(interval)
+
+
+_sampler = _Sampler()
+_request_counter = itertools.count(1)
+
+
+def start_session(route: str, query: str, reason: str) -> ProfileSession:
+    session = ProfileSession(route, query, reason)
+    _sampler.register(session)
+    return session
+
+
+def stop_session(session: ProfileSession, status: int):
+    _sampler.unregister(session)
+    save_profile(session, status)
+
+
+@contextmanager
+def track_thread():
+    """
+    Inclut le thread courant dans le profil de la requête en cours, s'il y en a un.
+    À utiliser dans le code exécuté hors de la boucle d'événements (run_in_threadpool).
+    """
+    session = _current.get()
+    if session is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    session.add_thread(thread_id)
+    try:
+        yield
+    finally:
+        session.remove_thread(thread_id)
+
+
+def save_profile(session: ProfileSession, status: int):
+    """Écrit le profil (.collapsed) et ses métadonnées (.json), puis supprime les plus anciens"""
+    os.makedirs(PROFILING_DIR, exist_ok=True)
+    prefix = os.path.join(PROFILING_DIR, f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(session.started_at))}-{session.id}")
+    with open(f"{prefix}.collapsed", "w", encoding="utf-8") as f:
+        f.write(session.collapsed())
+    with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "id": session.id,
+            "route": session.route,
+            "query": session.query,
+            "reason": session.reason,
+            "status": status,
+            "started_at": session.started_at,
+            "duration_ms": round((time.perf_counter() - session.start) * 1000, 1),
+            "samples": session.samples,
+            "interval_ms": PROFILING_INTERVAL_MS,
+        }, f)
+
+    profiles = sorted(glob.glob(os.path.join(PROFILING_DIR, "*.collapsed")))
+    for old in profiles[:max(0, len(profiles) - PROFILING_MAX_PROFILES)]:
+        for path in (old, old[:-len(".collapsed")] + ".json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles():
+    """Métadonnées des profils conservés, du plus récent au plus ancien"""
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(PROFILING_DIR, "*.json")), reverse=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def read_profile(profile_id: str) -> Optional[str]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    paths = glob.glob(os.path.join(PROFILING_DIR, f"*-{profile_id}.collapsed"))
+    if not paths:
+        return None
+    with open(paths[0], encoding="utf-8") as f:
+        return f.read()
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    # compare_digest refuse les str non ASCII : comparer les octets
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token.encode(), PROFILING_TOKEN.encode())
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI : profile les requêtes portant le jeton de profilage et, si
+    PROFILING_SAMPLE_EVERY > 0, une requête sur N. L'identifiant du profil est
+    renvoyé dans l'en-tête X-Profile-Id.
+
+    Le thread de la boucle d'événements est échantillonné pendant toute la
+    requête : sous charge, il peut contenir des piles d'autres requêtes. Les
+    threads du pool n'y figurent que dans les sections track_thread().
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def trigger(self, scope) -> Optional[str]:
+        if PROFILING_TOKEN:
+            token = dict(scope["headers"]).get(PROFILE_HEADER)
+            if token is not None and is_authorized(token.decode("latin-1")):
+                return "header"
+            for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+                if key == PROFILE_QUERY_PARAM and is_authorized(value):
+                    return "query"
+        if PROFILING_SAMPLE_EVERY > 0 and next(_request_counter) % PROFILING_SAMPLE_EVERY == 0:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.trigger(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Ne jamais enregistrer le jeton avec le profil
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+            if key != PROFILE_QUERY_PARAM
+        ])
+        session = start_session(scope["path"], query, reason)
+        context_token = _current.set(session)
+        thread_id = threading.get_ident()
+        session.add_thread(thread_id)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", session.id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.remove_thread(thread_id)
+            _current.reset(context_token)
+            # Écriture du profil sur disque hors de la boucle d'événements
+            await run_in_threadpool(stop_session, session, status)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from utils import metrics
+
+# Options orjson communes à toutes les réponses de l'API
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any):
+    """Types non gérés nativement par orjson"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type {type(obj).__name__} non sérialisable en JSON")
+
+
+def dumps(content: Any) -> bytes:
+    """Sérialise en JSON (UTF-8) ; les datetime sont encodées nativement en ISO 8601"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Réponse JSON sérialisée avec orjson, utilisée par toutes les routes"""
+
+    def render(self, content: Any) -> bytes:
+        with metrics.stage('serialize'):
+            return dumps(content)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import html
+import io
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from utils import dates
+
+# Types de contenu acceptés pour les flux RSS des moteurs de recherche
+FEED_CONTENT_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/xml', 'text/xml')
+
+_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class FeedChannel(NamedTuple):
+    title: str
+    description: str
+    image: Optional[str]
+
+
+class FeedItem(NamedTuple):
+    title: str
+    link: Optional[str]
+    description: str
+    publication_date: Optional[datetime]
+
+
+def _text(element, tag: str) -> str:
+    child = element.find(tag)
+    return (child.text or "").strip() if child is not None else ""
+
+
+def _plain(value: str) -> str:
+    """Texte d'une description HTML (Google News y met des liens et des balises font)"""
+    if "<" in value:
+        value = _TAG.sub(" ", value)
+    return _WHITESPACE.sub(" ", html.unescape(value)).strip()
+
+
+def _date(value: str) -> Optional[datetime]:
+    """Date RFC 822 du flux (ou ISO 8601 des flux mal formés), en heure locale sans fuseau comme les autres extracteurs"""
+    return dates.parse_date(value)
+
+
+def parse_feed(content: bytes, max_items: int) -> Tuple[FeedChannel, List[FeedItem]]:
+    """
+    Lit un flux RSS 2.0 au fil de l'eau (iterparse) : chaque <item> est converti puis
+    libéré, et la lecture s'arrête après max_items éléments. Entités externes et
+    accès réseau sont désactivés.
+
+    Returns:
+        Tuple: (informations du canal, éléments)
+    """
+    channel = FeedChannel("", "", None)
+    items = []
+    if max_items <= 0:
+        return channel, items
+    parser = etree.iterparse(
+        io.BytesIO(content), events=("end",), tag="item",
+        resolve_entities=False, no_network=True, recover=True,
+    )
+    for _, element in parser:
+        if not items:
+            # Les informations du canal précèdent les éléments
+            parent = element.getparent()
+            if parent is not None:
+                image = parent.find("image/url")
+                channel = FeedChannel(
+                    _text(parent, "title"),
+                    _plain(_text(parent, "description")),
+                    (image.text or "").strip() or None if image is not None else None,
+                )
+        items.append(FeedItem(
+            _plain(_text(element, "title")),
+            _text(element, "link") or None,
+            _plain(_text(element, "description")),
+            _date(_text(element, "pubDate")),
+        ))
+        # Libérer l'élément et ceux qui le précèdent
+        element.clear()
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+        if len(items) >= max_items:
+            break
+    return channel, items
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement
+load_dotenv()
+
+# Distance de Hamming maximale (sur 64 bits) entre deux articles considérés comme doublons
+# (mesurée par benchmarks/bench_near_duplicates.py : une même dépêche reprise par plusieurs
+# moteurs est le plus souvent à moins de 8, deux dépêches différentes à plus de 13)
+NEAR_DUPLICATE_MAX_DISTANCE = int(os.getenv('NEAR_DUPLICATE_MAX_DISTANCE', '7'))
+# En dessous de ce nombre de mots, l'empreinte n'est pas assez fiable : pas de détection
+NEAR_DUPLICATE_MIN_FEATURES = int(os.getenv('NEAR_DUPLICATE_MIN_FEATURES', '4'))
+
+BITS = 64
+# Découpage en max_distance + 1 bandes : deux empreintes à distance <= max_distance
+# ont au moins une bande identique (principe des tiroirs)
+BANDS = NEAR_DUPLICATE_MAX_DISTANCE + 1
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+_CJK = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+# Le titre pèse TITLE_WEIGHT fois plus que la description, quelle que soit la longueur
+# de celle-ci (extrait plus ou moins long selon le moteur)
+TITLE_WEIGHT = 3
+# Un titre de moins de TITLE_TOKENS mots pèse moins, en proportion : un titre d'un mot
+# (« Santé ») ne détermine pas à lui seul l'empreinte
+TITLE_TOKENS = 8
+# Éditeur ajouté en fin de titre par les moteurs : « - Reuters », « | Le Monde »
+_PUBLISHER = re.compile(r"\s+[-|–—]\s+[^-|–—:;,?!«»\"]{1,40}$")
+# Points de suspension d'un extrait tronqué, avec le mot latin éventuellement coupé qui les précède
+_ELLIPSIS = re.compile(r"[^\W\u3040-\u9fff]*\s*(?:…+|\.{3,})\s*$")
+
+
+# Chaque bit de l'empreinte d'un mot occupe une tranche de LANE bits d'un grand entier :
+# additionner ces entiers compte, en une seule addition, les bits à 1 de chaque colonne
+# (compteurs de 32 bits, lus d'un bloc comme un tableau d'entiers non signés)
+LANE = 32
+
+
+@lru_cache(maxsize=65536)
+def _token_lanes(token: str) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=BITS // 8).digest()
+    value = int.from_bytes(digest, "big")
+    lanes = 0
+    for bit in range(BITS):
+        if value >> bit & 1:
+            lanes |= 1 << (bit * LANE)
+    return lanes
+
+
+def _tokens(text: str) -> List[str]:
+    """Mots en minuscules ; le chinois, le japonais et le coréen (sans espaces) en bigrammes de caractères"""
+    tokens = []
+    for word in _WORD.findall(_TAG.sub(" ", text).lower()):
+        if _CJK.search(word) and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _clean_title(title: str) -> str:
+    title = _ELLIPSIS.sub("", title.strip())
+    match = _PUBLISHER.search(title)
+    # Un titre court (« Nadal - Djokovic ») n'a pas d'éditeur en suffixe
+    if match and len(match.group(0).split()) <= 5 and len(_tokens(title[:match.start()])) >= 3:
+        title = title[:match.start()]
+    return title
+
+
+def features(title: str, description: str = "") -> Counter:
+    """
+    Mots pondérés d'un article, sans l'éditeur en suffixe du titre ni les points de
+    suspension des extraits. Le titre et la description ont chacun un poids total fixe
+    (TITLE_WEIGHT pour 1, moins pour un titre de moins de TITLE_TOKENS mots) : un extrait
+    plus court ne déplace pas l'empreinte vers le titre.
+    """
+    title_tokens = _tokens(_clean_title(title or ""))
+    description_tokens = _tokens(_ELLIPSIS.sub("", _TAG.sub(" ", description or "").strip()))
+    # Poids entiers : chaque mot du titre vaut TITLE_WEIGHT × (mots de la description), chaque
+    # mot de la description vaut max(mots du titre, TITLE_TOKENS)
+    title_weight = TITLE_WEIGHT * len(description_tokens) or 1
+    description_weight = max(len(title_tokens), TITLE_TOKENS)
+    counts = Counter()
+    for token in title_tokens:
+        counts[token] += title_weight
+    for token in description_tokens:
+        counts[token] += description_weight
+    return counts
+
+
+def simhash(counts: Counter) -> int:
+    """Empreinte SimHash 64 bits de caractéristiques pondérées"""
+    total = 0
+    lanes = 0
+    for token, weight in counts.items():
+        lanes += _token_lanes(token) * weight
+        total += weight
+    columns = array("I", lanes.to_bytes(BITS * LANE // 8, "little"))
+    if sys.byteorder == "big":
+        columns.byteswap()
+    # Bit à 1 si la majorité (pondérée) des mots ont ce bit à 1 ; colonne 0 = bit de poids faible
+    half = total // 2
+    return int("".join(["1" if count > half else "0" for count in reversed(columns)]), 2)
+
+
+def article_simhash(title: str, description: str = ""):
+    """Empreinte d'un article (titre et description), ou None si le texte est trop court"""
+    counts = features(title, description)
+    if len(counts) < NEAR_DUPLICATE_MIN_FEATURES:
+        return None
+    return simhash(counts)
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def bands(value: int, band_count: int = BANDS) -> List[Tuple[int, int]]:
+    """(numéro de bande, valeur) des band_count tranches de l'empreinte"""
+    width = BITS // band_count
+    result = []
+    for band in range(band_count):
+        # La dernière bande prend les bits restants
+        size = width if band < band_count - 1 else BITS - width * (band_count - 1)
+        shift = BITS - width * band - size
+        result.append((band, (value >> shift) & ((1 << size) - 1)))
+    return result
+
+
+def to_signed(value: int) -> int:
+    """Empreinte 64 bits non signée -> BIGINT signé (stockage en base)"""
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def from_signed(value: int) -> int:
+    return value + (1 << BITS) if value < 0 else value
+
+
+class SimHashIndex:
+    """
+    Table de bandes (LSH) en mémoire : la recherche des empreintes proches ne
+    compare que les candidats partageant une bande, pas toutes les empreintes.
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.band_count = max_distance + 1
+        self.tables: Dict[Tuple[int, int], List] = defaultdict(list)
+        self.values = {}
+
+    def add(self, key, value: int):
+        self.values[key] = value
+        for band in bands(value, self.band_count):
+            self.tables[band].append(key)
+
+    def query(self, value: int) -> List[Tuple[object, int]]:
+        """Clés des empreintes à distance <= max_distance, avec leur distance"""
+        seen = set()
+        matches = []
+        for band in bands(value, self.band_count):
+            for key in self.tables.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                d = distance(value, self.values[key])
+                if d <= self.max_distance:
+                    matches.append((key, d))
+        return matches
+
+
+def dedupe(articles: Iterable, max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE) -> list:
+    """
+    Retire les quasi-doublons (même dépêche reprise par plusieurs sources, titre
+    légèrement modifié...) en gardant la première occurrence de chaque groupe.
+    """
+    index = SimHashIndex(max_distance)
+    kept = []
+    for article in articles:
+        value = article_simhash(article.title, article.description)
+        if value is not None:
+            if index.query(value):
+                continue
+            index.add(len(kept), value)
+        kept.append(article)
+    return kept
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import orjson
+from dotenv import load_dotenv
+
+from utils import tracing
+
+# Charger les variables d'environnement
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Conserver chaque page téléchargée (compressée en zstd, dédupliquée par contenu) pour la rejouer
+SNAPSHOT_ENABLED = os.getenv('SNAPSHOT_ENABLED', 'true').lower() == 'true'
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+SNAPSHOT_COMPRESSION_LEVEL = int(os.getenv('SNAPSHOT_COMPRESSION_LEVEL', '6'))
+# Rétention : âge maximal, nombre de captures par URL et taille totale des contenus compressés
+SNAPSHOT_RETENTION_DAYS = float(os.getenv('SNAPSHOT_RETENTION_DAYS', '30'))
+SNAPSHOT_MAX_PER_URL = int(os.getenv('SNAPSHOT_MAX_PER_URL', '20'))
+SNAPSHOT_MAX_BYTES = int(os.getenv('SNAPSHOT_MAX_BYTES', str(2 * 1024 ** 3)))
+# Captures en attente d'écriture (au-delà elles sont abandonnées) et fréquence de la purge
+SNAPSHOT_QUEUE_SIZE = int(os.getenv('SNAPSHOT_QUEUE_SIZE', '256'))
+SNAPSHOT_PRUNE_EVERY = int(os.getenv('SNAPSHOT_PRUNE_EVERY', '200'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES blobs(hash),
+    status INTEGER,
+    content_type TEXT,
+    encoding TEXT,
+    truncated TEXT,
+    max_results INTEGER,
+    extraction BLOB
+);
+CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots(url, fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_fetched_at ON snapshots(fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_hash ON snapshots(content_hash);
+"""
+
+
+def summarize(articles) -> List[Tuple[str, Optional[str]]]:
+    """Résumé d'une extraction conservé avec la capture : (titre, lien) de chaque article"""
+    return [(article.title, article.url) for article in articles]
+
+
+class SnapshotStore:
+    """
+    Captures de pages adressées par contenu :
+    - blobs/<2 premiers caractères>/<sha256>.zst : corps compressé, stocké une seule fois ;
+    - index.sqlite3 : une ligne par téléchargement (URL, date, extracteur, résumé de l'extraction).
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.sqlite3")
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, "blobs", content_hash[:2], f"{content_hash}.zst")
+
+    def write(self, conn: sqlite3.Connection, capture: dict):
+        content = capture.pop("content")
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(content_hash)
+        if not conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone():
+            compressed = zstandard.ZstdCompressor(level=SNAPSHOT_COMPRESSION_LEVEL).compress(content)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            conn.execute("INSERT OR IGNORE INTO blobs (hash, size, compressed_size) VALUES (?, ?, ?)",
+                         (content_hash, len(content), len(compressed)))
+        conn.execute(
+            "INSERT INTO snapshots (url, kind, fetched_at, content_hash, status, content_type, encoding, truncated, max_results, extraction) "
+            "VALUES (:url, :kind, :fetched_at, :content_hash, :status, :content_type, :encoding, :truncated, :max_results, :extraction)",
+            {**capture, "content_hash": content_hash, "extraction": orjson.dumps(capture["extraction"])},
+        )
+        conn.commit()
+
+    def prune(self, conn: sqlite3.Connection, now: float = None) -> int:
+        """Applique la rétention (âge, captures par URL, taille totale) ; retourne le nombre de captures supprimées"""
+        now = time.time() if now is None else now
+        deleted = conn.execute("DELETE FROM snapshots WHERE fetched_at < ?",
+                               (now - SNAPSHOT_RETENTION_DAYS * 86400,)).rowcount
+        deleted += conn.execute(
+            "DELETE FROM snapshots WHERE id IN (SELECT id FROM ("
+            " SELECT id, ROW_NUMBER() OVER (PARTITION BY url ORDER BY fetched_at DESC) AS rank FROM snapshots"
+            ") WHERE rank > ?)",
+            (SNAPSHOT_MAX_PER_URL,),
+        ).rowcount
+        deleted_blobs = self._delete_orphan_blobs(conn)
+
+        # Taille totale : supprimer les captures les plus anciennes par lots
+        while (conn.execute("SELECT COALESCE(SUM(compressed_size), 0) FROM blobs").fetchone()[0] > SNAPSHOT_MAX_BYTES
+               and conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone()):
+            deleted += conn.execute(
+                "DELETE FROM snapshots WHERE id IN (SELECT id FROM snapshots ORDER BY fetched_at LIMIT 100)"
+            ).rowcount
+            deleted_blobs += self._delete_orphan_blobs(conn)
+        conn.commit()
+        if deleted:
+            logger.info(f"Captures purgées : {deleted} (contenus supprimés : {deleted_blobs})")
+        return deleted
+
+    def _delete_orphan_blobs(self, conn: sqlite3.Connection) -> int:
+        orphans = [row[0] for row in conn.execute(
+            "SELECT hash FROM blobs WHERE hash NOT IN (SELECT content_hash FROM snapshots)"
+        )]
+        for content_hash in orphans:
+            try:
+                os.remove(self.blob_path(content_hash))
+            except FileNotFoundError:
+                pass
+        conn.executemany("DELETE FROM blobs WHERE hash = ?", [(h,) for h in orphans])
+        return len(orphans)
+
+    def read_content(self, content_hash: str) -> bytes:
+        with open(self.blob_path(content_hash), "rb") as f:
+            return zstandard.ZstdDecompressor().decompress(f.read())
+
+    def iter_snapshots(self, conn: sqlite3.Connection, kind: str = None, url_contains: str = None,
+                       latest_only: bool = False, limit: int = None) -> Iterator[dict]:
+        """Métadonnées des captures (sans le contenu), des plus récentes aux plus anciennes"""
+        conditions, params = [], []
+        if kind:
+            conditions.append("kind = ?")
+            params.append(kind)
+        if url_contains:
+            conditions.append("instr(url, ?) > 0")
+            params.append(url_contains)
+        if latest_only:
+            conditions.append("fetched_at = (SELECT MAX(fetched_at) FROM snapshots AS s WHERE s.url = snapshots.url)")
+        query = "SELECT id, url, kind, fetched_at, content_hash, status, content_type, encoding, truncated, max_results, extraction FROM snapshots"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY fetched_at DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        columns = ("id", "url", "kind", "fetched_at", "content_hash", "status", "content_type",
+                   "encoding", "truncated", "max_results", "extraction")
+        for row in conn.execute(query, params):
+            snapshot = dict(zip(columns, row))
+            snapshot["extraction"] = [tuple(item) for item in orjson.loads(snapshot["extraction"])]
+            yield snapshot
+
+
+class _Writer:
+    """Thread d'écriture unique : la compression et l'index ne ralentissent pas les requêtes"""
+
+    def __init__(self, store: SnapshotStore):
+        self.store = store
+        self.queue = queue.Queue(maxsize=SNAPSHOT_QUEUE_SIZE)
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, capture: dict):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name="snapshot-writer", daemon=True)
+                self.thread.start()
+        try:
+            self.queue.put_nowait(capture)
+        except queue.Full:
+            logger.debug(f"File des captures pleine : {capture['url']} non conservée")
+
+    def run(self):
+        conn = self.store.connect()
+        written = 0
+        while True:
+            capture = self.queue.get()
+            try:
+                # Écriture rattachée à la trace de la requête qui a téléchargé la page
+                with tracing.attach_context(capture.pop("trace", None)), tracing.span('snapshot.write', url=capture["url"]):
+                    self.store.write(conn, capture)
+                written += 1
+                # Première écriture, puis toutes les SNAPSHOT_PRUNE_EVERY écritures
+                if written == 1 or written % SNAPSHOT_PRUNE_EVERY == 0:
+                    self.store.prune(conn)
+            except Exception as e:
+                logger.warning(f"Capture de {capture.get('url')} non conservée : {e}")
+            finally:
+                self.queue.task_done()
+
+
+store = SnapshotStore()
+ENABLED = SNAPSHOT_ENABLED and zstandard is not None
+if SNAPSHOT_ENABLED and zstandard is None:
+    logger.warning("SNAPSHOT_ENABLED=true mais zstandard n'est pas installé : captures désactivées")
+_writer = _Writer(store)
+
+
+def record(kind: str, url: str, response, articles, max_results: int = None):
+    """
+    Conserve la page téléchargée (en arrière-plan) avec le résumé de son extraction.
+
+    Args:
+        kind: Extracteur qui a traité la page (site, yahoo, bing, baidu)
+        url: URL passée à l'extracteur (base des liens relatifs)
+        response: Réponse de http_client.get
+        articles: Articles extraits de la page
+        max_results: Limite passée à l'extracteur, pour rejouer l'extraction à l'identique
+    """
+    if not ENABLED or not response.ok:
+        return
+    _writer.submit({
+        "url": url,
+        "kind": kind,
+        "fetched_at": time.time(),
+        "content": response.content,
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type"),
+        "encoding": response.encoding,
+        "truncated": getattr(response, "truncated", None),
+        "max_results": max_results,
+        "extraction": summarize(articles),
+        "trace": tracing.inject_context(),
+    })
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import logging
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from models.article_model import ArticleEntity
+from models.feed_model import FeedEntity
+from models.theme_article_model import ThemeArticleEntity
+
+logger = logging.getLogger(__name__)
+
+
+def add_articles_to_theme_summary(db: Session, feed: FeedEntity, articles: Iterable[ArticleEntity]):
+    """
+    Ajoute des articles fraîchement insérés à la table theme_articles, dans la
+    même transaction que l'insertion des articles (ils doivent avoir un id).
+    """
+    if feed.theme_id is None:
+        return
+    rows = [
+        {
+            "theme_id": feed.theme_id,
+            "sort_date": article.publication_date or article.created_at or datetime.now(),
+            "article_id": article.id,
+            "feed_id": feed.id,
+            "title": article.title,
+            "url": article.url,
+            "description": article.description,
+            "publication_date": article.publication_date,
+        }
+        for article in articles
+    ]
+    if rows:
+        db.execute(insert(ThemeArticleEntity), rows)
+
+
+def backfill_theme_summary(db: Session) -> int:
+    """
+    Remplit theme_articles à partir des articles existants des flux ayant un thème
+    (articles enregistrés avant l'existence de la table).
+
+    Returns:
+        int: Nombre de lignes ajoutées
+    """
+    source = (
+        select(
+            FeedEntity.theme_id,
+            func.coalesce(ArticleEntity.publication_date, ArticleEntity.created_at, func.now()),
+            ArticleEntity.id,
+            ArticleEntity.feed_id,
+            ArticleEntity.title,
+            ArticleEntity.url,
+            ArticleEntity.description,
+            ArticleEntity.publication_date,
+        )
+        .join(FeedEntity, FeedEntity.id == ArticleEntity.feed_id)
+        .where(FeedEntity.theme_id.isnot(None))
+        .where(~exists().where(ThemeArticleEntity.article_id == ArticleEntity.id))
+    )
+    result = db.execute(
+        insert(ThemeArticleEntity).from_select(
+            ["theme_id", "sort_date", "article_id", "feed_id", "title", "url", "description", "publication_date"],
+            source,
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import functools
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+from opentelemetry import context as otel_context, propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+# Charger les variables d'environnement
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Exportateur des spans : none (défaut, aucun coût), file, console ou otlp
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'none').lower()
+# Fichier JSON lines de l'exportateur file
+TRACING_FILE = os.getenv('TRACING_FILE', 'traces.jsonl')
+# Collecteur OTLP/HTTP (nécessite opentelemetry-exporter-otlp-proto-http)
+TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+TRACING_SERVICE_NAME = os.getenv('APP_NAME', 'service-scrapping-feed')
+# Longueur maximale des requêtes SQL enregistrées dans les spans
+TRACING_MAX_STATEMENT_LENGTH = int(os.getenv('TRACING_MAX_STATEMENT_LENGTH', '2000'))
+
+
+class FileSpanExporter(SpanExporter):
+    """Écrit chaque span terminé sur une ligne JSON, pour inspection locale"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def export(self, spans):
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(span.to_json(indent=None) + "\n")
+        return SpanExportResult.SUCCESS
+
+
+def _create_exporter() -> Optional[SpanExporter]:
+    if TRACING_EXPORTER == "file":
+        return FileSpanExporter(TRACING_FILE)
+    if TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    if TRACING_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("TRACING_EXPORTER=otlp mais opentelemetry-exporter-otlp-proto-http n'est pas installé : traces désactivées")
+            return None
+        return OTLPSpanExporter(endpoint=TRACING_OTLP_ENDPOINT)
+    return None
+
+
+def _configure() -> bool:
+    """Installe le fournisseur de traces si un exportateur est configuré ; sinon l'API reste no-op"""
+    exporter = _create_exporter()
+    if exporter is None:
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": TRACING_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+ENABLED = _configure()
+tracer = trace.get_tracer("kairos.scraping")
+
+
+@contextmanager
+def span(name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes):
+    """Span enfant du span courant (les exceptions sont enregistrées sur le span)"""
+    with tracer.start_as_current_span(name, kind=kind, attributes=attributes or None) as current:
+        yield current
+
+
+def traced(name: str):
+    """Décorateur : exécute la fonction dans un span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_attributes(**attributes):
+    """Ajoute des attributs au span courant"""
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attributes({key: value for key, value in attributes.items() if value is not None})
+
+
+def inject_context() -> Dict[str, str]:
+    """
+    Contexte de trace courant (en-têtes W3C traceparent/tracestate), à joindre au
+    message d'un traitement exécuté ailleurs (worker, file de messages).
+    """
+    carrier = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def attach_context(carrier: Optional[Dict[str, str]]):
+    """Rattache le traitement en cours à la trace décrite par carrier (voir inject_context)"""
+    token = otel_context.attach(propagate.extract(carrier or {}))
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def instrument_engine(engine):
+    """Un span par requête SQL exécutée sur le moteur SQLAlchemy"""
+    if not ENABLED:
+        return
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, execution_context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        db_span = tracer.start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": engine.dialect.name,
+                "db.name": engine.url.database or "",
+                "db.operation": operation,
+                "db.statement": statement[:TRACING_MAX_STATEMENT_LENGTH],
+                "db.executemany": executemany,
+            },
+        )
+        conn.info.setdefault("tracing_spans", []).append(db_span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, execution_context, executemany):
+        spans = conn.info.get("tracing_spans")
+        if spans:
+            db_span = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                db_span.set_attribute("db.rowcount", cursor.rowcount)
+            db_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("tracing_spans") if conn is not None else None
+        if spans:
+            db_span = spans.pop()
+            db_span.record_exception(exception_context.original_exception)
+            db_span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+            db_span.end()
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI : un span serveur par requête, rattaché au traceparent reçu ;
+    l'identifiant de trace est renvoyé dans l'en-tête X-Trace-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        token = otel_context.attach(propagate.extract(headers))
+        try:
+            with tracer.start_as_current_span(
+                f"{scope['method']} {scope['path']}",
+                kind=SpanKind.SERVER,
+                attributes={"http.method": scope["method"], "http.target": scope["path"]},
+            ) as server_span:
+                trace_id = format(server_span.get_span_context().trace_id, "032x").encode()
+
+                async def send_wrapper(message):
+                    if message["type"] == "http.response.start":
+                        server_span.set_attribute("http.status_code", message["status"])
+                        if message["status"] >= 500:
+                            server_span.set_status(Status(StatusCode.ERROR))
+                        message = {**message, "headers": [*message.get("headers", []), (b"x-trace-id", trace_id)]}
+                    await send(message)
+
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    # Nom par gabarit de route (pas l'URL brute) une fois le routage effectué
+                    route = scope.get("route")
+                    if route is not None:
+                        server_span.update_name(f"{scope['method']} {route.path}")
+                        server_span.set_attribute("http.route", route.path)
+        finally:
+            otel_context.detach(token)